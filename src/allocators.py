@@ -0,0 +1,404 @@
+"""
+Asignadores de memoria alternativos para el sistema operativo simulado.
+
+Además del asignador contiguo de `memory.py`, este módulo ofrece los dos esquemas que usan los
+núcleos reales, con la misma interfaz que `MemoryManager` (alloc, free_mem, mem_map, defrag)
+para que el planificador y el shell los usen sin cambios:
+
+- BuddyMemoryManager: sistema de compañeros (buddy) binario. Los bloques tienen tamaños potencia
+  de dos; dividir y fusionar cuesta O(log N).
+- SlabMemoryManager: capa de cachés por clase de tamaño (slab) sobre el buddy, para peticiones
+  pequeñas de tamaño fijo. Las peticiones grandes pasan directamente al buddy.
+
+`create_memory_manager` construye cualquiera de ellos, el contiguo o el paginado (paging.py).
+
+Todos informan su fragmentación interna y externa mediante `fragmentation()` y mantienen
+contadores de telemetría (`telemetry()`, ver telemetry.py).
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from memory import MemoryManager
+from paging import PagedMemoryManager
+from telemetry import AllocatorStats, now_ns
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from process import SimProcess
+
+# Modos de gestión de memoria seleccionables al construir el sistema.
+MEMORY_MODES = ('contiguous', 'buddy', 'slab', 'paged')
+
+def _order_for(size: int) -> int:
+    """Menor orden k tal que 2**k >= size."""
+    return max(size - 1, 0).bit_length()
+
+class BuddyMemoryManager:
+    """
+    Asignador buddy binario.
+
+    La memoria se descompone en regiones raíz de tamaño potencia de dos (por ejemplo,
+    100 = 64 + 32 + 4), colocadas de mayor a menor para que cada una quede alineada a su tamaño.
+    Un bloque de orden k mide 2**k unidades y su compañero está en `dirección ^ 2**k`.
+
+    Atributos:
+        total (int): El tamaño total de la memoria simulada.
+        allocations (dict): {pid: (dirección_inicio, tamaño_solicitado)}.
+        _blocks (Dict[str, Tuple[int, int]]): {pid: (dirección_inicio, orden)} del bloque asignado.
+        _free_lists (List[Dict[int, None]]): Por cada orden, las direcciones de sus bloques libres
+                                             (un dict se usa como conjunto ordenado).
+        _roots (List[Tuple[int, int]]): Regiones raíz (dirección_base, orden).
+    """
+    def __init__(self, total_size: int):
+        """Inicializa el asignador con un tamaño de memoria total."""
+        self.total = total_size
+        self.allocations: Dict[str, Tuple[int, int]] = {}
+        self._blocks: Dict[str, Tuple[int, int]] = {}
+        self._max_order = max(total_size.bit_length() - 1, 0)
+        self._free_lists: List[Dict[int, None]] = [{} for _ in range(self._max_order + 1)]
+        self._roots: List[Tuple[int, int]] = []
+        base = 0
+        for order in range(self._max_order, -1, -1):
+            if total_size & (1 << order):
+                self._roots.append((base, order))
+                self._free_lists[order][base] = None
+                base += 1 << order
+        self._free_total = total_size
+        self._requested_total = 0
+        self._allocated_total = 0
+        self.stats = AllocatorStats(total_size, self.largest_free())
+
+    def _root_order(self, addr: int) -> int:
+        """Orden de la región raíz que contiene `addr` (límite superior de las fusiones)."""
+        for base, order in self._roots:
+            if base <= addr < base + (1 << order):
+                return order
+        raise ValueError(f"Dirección fuera de rango: {addr}")
+
+    def alloc_block(self, size: int) -> Optional[Tuple[int, int]]:
+        """
+        Reserva un bloque de al menos `size` unidades, dividiendo bloques mayores si hace falta.
+
+        Retorna:
+            (dirección, orden) del bloque, o None si no hay ninguno suficiente.
+        """
+        want = _order_for(size)
+        order = want
+        while order <= self._max_order and not self._free_lists[order]:
+            order += 1
+        if order > self._max_order:
+            return None
+        addr, _ = self._free_lists[order].popitem()
+        # Dividir hasta el orden deseado; la mitad superior de cada división queda libre.
+        while order > want:
+            order -= 1
+            self._free_lists[order][addr + (1 << order)] = None
+        self._free_total -= 1 << want
+        return addr, want
+
+    def free_block(self, addr: int, order: int):
+        """Libera un bloque y lo fusiona con su compañero mientras este también esté libre."""
+        self._free_total += 1 << order
+        limit = self._root_order(addr)
+        while order < limit:
+            buddy = addr ^ (1 << order)
+            if buddy not in self._free_lists[order]:
+                break
+            del self._free_lists[order][buddy]
+            addr = min(addr, buddy)
+            order += 1
+        self._free_lists[order][addr] = None
+
+    def alloc(self, pid: str, size: int) -> Optional[int]:
+        """
+        Asigna a `pid` un bloque buddy de al menos `size` unidades. Si `pid` ya tenía un bloque,
+        este se libera una vez obtenido el nuevo; si la asignación falla, conserva el anterior.
+
+        Retorna:
+            La dirección de inicio del bloque asignado, o None si no se encontró espacio.
+        """
+        start = now_ns()
+        addr = self._alloc(pid, size)
+        self.stats.record_alloc(size, addr is not None)
+        self.stats.set_free(self._free_total, self.largest_free())
+        self.stats.record('alloc', start)
+        return addr
+
+    def _alloc(self, pid: str, size: int) -> Optional[int]:
+        """Asignación propiamente dicha (sin telemetría)."""
+        if size <= 0:
+            self._release(pid)
+            self.allocations[pid] = (0, 0)
+            return 0
+        block = self.alloc_block(size)
+        if block is None:
+            return None
+        self._release(pid)
+        addr, order = block
+        self._blocks[pid] = block
+        self.allocations[pid] = (addr, size)
+        self._requested_total += size
+        self._allocated_total += 1 << order
+        return addr
+
+    def _release(self, pid: str):
+        """Devuelve a las listas libres el bloque de `pid`, si tiene uno (sin telemetría)."""
+        if pid not in self.allocations:
+            return
+        _, size = self.allocations.pop(pid)
+        block = self._blocks.pop(pid, None)
+        if block is not None:
+            addr, order = block
+            self.free_block(addr, order)
+            self._requested_total -= size
+            self._allocated_total -= 1 << order
+
+    def free_mem(self, pid: str) -> bool:
+        """Libera la memoria de `pid`. Retorna True si tenía memoria asignada."""
+        if pid not in self.allocations:
+            return False
+        start = now_ns()
+        self._release(pid)
+        self.stats.frees += 1
+        self.stats.set_free(self._free_total, self.largest_free())
+        self.stats.record('free', start)
+        return True
+
+    def telemetry(self) -> dict:
+        """Contadores de telemetría del asignador como diccionario (lectura O(1))."""
+        return self.stats.as_dict()
+
+    def free_blocks(self) -> List[Tuple[int, int]]:
+        """Bloques libres (dirección_inicio, tamaño) ordenados por dirección."""
+        return sorted((addr, 1 << order) for order, blocks in enumerate(self._free_lists) for addr in blocks)
+
+    def largest_free(self) -> int:
+        """Tamaño del mayor bloque libre. O(log N)."""
+        for order in range(self._max_order, -1, -1):
+            if self._free_lists[order]:
+                return 1 << order
+        return 0
+
+    def mem_map(self):
+        """Retorna el estado de la memoria en el mismo formato que MemoryManager.mem_map()."""
+        return {
+            'total': self.total,
+            'free': self.free_blocks(),
+            'allocations': [(pid, addr, 1 << order) for pid, (addr, order) in self._blocks.items()],
+        }
+
+    def fragmentation(self) -> dict:
+        """
+        Fragmentación del asignador.
+
+        - internal: fracción del espacio asignado que no se pidió (redondeo a potencia de dos).
+        - external: 1 - (mayor bloque libre / espacio libre total).
+        """
+        return {
+            'internal': 1 - self._requested_total / self._allocated_total if self._allocated_total else 0.0,
+            'external': 1 - self.largest_free() / self._free_total if self._free_total else 0.0,
+            'free': self._free_total,
+            'largest_free': self.largest_free(),
+        }
+
+    def defrag(self, processes: Iterable['SimProcess']):
+        """
+        No hace nada: el buddy fusiona los compañeros libres en cuanto se liberan y sus bloques
+        no pueden reubicarse sin romper la alineación.
+        """
+
+class _SlabCache:
+    """
+    Caché de objetos de un tamaño fijo.
+
+    Cada slab es un bloque buddy de `slab_size` unidades dividido en `slab_size // obj_size`
+    ranuras. Los slabs con ranuras libres se mantienen en `partial` para asignar en O(1).
+    """
+    def __init__(self, obj_size: int, slab_size: int):
+        self.obj_size = obj_size
+        self.slab_size = max(slab_size, obj_size)
+        self.per_slab = self.slab_size // obj_size
+        # dirección del slab -> lista de ranuras libres (direcciones)
+        self.slabs: Dict[int, List[int]] = {}
+        self.partial: Dict[int, None] = {}
+
+    def free_slots(self) -> int:
+        """Número de ranuras libres en todos los slabs de la caché."""
+        return sum(len(slots) for slots in self.slabs.values())
+
+class SlabMemoryManager:
+    """
+    Asignador slab sobre un buddy.
+
+    Las peticiones de hasta `max(size_classes)` unidades se redondean a la menor clase de tamaño
+    que las contiene y se sirven desde la caché de esa clase; las demás van al buddy. Un slab que
+    queda completamente vacío se devuelve al buddy.
+
+    Atributos:
+        total (int): El tamaño total de la memoria simulada.
+        buddy (BuddyMemoryManager): El asignador de páginas subyacente.
+        caches (Dict[int, _SlabCache]): Caché por clase de tamaño.
+        allocations (dict): {pid: (dirección_inicio, tamaño_solicitado)}.
+    """
+    def __init__(self, total_size: int, size_classes: Tuple[int, ...] = (1, 2, 4, 8), slab_size: int = 16):
+        """Inicializa el asignador slab con sus clases de tamaño y el tamaño de cada slab."""
+        self.total = total_size
+        self.buddy = BuddyMemoryManager(total_size)
+        self.size_classes = tuple(sorted(size_classes))
+        self.caches: Dict[int, _SlabCache] = {c: _SlabCache(c, slab_size) for c in self.size_classes}
+        self.allocations: Dict[str, Tuple[int, int]] = {}
+        # pid -> (clase, dirección del slab) para los objetos servidos por una caché.
+        self._objects: Dict[str, Tuple[int, int]] = {}
+        self._requested_small = 0
+        self._allocated_small = 0
+        self.stats = AllocatorStats(total_size, self.buddy.largest_free())
+
+    def _class_for(self, size: int) -> Optional[int]:
+        """Menor clase de tamaño que contiene `size`, o None si la petición es grande."""
+        for c in self.size_classes:
+            if size <= c:
+                return c
+        return None
+
+    def alloc(self, pid: str, size: int) -> Optional[int]:
+        """
+        Asigna memoria a `pid`: desde una caché slab si la petición es pequeña o desde el buddy.
+        Si `pid` ya tenía memoria, se libera una vez obtenida la nueva; si la asignación falla,
+        conserva la anterior.
+
+        Retorna:
+            La dirección de inicio asignada, o None si no se encontró espacio.
+        """
+        start = now_ns()
+        addr = self._alloc(pid, size)
+        self.stats.record_alloc(size, addr is not None)
+        self.stats.set_free(self.buddy._free_total, self.buddy.largest_free())
+        self.stats.record('alloc', start)
+        return addr
+
+    def _alloc(self, pid: str, size: int) -> Optional[int]:
+        """Asignación propiamente dicha (sin telemetría)."""
+        cls = self._class_for(size) if size > 0 else None
+        if cls is None:
+            # El buddy ya libera el bloque grande anterior de `pid`; queda el objeto pequeño, si lo había.
+            addr = self.buddy.alloc(pid, size)
+            if addr is not None:
+                self._release_object(pid)
+                self.allocations[pid] = (addr, size)
+            return addr
+        cache = self.caches[cls]
+        if not cache.partial:
+            block = self.buddy.alloc_block(cache.slab_size)
+            if block is None:
+                return None
+            slab = block[0]
+            cache.slabs[slab] = [slab + i * cls for i in range(cache.per_slab - 1, -1, -1)]
+            cache.partial[slab] = None
+        slab = next(iter(cache.partial))
+        slots = cache.slabs[slab]
+        addr = slots.pop()
+        if not slots:
+            del cache.partial[slab]
+        if pid in self.allocations:
+            self._free_mem(pid)
+        self._objects[pid] = (cls, slab)
+        self.allocations[pid] = (addr, size)
+        self._requested_small += size
+        self._allocated_small += cls
+        return addr
+
+    def free_mem(self, pid: str) -> bool:
+        """Libera la memoria de `pid`. Retorna True si tenía memoria asignada."""
+        if pid not in self.allocations:
+            return False
+        start = now_ns()
+        self._free_mem(pid)
+        self.stats.frees += 1
+        self.stats.set_free(self.buddy._free_total, self.buddy.largest_free())
+        self.stats.record('free', start)
+        return True
+
+    def _free_mem(self, pid: str) -> bool:
+        """Liberación propiamente dicha (sin telemetría)."""
+        if pid not in self._objects:
+            self.allocations.pop(pid)
+            return self.buddy.free_mem(pid)
+        self._release_object(pid)
+        return True
+
+    def _release_object(self, pid: str):
+        """Devuelve a su slab el objeto pequeño de `pid`, si tiene uno."""
+        obj = self._objects.pop(pid, None)
+        if obj is None:
+            return
+        addr, size = self.allocations.pop(pid)
+        cls, slab = obj
+        cache = self.caches[cls]
+        slots = cache.slabs[slab]
+        slots.append(addr)
+        self._requested_small -= size
+        self._allocated_small -= cls
+        if len(slots) == cache.per_slab:
+            # Slab vacío: se devuelve al buddy.
+            del cache.slabs[slab]
+            cache.partial.pop(slab, None)
+            self.buddy.free_block(slab, _order_for(cache.slab_size))
+        else:
+            cache.partial[slab] = None
+
+    def mem_map(self):
+        """Retorna el estado de la memoria en el mismo formato que MemoryManager.mem_map()."""
+        occupied = [(pid, addr, self._objects[pid][0] if pid in self._objects else size)
+                    for pid, (addr, size) in self.allocations.items()]
+        return {
+            'total': self.total,
+            'free': self.buddy.free_blocks(),
+            'allocations': occupied,
+        }
+
+    def fragmentation(self) -> dict:
+        """
+        Fragmentación del asignador.
+
+        - internal: fracción del espacio ocupado que no se pidió: redondeo a la clase de tamaño,
+          ranuras vacías dentro de los slabs y redondeo del buddy en las peticiones grandes.
+        - external: la del buddy subyacente.
+        """
+        buddy = self.buddy.fragmentation()
+        slab_space = sum(len(c.slabs) * c.slab_size for c in self.caches.values())
+        occupied = self.buddy._allocated_total + slab_space
+        requested = self.buddy._requested_total + self._requested_small
+        return {
+            'internal': 1 - requested / occupied if occupied else 0.0,
+            'external': buddy['external'],
+            'free': buddy['free'],
+            'largest_free': buddy['largest_free'],
+            'slab_free_slots': sum(c.free_slots() for c in self.caches.values()),
+        }
+
+    def telemetry(self) -> dict:
+        """Contadores de telemetría del asignador como diccionario (lectura O(1))."""
+        return self.stats.as_dict()
+
+    def defrag(self, processes: Iterable['SimProcess']):
+        """No hace nada: los objetos de un slab y los bloques buddy no se reubican."""
+
+def create_memory_manager(mode: str, total_size: int, strategy: str = 'first', page_size: int = 4,
+                          tlb_entries: int = 8, page_policy: str = 'lru', auto_compact: int = 0):
+    """
+    Construye el gestor de memoria del modo indicado: 'contiguous' (MemoryManager con la
+    estrategia dada), 'buddy', 'slab' o 'paged' (PagedMemoryManager con total_size // page_size
+    marcos). `auto_compact` solo aplica al modo contiguo. Lanza ValueError si el modo no existe
+    o si sus parámetros no son válidos.
+    """
+    if mode == 'contiguous':
+        return MemoryManager(total_size, strategy=strategy, auto_compact=auto_compact)
+    if mode == 'buddy':
+        return BuddyMemoryManager(total_size)
+    if mode == 'slab':
+        return SlabMemoryManager(total_size)
+    if mode == 'paged':
+        if page_size < 1:
+            raise ValueError("El tamaño de página debe ser al menos 1")
+        return PagedMemoryManager(total_size // page_size, page_size=page_size,
+                                  tlb_entries=tlb_entries, policy=page_policy)
+    raise ValueError(f"Modo de memoria desconocido '{mode}'. Opciones: {', '.join(MEMORY_MODES)}")
@@ -0,0 +1,188 @@
+"""
+Benchmark de la representación de inodos del Sistema de Archivos Simulado.
+
+Construye un árbol sintético de N nodos (por defecto 10^6) y mide:
+
+- Memoria por nodo del árbol en memoria (con `tracemalloc`, incluyendo nombres y diccionarios
+  de hijos).
+- Tiempo de guardado y carga con el formato anidado (`to_dict` + `json.dump` / `json.load` +
+  `from_dict`) y con el formato plano por líneas (`dump_tree` / `load_tree`).
+- Que una cadena muy profunda (por defecto 10^5 niveles) se serializa y deserializa sin
+  alcanzar el límite de recursión.
+
+Uso:
+    python bench_fs.py
+    python bench_fs.py --nodes 200000 --fanout 8 --files 0.7 --deep 50000
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable, Iterable, List, Optional, TextIO, Tuple
+
+from filesystem import FS_DIR, FS_FILE, Inode
+
+def build_tree(nodes: int, fanout: int = 10, files: float = 0.8) -> Inode:
+    """
+    Árbol en anchura de `nodes` nodos: cada directorio recibe hasta `fanout` hijos y una
+    fracción `files` de ellos son archivos (con un contenido corto).
+    """
+    root = Inode('/', FS_DIR)
+    pending = deque([root])
+    count = 1
+    while count < nodes:
+        parent = pending.popleft()
+        for i in range(min(fanout, nodes - count)):
+            is_file = (count * 7919) % 100 < files * 100
+            node = Inode(f"{'f' if is_file else 'd'}{count}", FS_FILE if is_file else FS_DIR, parent)
+            if is_file:
+                node.content = f"dato {count}"
+            else:
+                pending.append(node)
+            parent.children[node.name] = node
+            count += 1
+        if not pending:
+            # Todo eran archivos: se cuelga un directorio más para seguir creciendo.
+            extra = Inode(f"d{count}", FS_DIR, parent)
+            parent.children[extra.name] = extra
+            pending.append(extra)
+            count += 1
+    return root
+
+def build_chain(depth: int) -> Inode:
+    """Cadena de `depth` directorios anidados con un archivo al final."""
+    root = node = Inode('/', FS_DIR)
+    for i in range(depth):
+        child = Inode(f"d{i}", FS_DIR, node)
+        node.children[child.name] = child
+        node = child
+    leaf = Inode('fin', FS_FILE, node)
+    leaf.content = 'fin'
+    node.children[leaf.name] = leaf
+    return root
+
+def timed(func: Callable, *args) -> Tuple[float, object]:
+    """Ejecuta `func` y retorna (segundos, resultado)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def measure_memory(nodes: int, fanout: int, files: float) -> float:
+    """Bytes por nodo que ocupa el árbol según `tracemalloc`."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    root = build_tree(nodes, fanout, files)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del root
+    return used / nodes
+
+def dump_tree(root: Inode, f: TextIO):
+    """
+    Escribe el árbol en `f` en formato plano por líneas, sin construirlo entero en memoria.
+
+    Cada nodo es una línea JSON `[profundidad, nombre, tipo, contenido]` en preorden (el
+    contenido es null en los directorios), de modo que ni la escritura ni la lectura (ver
+    `load_tree`) anidan estructuras, sea cual sea la profundidad del árbol.
+    """
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        f.write(json.dumps([depth, node.name, node.type, node.content], ensure_ascii=False) + '\n')
+        if node.type == FS_DIR:
+            # En orden inverso, para que la pila los saque en su orden original.
+            stack.extend((child, depth + 1) for child in reversed(list(node.children.values())))
+
+def load_tree(f: Iterable[str]) -> Inode:
+    """Reconstruye un árbol escrito con `dump_tree`, leyendo una línea cada vez."""
+    root: Optional[Inode] = None
+    path: List[Inode] = []  # Directorios abiertos, uno por nivel.
+    for line in f:
+        depth, name, node_type, content = json.loads(line)
+        del path[depth:]
+        node = Inode(name, node_type, path[-1] if path else None)
+        if node_type == FS_FILE:
+            node.content = content or ''
+        if path:
+            path[-1].children[name] = node
+        else:
+            root = node
+        if node_type == FS_DIR:
+            path.append(node)
+    if root is None:
+        raise ValueError("El volcado está vacío")
+    return root
+
+def save_nested(root: Inode, path: str):
+    """Guarda el árbol como un único JSON anidado."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(root.to_dict(), ensure_ascii=False, separators=(',', ':')))
+
+def load_nested(path: str) -> Inode:
+    """Carga un árbol guardado con `save_nested`."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return Inode.from_dict(json.load(f))
+
+def save_lines(root: Inode, path: str):
+    """Guarda el árbol en formato plano por líneas."""
+    with open(path, 'w', encoding='utf-8') as f:
+        dump_tree(root, f)
+
+def load_lines(path: str) -> Inode:
+    """Carga un árbol guardado con `save_lines`."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return load_tree(f)
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Lee el tamaño y la forma del árbol desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Benchmark de inodos del Simulador de Sistema Operativo")
+    parser.add_argument('--nodes', type=int, default=10 ** 6, help="Nodos del árbol (por defecto 10^6)")
+    parser.add_argument('--fanout', type=int, default=10, help="Hijos por directorio (por defecto 10)")
+    parser.add_argument('--files', type=float, default=0.8, help="Fracción de archivos (por defecto 0.8)")
+    parser.add_argument('--deep', type=int, default=10 ** 5, help="Profundidad de la cadena (por defecto 10^5)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Ejecuta las mediciones e imprime los resultados."""
+    args = parse_args(argv)
+    print(f"Nodos: {args.nodes}  (fanout {args.fanout}, {args.files:.0%} archivos)")
+    print(f"Memoria por nodo:        {measure_memory(args.nodes, args.fanout, args.files):8.1f} B")
+
+    seconds, root = timed(build_tree, args.nodes, args.fanout, args.files)
+    print(f"Construcción:            {seconds:8.2f} s")
+    with tempfile.TemporaryDirectory() as tmp:
+        nested, lines = os.path.join(tmp, 'arbol.json'), os.path.join(tmp, 'arbol.jsonl')
+        for label, save, load, path in (('anidado (to_dict/from_dict)', save_nested, load_nested, nested),
+                                        ('por líneas (dump_tree/load_tree)', save_lines, load_lines, lines)):
+            save_s, _ = timed(save, root, path)
+            load_s, loaded = timed(load, path)
+            size = os.path.getsize(path)
+            del loaded
+            gc.collect()
+            print(f"Formato {label}: guardar {save_s:.2f} s, cargar {load_s:.2f} s, {size / args.nodes:.1f} B/nodo en disco")
+    del root
+    gc.collect()
+
+    chain = build_chain(args.deep)
+    buffer = io.StringIO()
+    seconds, _ = timed(dump_tree, chain, buffer)
+    buffer.seek(0)
+    load_s, loaded = timed(load_tree, buffer)
+    depth, node = 0, loaded
+    while node.type == FS_DIR and node.children:
+        node = next(iter(node.children.values()))
+        depth += 1
+    dict_s, data = timed(chain.to_dict)
+    back_s, _ = timed(Inode.from_dict, data)
+    print(f"Cadena de {args.deep} niveles: dump {seconds:.2f} s, load {load_s:.2f} s, "
+          f"to_dict {dict_s:.2f} s, from_dict {back_s:.2f} s (profundidad recuperada {depth - 1}, '{node.content}')")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Dispositivo de bloques para el contenido de los archivos del Sistema de Archivos Simulado.
+
+Los datos de todos los archivos comparten una región dividida en bloques de tamaño fijo. Cada
+fragmento de contenido (ver chunkstore.py) guarda su tamaño en bytes y la lista de sus bloques
+(punteros a bloque), y un mapa de bits indica qué bloques están libres. La región puede estar
+respaldada por un archivo imagen proyectado en memoria con `mmap` (persistente) o por memoria
+anónima.
+
+El dispositivo solo asigna, libera, lee y escribe bloques completos; el acceso por rangos de
+bytes lo resuelve la caché de buffers (ver bufcache.py), que es la que usa el almacén de
+fragmentos.
+
+Invariantes:
+- Un bloque recién asignado se rellena con ceros, de modo que la parte de un bloque que no
+  llega a escribirse se lee como ceros.
+- Se asigna siempre el bloque libre de menor índice, de modo que la misma secuencia de
+  operaciones produce la misma disposición (lo necesita la reaplicación del diario del FS).
+"""
+
+import mmap
+import os
+import re
+from typing import Dict, Optional
+
+# Tamaño de bloque por defecto, en bytes.
+BLOCK_SIZE = 512
+
+# Bloques con los que se crea una región nueva (se duplica al llenarse).
+INITIAL_BLOCKS = 64
+
+# Primer byte del mapa de bits con algún bloque libre (algún bit a 0).
+_NOT_FULL = re.compile(b'[^\xff]')
+
+class BlockDevice:
+    """
+    Región de datos en bloques con mapa de bits de bloques libres.
+
+    Atributos:
+        path (Optional[str]): Archivo imagen proyectado con mmap (None = memoria anónima).
+        block_size (int): Tamaño de cada bloque en bytes.
+        n_blocks (int): Bloques de la región.
+        free_blocks (int): Bloques libres.
+        bitmap (bytearray): Un bit por bloque, 1 si está ocupado.
+    """
+    def __init__(self, path: Optional[str] = None, block_size: int = BLOCK_SIZE, bitmap: Optional[bytes] = None):
+        """
+        Abre la región. Con `bitmap` se conserva la imagen existente (estado guardado); sin él se
+        crea una región vacía, descartando el contenido anterior del archivo imagen.
+        """
+        if block_size <= 0:
+            raise ValueError("El tamaño de bloque debe ser positivo")
+        self.path = path
+        self.block_size = block_size
+        self._file = None
+        self._map = None
+        self._view: Optional[memoryview] = None
+        if bitmap is None:
+            self.n_blocks = 0
+            self.bitmap = bytearray()
+            self._resize(INITIAL_BLOCKS, fresh=True)
+        else:
+            size = os.path.getsize(path) if path is not None and os.path.exists(path) else 0
+            self.n_blocks = 0
+            self.bitmap = bytearray(bitmap)
+            self._resize(max(len(self.bitmap) * 8, size // block_size, INITIAL_BLOCKS))
+        self.free_blocks = self.n_blocks - sum(bin(byte).count('1') for byte in self.bitmap)
+        self._hint = 0  # Ningún bloque anterior a este está libre.
+
+    def _resize(self, n_blocks: int, fresh: bool = False):
+        """
+        Amplía la región a `n_blocks` bloques.
+
+        Las `memoryview` ya entregadas siguen siendo válidas: con imagen, apuntan a las mismas
+        páginas del archivo; en memoria anónima, a la región antigua (que solo se copia).
+        """
+        size = n_blocks * self.block_size
+        old_view = self._view
+        if self.path is not None:
+            if self._file is None:
+                self._file = open(self.path, 'w+b' if fresh or not os.path.exists(self.path) else 'r+b')
+            self._file.truncate(size)
+            new_map = mmap.mmap(self._file.fileno(), size)
+        else:
+            new_map = mmap.mmap(-1, size)
+            if old_view is not None:
+                new_map[:len(old_view)] = old_view
+        if self._map is not None:
+            old_view.release()
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # Quedan vistas exportadas; se cerrará al liberarlas.
+        self._map = new_map
+        self._view = memoryview(new_map)
+        self.bitmap.extend(bytes(max((n_blocks + 7) // 8 - len(self.bitmap), 0)))
+        if self.n_blocks:
+            self.free_blocks += n_blocks - self.n_blocks
+        self.n_blocks = n_blocks
+
+    def allocate(self) -> int:
+        """Asigna el bloque libre de menor índice, ampliando la región si está llena, y lo rellena con ceros."""
+        match = _NOT_FULL.search(self.bitmap, self._hint // 8)
+        block = None
+        if match is not None:
+            byte = match.start()
+            bits = self.bitmap[byte]
+            block = byte * 8 + ((~bits) & (bits + 1)).bit_length() - 1
+        if block is None or block >= self.n_blocks:
+            block = self.n_blocks
+            self._resize(self.n_blocks * 2)
+        self.bitmap[block // 8] |= 1 << (block % 8)
+        self.free_blocks -= 1
+        self._hint = block + 1
+        start = block * self.block_size
+        self._view[start:start + self.block_size] = bytes(self.block_size)
+        return block
+
+    def release(self, block: int):
+        """Marca un bloque como libre."""
+        mask = 1 << (block % 8)
+        if self.bitmap[block // 8] & mask:
+            self.bitmap[block // 8] &= ~mask
+            self.free_blocks += 1
+            self._hint = min(self._hint, block)
+
+    def read_block(self, block: int) -> memoryview:
+        """Vista de un bloque completo de la región."""
+        start = block * self.block_size
+        return self._view[start:start + self.block_size]
+
+    def write_block(self, block: int, data: bytes):
+        """Sobrescribe un bloque completo de la región."""
+        start = block * self.block_size
+        self._view[start:start + self.block_size] = data
+
+    def flush(self):
+        """Fuerza a disco las páginas modificadas de la imagen."""
+        if self.path is not None:
+            self._map.flush()
+
+    def close(self):
+        """Cierra la proyección y el archivo imagen."""
+        self.flush()
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        if self._file is not None:
+            self._file.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Tamaño de bloque, bloques totales, ocupados y libres."""
+        return {
+            'block_size': self.block_size,
+            'blocks': self.n_blocks,
+            'used': self.n_blocks - self.free_blocks,
+            'free': self.free_blocks,
+        }
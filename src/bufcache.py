@@ -0,0 +1,312 @@
+"""
+Caché de buffers entre el Sistema de Archivos Simulado y su dispositivo de bloques.
+
+Las lecturas y escrituras de bloques del FS (a través del almacén de fragmentos) pasan por un
+conjunto acotado de buffers en memoria, uno por bloque, como la buffer cache de Unix:
+
+- Un acierto sirve el bloque desde su buffer; un fallo lo lee del dispositivo y, si la caché
+  está llena, expulsa un buffer elegido por la política de reemplazo (LRU o 2Q).
+- Las escrituras solo modifican el buffer y lo marcan como sucio; el bloque se escribe en el
+  dispositivo al expulsarlo o al sincronizar (`sync`, que el FS llama al compactar), y los
+  bloques sucios se escriben en orden de número de bloque.
+- Un bloque recién asignado entra en la caché sin leerse (su contenido son ceros) y uno
+  liberado sale de ella sin escribirse.
+- Lectura anticipada (read-ahead): un fallo en el bloque siguiente al último leído indica
+  acceso secuencial y carga también los siguientes bloques ocupados del dispositivo.
+
+Los contadores (aciertos, fallos, expulsiones, escrituras diferidas, lecturas anticipadas y
+lecturas y escrituras de bloques en el dispositivo) sirven para dimensionar la caché.
+"""
+
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Set
+
+from blockdev import BlockDevice
+
+class CachePolicy:
+    """Interfaz de las políticas de reemplazo de la caché. Trabajan con números de bloque."""
+    name = 'base'
+
+    def loaded(self, block: int):
+        """El bloque entró en la caché."""
+
+    def accessed(self, block: int):
+        """Se accedió a un bloque que ya estaba en la caché."""
+
+    def released(self, block: int):
+        """El bloque salió de la caché sin ser expulsado (se liberó)."""
+
+    def victim(self) -> int:
+        """Elige y retira el bloque que será expulsado."""
+        raise NotImplementedError
+
+class LRUCachePolicy(CachePolicy):
+    """Expulsa el bloque usado hace más tiempo."""
+    name = 'lru'
+
+    def __init__(self):
+        self._order: 'OrderedDict[int, None]' = OrderedDict()
+
+    def loaded(self, block: int):
+        self._order[block] = None
+
+    def accessed(self, block: int):
+        self._order.move_to_end(block)
+
+    def released(self, block: int):
+        self._order.pop(block, None)
+
+    def victim(self) -> int:
+        block, _ = self._order.popitem(last=False)
+        return block
+
+class TwoQueueCachePolicy(CachePolicy):
+    """
+    2Q (Johnson y Shasha): resiste los recorridos secuenciales que vacían una LRU.
+
+    Un bloque nuevo entra en una cola FIFO (`A1in`) y, si se expulsa sin volver a usarse, solo
+    se recuerda su número en una cola fantasma (`A1out`). Un bloque que vuelve a pedirse
+    mientras está en `A1out` demuestra reutilización y entra en la cola principal (`Am`, LRU).
+    Mientras `A1in` supera su cuota se expulsa de ella, de modo que una lectura larga de una
+    sola pasada no desplaza los bloques reutilizados de `Am`.
+    """
+    name = '2q'
+
+    def __init__(self, capacity: int):
+        self.kin = max(1, capacity // 4)
+        self.kout = max(1, capacity // 2)
+        self._a1in: 'OrderedDict[int, None]' = OrderedDict()
+        self._a1out: 'OrderedDict[int, None]' = OrderedDict()
+        self._am: 'OrderedDict[int, None]' = OrderedDict()
+
+    def loaded(self, block: int):
+        if block in self._a1out:
+            del self._a1out[block]
+            self._am[block] = None
+        else:
+            self._a1in[block] = None
+
+    def accessed(self, block: int):
+        if block in self._am:
+            self._am.move_to_end(block)
+
+    def released(self, block: int):
+        self._a1in.pop(block, None)
+        self._am.pop(block, None)
+        self._a1out.pop(block, None)
+
+    def victim(self) -> int:
+        if len(self._a1in) > self.kin or not self._am:
+            block, _ = self._a1in.popitem(last=False)
+            self._a1out[block] = None
+            if len(self._a1out) > self.kout:
+                self._a1out.popitem(last=False)
+            return block
+        block, _ = self._am.popitem(last=False)
+        return block
+
+# Políticas de reemplazo de la caché disponibles por nombre corto.
+CACHE_POLICIES = ('lru', '2q')
+
+def make_cache_policy(name: str, capacity: int) -> CachePolicy:
+    """Construye una política de reemplazo de la caché por nombre. Lanza ValueError si no existe."""
+    if name == 'lru':
+        return LRUCachePolicy()
+    if name == '2q':
+        return TwoQueueCachePolicy(capacity)
+    raise ValueError(f"Política de caché desconocida '{name}'. Opciones: {', '.join(CACHE_POLICIES)}")
+
+class BufferCache:
+    """
+    Caché de buffers de bloques con escritura diferida y lectura anticipada.
+
+    Además de asignar y liberar bloques como `BlockDevice` (`allocate`, `release`), resuelve el
+    acceso por rangos de bytes (`write`, `views`, `read`), así que el almacén de fragmentos la usa
+    en lugar del dispositivo.
+
+    Atributos:
+        device (BlockDevice): Dispositivo de bloques subyacente.
+        capacity (int): Máximo de buffers (bloques) en la caché.
+        policy (CachePolicy): Política de reemplazo.
+        read_ahead (int): Bloques que se cargan por adelantado en un acceso secuencial (0 = sin lectura anticipada).
+        hits, misses (int): Accesos servidos desde la caché y desde el dispositivo.
+        evictions (int): Buffers expulsados para hacer sitio.
+        writebacks (int): Bloques sucios escritos en el dispositivo (al expulsarlos o al sincronizar).
+        prefetched, prefetch_hits (int): Bloques leídos por adelantado y cuántos se usaron después.
+        device_reads, device_writes (int): Bloques leídos y escritos en el dispositivo.
+    """
+    def __init__(self, device: BlockDevice, capacity: int = 256, policy: str = 'lru', read_ahead: int = 8):
+        """Inicializa una caché vacía sobre `device`."""
+        if capacity <= 0:
+            raise ValueError("La capacidad de la caché debe ser positiva")
+        self.device = device
+        self.block_size = device.block_size
+        self.capacity = capacity
+        self.policy = make_cache_policy(policy, capacity)
+        self.read_ahead = read_ahead
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writebacks = 0
+        self.prefetched = 0
+        self.prefetch_hits = 0
+        self.device_reads = 0
+        self.device_writes = 0
+        self._buffers: Dict[int, bytearray] = {}
+        self._dirty: Set[int] = set()
+        # Bloques leídos por adelantado que aún no se han usado.
+        self._unused_prefetch: Set[int] = set()
+        # Último bloque leído: un fallo en el siguiente indica un acceso secuencial.
+        self._last_read = -1
+
+    def _write_back(self, block: int):
+        """Escribe un buffer sucio en el dispositivo."""
+        self.device.write_block(block, self._buffers[block])
+        self._dirty.discard(block)
+        self.writebacks += 1
+        self.device_writes += 1
+
+    def _insert(self, block: int, buffer: bytearray):
+        """Añade un buffer a la caché, expulsando otro si está llena."""
+        while len(self._buffers) >= self.capacity:
+            victim = self.policy.victim()
+            if victim in self._dirty:
+                self._write_back(victim)
+            del self._buffers[victim]
+            self._unused_prefetch.discard(victim)
+            self.evictions += 1
+        self._buffers[block] = buffer
+        self.policy.loaded(block)
+
+    def _load(self, block: int) -> bytearray:
+        """Lee un bloque del dispositivo a un buffer nuevo."""
+        self.device_reads += 1
+        return bytearray(self.device.read_block(block))
+
+    def _prefetch(self, block: int):
+        """Carga por adelantado los bloques ocupados que siguen a `block` y no están en la caché."""
+        device = self.device
+        # Una ventana tan grande como la caché expulsaría lo anticipado antes de usarlo.
+        window = min(self.read_ahead, self.capacity - 1)
+        for ahead in range(block + 1, min(block + 1 + window, device.n_blocks)):
+            if ahead in self._buffers or not device.bitmap[ahead // 8] & (1 << (ahead % 8)):
+                continue
+            self._insert(ahead, self._load(ahead))
+            self._unused_prefetch.add(ahead)
+            self.prefetched += 1
+
+    def _get(self, block: int, fill: bool = True) -> bytearray:
+        """
+        Buffer de un bloque. En un fallo se lee del dispositivo, salvo con `fill=False` (el
+        llamador va a sobrescribir el bloque entero).
+        """
+        buffer = self._buffers.get(block)
+        if buffer is not None:
+            self.hits += 1
+            self.policy.accessed(block)
+            if block in self._unused_prefetch:
+                self._unused_prefetch.discard(block)
+                self.prefetch_hits += 1
+            return buffer
+        self.misses += 1
+        buffer = self._load(block) if fill else bytearray(self.block_size)
+        self._insert(block, buffer)
+        return buffer
+
+    def _read(self, block: int) -> bytearray:
+        """Buffer de un bloque que se va a leer, con lectura anticipada si el acceso es secuencial."""
+        missed = block not in self._buffers
+        buffer = self._get(block)
+        if missed and self.read_ahead and block == self._last_read + 1:
+            self._prefetch(block)
+        self._last_read = block
+        return buffer
+
+    def allocate(self) -> int:
+        """Asigna un bloque en el dispositivo; su buffer (ceros) entra en la caché sin leerlo."""
+        block = self.device.allocate()
+        if block in self._buffers:
+            self._buffers[block][:] = bytes(self.block_size)
+        else:
+            self._insert(block, bytearray(self.block_size))
+        return block
+
+    def release(self, block: int):
+        """Libera un bloque; su buffer sale de la caché sin escribirse."""
+        if self._buffers.pop(block, None) is not None:
+            self.policy.released(block)
+            self._dirty.discard(block)
+            self._unused_prefetch.discard(block)
+        self.device.release(block)
+
+    def write(self, blocks: array, size: int, offset: int, data: bytes) -> int:
+        """
+        Escribe `data` a partir de `offset` en el archivo formado por `blocks`, asignando los
+        bloques que falten; los bloques quedan sucios en la caché.
+
+        Retorna:
+            El nuevo tamaño del archivo.
+        """
+        end = offset + len(data)
+        bs = self.block_size
+        while len(blocks) * bs < end:
+            blocks.append(self.allocate())
+        pos = offset
+        src = memoryview(data)
+        while pos < end:
+            index, within = divmod(pos, bs)
+            chunk = min(bs - within, end - pos)
+            buffer = self._get(blocks[index], fill=chunk < bs)
+            buffer[within:within + chunk] = src[pos - offset:pos - offset + chunk]
+            self._dirty.add(blocks[index])
+            pos += chunk
+        return max(size, end)
+
+    def views(self, blocks: array, size: int, offset: int = 0, length: Optional[int] = None) -> Iterator[memoryview]:
+        """Recorre un rango del archivo como `memoryview` sobre los buffers de la caché."""
+        end = size if length is None else min(size, offset + length)
+        bs = self.block_size
+        pos = max(offset, 0)
+        while pos < end:
+            index, within = divmod(pos, bs)
+            chunk = min(bs - within, end - pos)
+            yield memoryview(self._read(blocks[index]))[within:within + chunk]
+            pos += chunk
+
+    def read(self, blocks: array, size: int, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """Lee un rango del archivo como `bytes`."""
+        return b''.join(self.views(blocks, size, offset, length))
+
+    def sync(self) -> int:
+        """
+        Escribe en el dispositivo todos los buffers sucios, en orden de bloque (los buffers
+        siguen en la caché, ya limpios).
+
+        Retorna:
+            Los bloques escritos.
+        """
+        dirty = sorted(self._dirty)
+        for block in dirty:
+            self._write_back(block)
+        return len(dirty)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de la caché, para ajustar su capacidad."""
+        accesses = self.hits + self.misses
+        return {
+            'capacity': self.capacity,
+            'size': len(self._buffers),
+            'policy': self.policy.name,
+            'read_ahead': self.read_ahead,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / accesses if accesses else 0.0,
+            'evictions': self.evictions,
+            'dirty': len(self._dirty),
+            'writebacks': self.writebacks,
+            'prefetched': self.prefetched,
+            'prefetch_hits': self.prefetch_hits,
+            'device_reads': self.device_reads,
+            'device_writes': self.device_writes,
+        }
@@ -0,0 +1,278 @@
+"""
+Almacén de fragmentos direccionados por contenido para el Sistema de Archivos Simulado.
+
+El contenido de cada archivo se divide en fragmentos (chunks) de tamaño variable con cortes
+definidos por el contenido (CDC): un hash rodante "gear" recorre los bytes y se corta donde sus
+bits altos son cero, con un mínimo y un máximo por fragmento. Como un corte depende solo de los
+bytes cercanos, modificar una parte del archivo solo cambia los fragmentos de esa zona, y dos
+archivos que difieren en un tramo siguen compartiendo los fragmentos del resto.
+
+Cada fragmento se guarda una sola vez, identificado por el hash BLAKE2b de sus bytes, con un
+contador de referencias; sus datos ocupan bloques del dispositivo (ver blockdev.py), a los que
+se accede a través de la caché de buffers (ver bufcache.py). Un
+fragmento sin referencias no se libera hasta la siguiente compactación del FS: así la
+instantánea anterior sigue intacta mientras el diario no se haya compactado, y si el mismo
+contenido vuelve a escribirse antes, se reaprovecha.
+
+El índice hash -> fragmento se reparte en 256 archivos por el primer byte del hash
+(`<directorio>/<xx>.json`) que se cargan al consultarlos, y solo se reescriben los modificados.
+"""
+
+import hashlib
+import json
+import os
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from bufcache import BufferCache
+
+# Tamaños de fragmento: mínimo, máximo y bits de la máscara de corte (media ~ MIN + 2^bits).
+MIN_CHUNK = 512
+MAX_CHUNK = 8192
+AVG_BITS = 11
+
+# Tabla del hash gear: un valor pseudoaleatorio de 64 bits por byte, estable entre ejecuciones.
+_GEAR = [int.from_bytes(hashlib.blake2b(bytes([i]), digest_size=8).digest(), 'little') for i in range(256)]
+_MASK64 = (1 << 64) - 1
+# Bits altos del hash: dependen de los últimos 64 bytes, no solo de los más recientes.
+_CUT_MASK = ((1 << AVG_BITS) - 1) << (64 - AVG_BITS)
+
+def next_cut(data: bytes, start: int) -> Optional[int]:
+    """
+    Primer corte definido por el contenido a partir de `start`.
+
+    El hash se reinicia en cada corte y solo mira una ventana de 64 bytes, así que los cortes
+    a partir de una posición dependen solo de los bytes que siguen; por eso basta con empezar
+    a calcularlo 64 bytes antes del tamaño mínimo.
+
+    Retorna:
+        La posición del corte, `start + MAX_CHUNK` si no hay corte antes, o None si `data`
+        termina antes de encontrarlo (hacen falta más bytes para decidir).
+    """
+    limit = start + MAX_CHUNK
+    end = min(len(data), limit)
+    h = 0
+    for i in range(max(start, start + MIN_CHUNK - 64), end):
+        h = ((h << 1) + _GEAR[data[i]]) & _MASK64
+        if not h & _CUT_MASK and i + 1 - start >= MIN_CHUNK:
+            return i + 1
+    return limit if end == limit else None
+
+class Chunk:
+    """
+    Fragmento de contenido compartido.
+
+    Atributos:
+        digest (str): Hash BLAKE2b (128 bits, hexadecimal) de sus bytes.
+        size (int): Tamaño en bytes.
+        blocks (array): Bloques del dispositivo con sus datos.
+        refs (int): Referencias desde archivos.
+    """
+    __slots__ = ('digest', 'size', 'blocks', 'refs')
+
+    def __init__(self, digest: str, size: int, blocks: array, refs: int = 0):
+        """Inicializa un fragmento ya escrito en el dispositivo."""
+        self.digest = digest
+        self.size = size
+        self.blocks = blocks
+        self.refs = refs
+
+class ChunkStore:
+    """
+    Fragmentos direccionados por contenido con contador de referencias.
+
+    Atributos:
+        path (str): Directorio del índice de fragmentos.
+        device (BufferCache): Caché de buffers del dispositivo con los datos de los fragmentos.
+        chunks (int): Fragmentos almacenados.
+        stored_bytes (int): Bytes almacenados (una vez por fragmento).
+        logical_bytes (int): Bytes referenciados por los archivos (con repeticiones).
+    """
+    def __init__(self, path: str, device: BufferCache, totals: Optional[Dict[str, int]] = None):
+        """Abre el índice en `path`; `totals` son los contadores guardados en la última compactación."""
+        self.path = path
+        self.device = device
+        totals = totals or {}
+        self.chunks = totals.get('chunks', 0)
+        self.stored_bytes = totals.get('stored_bytes', 0)
+        self.logical_bytes = totals.get('logical_bytes', 0)
+        # Primer byte del hash (2 dígitos hexadecimales) -> hash -> fragmento; se carga bajo demanda.
+        self._shards: Dict[str, Dict[str, Chunk]] = {}
+        self._dirty_shards: Set[str] = set()
+        self._unreferenced: Set[Chunk] = set()
+        self._deferred_blocks: List[int] = []
+
+    def _shard(self, prefix: str) -> Dict[str, Chunk]:
+        """Parte del índice de un prefijo de hash, leída del disco en el primer acceso."""
+        shard = self._shards.get(prefix)
+        if shard is None:
+            try:
+                with open(os.path.join(self.path, f"{prefix}.json"), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                data = {}
+            shard = {digest: Chunk(digest, size, array('I', blocks), refs)
+                     for digest, (size, refs, blocks) in data.items()}
+            self._shards[prefix] = shard
+        return shard
+
+    def get(self, digest: str) -> Chunk:
+        """Fragmento de un hash (debe existir)."""
+        return self._shard(digest[:2])[digest]
+
+    def put(self, data: bytes) -> Chunk:
+        """Añade una referencia al fragmento con estos bytes, guardándolos solo si no existían."""
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        shard = self._shard(digest[:2])
+        chunk = shard.get(digest)
+        if chunk is None:
+            blocks = array('I')
+            self.device.write(blocks, 0, 0, data)
+            chunk = shard[digest] = Chunk(digest, len(data), blocks)
+            self.chunks += 1
+            self.stored_bytes += len(data)
+        elif not chunk.refs:
+            self._unreferenced.discard(chunk)
+        chunk.refs += 1
+        self.logical_bytes += chunk.size
+        self._dirty_shards.add(digest[:2])
+        return chunk
+
+    def release(self, chunk: Chunk):
+        """Quita una referencia; sin referencias, el fragmento se libera en la próxima compactación."""
+        chunk.refs -= 1
+        self.logical_bytes -= chunk.size
+        self._dirty_shards.add(chunk.digest[:2])
+        if not chunk.refs:
+            self._unreferenced.add(chunk)
+
+    def defer_free(self, blocks: List[int]):
+        """Bloques que dejan de usarse pero que la instantánea actual aún referencia: se liberan al compactar."""
+        self._deferred_blocks.extend(blocks)
+
+    def collect(self):
+        """Libera los fragmentos sin referencias y los bloques diferidos (al compactar)."""
+        for chunk in self._unreferenced:
+            if chunk.refs:
+                continue
+            for block in chunk.blocks:
+                self.device.release(block)
+            del self._shards[chunk.digest[:2]][chunk.digest]
+            self._dirty_shards.add(chunk.digest[:2])
+            self.chunks -= 1
+            self.stored_bytes -= chunk.size
+        self._unreferenced.clear()
+        for block in self._deferred_blocks:
+            self.device.release(block)
+        self._deferred_blocks.clear()
+
+    def take_dirty(self) -> Dict[str, Dict[str, list]]:
+        """Contenido de las partes del índice modificadas desde la última llamada."""
+        shards = {prefix: {digest: [chunk.size, chunk.refs, chunk.blocks.tolist()]
+                           for digest, chunk in self._shards[prefix].items()}
+                  for prefix in self._dirty_shards}
+        self._dirty_shards.clear()
+        return shards
+
+    def totals(self) -> Dict[str, int]:
+        """Contadores globales, para guardarlos con la instantánea."""
+        return {'chunks': self.chunks, 'stored_bytes': self.stored_bytes, 'logical_bytes': self.logical_bytes}
+
+    def read(self, chunk: Chunk, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """Bytes de un rango de un fragmento."""
+        return self.device.read(chunk.blocks, chunk.size, offset, length)
+
+    def views(self, chunks: List[Chunk], size: int, offset: int = 0,
+              length: Optional[int] = None) -> Iterator[memoryview]:
+        """Recorre un rango del archivo formado por `chunks` como `memoryview`, sin copiar los datos."""
+        end = size if length is None else min(size, offset + length)
+        pos = 0
+        for chunk in chunks:
+            if pos >= end:
+                break
+            chunk_end = pos + chunk.size
+            if chunk_end > offset:
+                start = max(offset - pos, 0)
+                yield from self.device.views(chunk.blocks, chunk.size, start, min(end, chunk_end) - pos - start)
+            pos = chunk_end
+
+    def replace(self, chunks: List[Chunk], data: bytes) -> Tuple[List[Chunk], int]:
+        """Sustituye todo el contenido de un archivo. Retorna sus nuevos fragmentos y su tamaño."""
+        new = []
+        start = 0
+        while start < len(data):
+            cut = next_cut(data, start) or len(data)
+            new.append(self.put(data[start:cut]))
+            start = cut
+        for chunk in chunks:
+            self.release(chunk)
+        return new, len(data)
+
+    def write(self, chunks: List[Chunk], size: int, offset: int, data: bytes) -> Tuple[List[Chunk], int]:
+        """
+        Escribe `data` en `offset` (ampliando con ceros si queda más allá del final).
+
+        Solo se vuelven a fragmentar los bytes desde el inicio del fragmento donde empieza la
+        escritura hasta el primer corte nuevo que coincide con un corte antiguo; a partir de ahí
+        los fragmentos antiguos son los mismos que daría fragmentar el archivo entero, así que
+        se conservan. Anexar solo refragmenta el último fragmento más lo anexado.
+
+        Retorna:
+            Los nuevos fragmentos del archivo y su tamaño.
+        """
+        if not data and offset <= size:
+            return chunks, size
+        # Fragmento donde empieza la escritura (el último si es al final o más allá).
+        i, pos = 0, 0
+        while i < len(chunks) and pos + chunks[i].size <= offset:
+            pos += chunks[i].size
+            i += 1
+        if i == len(chunks) and i > 0:
+            i -= 1
+            pos -= chunks[i].size
+        buf = bytearray()
+        if i < len(chunks):
+            buf += self.read(chunks[i], 0, min(offset - pos, chunks[i].size))
+        if offset > size:
+            buf += bytes(offset - size)
+        buf += data
+        end = offset + len(data)
+        # Fragmentos antiguos tapados por la escritura; del último solo se conserva lo que sigue.
+        j, old_pos = i, pos
+        while j < len(chunks) and old_pos + chunks[j].size <= end:
+            old_pos += chunks[j].size
+            j += 1
+        if j < len(chunks):
+            buf += self.read(chunks[j], end - old_pos)
+            j += 1
+
+        new = []
+        start = 0
+        while True:
+            cut = next_cut(buf, start)
+            if cut is not None:
+                new.append(self.put(bytes(buf[start:cut])))
+                start = cut
+            elif start == len(buf) or j == len(chunks):
+                # Corte sobre un límite antiguo, o fin del archivo.
+                if start < len(buf):
+                    new.append(self.put(bytes(buf[start:])))
+                break
+            else:
+                # Sin corte todavía: se añade el siguiente fragmento antiguo.
+                del buf[:start]
+                start = 0
+                buf += self.read(chunks[j])
+                j += 1
+        for chunk in chunks[i:j]:
+            self.release(chunk)
+        return chunks[:i] + new + chunks[j:], max(size, end)
+
+    def stats(self) -> Dict[str, Any]:
+        """Fragmentos, bytes almacenados y referenciados, y razón de deduplicación."""
+        return {
+            'chunks': self.chunks,
+            'stored_bytes': self.stored_bytes,
+            'logical_bytes': self.logical_bytes,
+            'dedup_ratio': self.logical_bytes / self.stored_bytes if self.stored_bytes else 1.0,
+        }
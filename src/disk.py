@@ -0,0 +1,247 @@
+"""
+Disco simulado con planificación de E/S para el Sistema Operativo Simulado.
+
+Modela un disco de un solo cabezal con una cola de peticiones por cilindro. Los procesos emiten
+peticiones (instrucción `disk c` de un programa, o el comando `disk` del shell), quedan BLOCKED y
+el planificador los despierta cuando su petición termina. Mientras tanto la CPU ejecuta otros
+procesos, de modo que el solapamiento de CPU y E/S se refleja en las métricas.
+
+El disco atiende una petición a la vez; al terminar una, la política elige la siguiente entre
+las pendientes:
+
+- FCFS: en orden de llegada.
+- SSTF: la más cercana al cabezal (Shortest Seek Time First).
+- SCAN (ascensor): recorre el disco en un sentido atendiendo las que encuentra, llega hasta el
+  extremo y da la vuelta.
+- C-LOOK: atiende solo en sentido ascendente y, al no quedar peticiones por delante, salta a la
+  más baja (el salto cuenta como desplazamiento).
+
+El servicio de una petición dura el desplazamiento (`seek_rate` cilindros por unidad de tiempo,
+redondeando hacia arriba) más `transfer` unidades de transferencia. Se registran el
+desplazamiento total, el throughput, la utilización y la latencia de cada petición (desde que se
+emite hasta que termina).
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+class DiskRequest:
+    """
+    Petición de E/S a un cilindro.
+
+    Atributos:
+        pid (str): Proceso que la emitió.
+        cylinder (int): Cilindro pedido.
+        issued (int): Instante en que se emitió.
+        started (Optional[int]): Instante en que empezó a atenderse.
+        finished (Optional[int]): Instante en que terminó (o terminará, si está en servicio).
+        seek (int): Cilindros que recorrió el cabezal para atenderla.
+        token (int): Dato del emisor que acompaña a la petición (el planificador guarda la ficha
+            de la espera del proceso, para no despertar una espera posterior).
+    """
+    __slots__ = ('pid', 'cylinder', 'issued', 'started', 'finished', 'seek', 'token')
+
+    def __init__(self, pid: str, cylinder: int, issued: int, token: int = 0):
+        """Inicializa una petición pendiente."""
+        self.pid = pid
+        self.cylinder = cylinder
+        self.issued = issued
+        self.token = token
+        self.started: Optional[int] = None
+        self.finished: Optional[int] = None
+        self.seek = 0
+
+    @property
+    def wait(self) -> int:
+        """Tiempo en la cola antes de empezar a atenderse."""
+        return self.started - self.issued
+
+    @property
+    def latency(self) -> int:
+        """Tiempo desde que se emitió hasta que terminó."""
+        return self.finished - self.issued
+
+class DiskPolicy:
+    """
+    Interfaz de las políticas de planificación del disco.
+
+    `select` recibe las peticiones pendientes (en orden de llegada), la posición del cabezal y su
+    sentido (1 ascendente, -1 descendente) y retorna `(índice, desplazamiento, nuevo sentido)`.
+    """
+    name = 'base'
+
+    def select(self, queue: List[DiskRequest], head: int, direction: int, cylinders: int) -> Tuple[int, int, int]:
+        raise NotImplementedError
+
+class FCFSDiskPolicy(DiskPolicy):
+    """Atiende las peticiones en orden de llegada."""
+    name = 'fcfs'
+
+    def select(self, queue, head, direction, cylinders):
+        target = queue[0].cylinder
+        return 0, abs(target - head), 1 if target >= head else -1
+
+class SSTFDiskPolicy(DiskPolicy):
+    """Atiende la petición más cercana al cabezal (a igual distancia, la más antigua)."""
+    name = 'sstf'
+
+    def select(self, queue, head, direction, cylinders):
+        index = min(range(len(queue)), key=lambda i: abs(queue[i].cylinder - head))
+        target = queue[index].cylinder
+        return index, abs(target - head), 1 if target >= head else -1
+
+def _nearest_ahead(queue: List[DiskRequest], head: int, direction: int) -> Optional[int]:
+    """Índice de la petición más cercana en el sentido `direction` (incluido el cilindro actual), o None."""
+    best = None
+    for i, request in enumerate(queue):
+        distance = (request.cylinder - head) * direction
+        if distance >= 0 and (best is None or distance < best[0]):
+            best = (distance, i)
+    return None if best is None else best[1]
+
+class SCANDiskPolicy(DiskPolicy):
+    """Ascensor: avanza en su sentido hasta el extremo del disco y luego invierte la marcha."""
+    name = 'scan'
+
+    def select(self, queue, head, direction, cylinders):
+        index = _nearest_ahead(queue, head, direction)
+        if index is not None:
+            return index, abs(queue[index].cylinder - head), direction
+        # Nada por delante: el cabezal llega al extremo y vuelve.
+        edge = cylinders - 1 if direction > 0 else 0
+        index = _nearest_ahead(queue, head, -direction)
+        return index, abs(edge - head) + abs(edge - queue[index].cylinder), -direction
+
+class CLOOKDiskPolicy(DiskPolicy):
+    """Atiende en sentido ascendente y, sin peticiones por delante, salta a la más baja."""
+    name = 'clook'
+
+    def select(self, queue, head, direction, cylinders):
+        index = _nearest_ahead(queue, head, 1)
+        if index is None:
+            index = min(range(len(queue)), key=lambda i: queue[i].cylinder)
+        return index, abs(queue[index].cylinder - head), 1
+
+# Políticas de planificación del disco disponibles por nombre corto.
+DISK_POLICIES = ('fcfs', 'sstf', 'scan', 'clook')
+
+def make_disk_policy(name: str) -> DiskPolicy:
+    """Construye una política de planificación del disco por nombre. Lanza ValueError si no existe."""
+    if name == 'fcfs':
+        return FCFSDiskPolicy()
+    if name == 'sstf':
+        return SSTFDiskPolicy()
+    if name == 'scan':
+        return SCANDiskPolicy()
+    if name == 'clook':
+        return CLOOKDiskPolicy()
+    raise ValueError(f"Política de disco desconocida '{name}'. Opciones: {', '.join(DISK_POLICIES)}")
+
+class Disk:
+    """
+    Disco con cola de peticiones y política de planificación intercambiable.
+
+    El disco no tiene reloj propio: el planificador le entrega el instante al emitir una petición
+    (`submit`) y al vencer la que está en servicio (`complete`), y programa un evento para el
+    instante de fin que le devuelven.
+
+    Atributos:
+        cylinders (int): Número de cilindros (0 .. cylinders - 1).
+        policy (DiskPolicy): Política que elige la siguiente petición.
+        seek_rate (int): Cilindros que recorre el cabezal por unidad de tiempo.
+        transfer (int): Unidades de tiempo de transferencia por petición.
+        head (int): Cilindro del cabezal.
+        direction (int): Sentido del cabezal (1 ascendente, -1 descendente).
+        queue (List[DiskRequest]): Peticiones pendientes, en orden de llegada.
+        current (Optional[DiskRequest]): Petición en servicio.
+        recent (Deque[DiskRequest]): Últimas peticiones terminadas, para ver su latencia.
+        completed (int): Peticiones terminadas.
+        total_seek (int): Cilindros recorridos por el cabezal.
+        busy (int): Unidades de servicio de las peticiones terminadas.
+    """
+    def __init__(self, cylinders: int = 200, policy: str = 'fcfs', seek_rate: int = 20,
+                 transfer: int = 1, head: int = 0, history: int = 32):
+        """Inicializa un disco ocioso con el cabezal en `head`."""
+        if cylinders <= 0 or seek_rate <= 0 or transfer < 0:
+            raise ValueError("Parámetros del disco no válidos")
+        self.cylinders = cylinders
+        self.policy = make_disk_policy(policy)
+        self.seek_rate = seek_rate
+        self.transfer = transfer
+        self.head = head
+        self.direction = 1
+        self.queue: List[DiskRequest] = []
+        self.current: Optional[DiskRequest] = None
+        self.recent: Deque[DiskRequest] = deque(maxlen=history)
+        self.completed = 0
+        self.total_seek = 0
+        self.busy = 0
+        self._latency = 0
+        self._wait = 0
+        self._max_latency = 0
+
+    def set_policy(self, name: str):
+        """Cambia la política; las peticiones pendientes se atienden ya con la nueva."""
+        self.policy = make_disk_policy(name)
+
+    def submit(self, pid: str, cylinder: int, now: int, token: int = 0) -> Optional[int]:
+        """
+        Encola una petición. Lanza ValueError si el cilindro no existe.
+
+        Retorna:
+            El instante en que terminará si el disco estaba ocioso y empieza a atenderla, o None
+            si queda en la cola.
+        """
+        if not 0 <= cylinder < self.cylinders:
+            raise ValueError(f"Cilindro {cylinder} fuera del disco (0-{self.cylinders - 1})")
+        self.queue.append(DiskRequest(pid, cylinder, now, token))
+        if self.current is not None:
+            return None
+        return self._start(now)
+
+    def _start(self, now: int) -> int:
+        """Pone en servicio la petición que elige la política. Retorna su instante de fin."""
+        index, seek, self.direction = self.policy.select(self.queue, self.head, self.direction, self.cylinders)
+        request = self.queue.pop(index)
+        request.started = now
+        request.seek = seek
+        request.finished = now + -(-seek // self.seek_rate) + self.transfer
+        self.head = request.cylinder
+        self.current = request
+        return request.finished
+
+    def complete(self, now: int) -> Tuple[DiskRequest, Optional[int]]:
+        """
+        Termina la petición en servicio y empieza la siguiente, si hay.
+
+        Retorna:
+            Una tupla (petición terminada, instante de fin de la siguiente o None).
+        """
+        request = self.current
+        self.current = None
+        self.completed += 1
+        self.total_seek += request.seek
+        self.busy += request.finished - request.started
+        self._latency += request.latency
+        self._wait += request.wait
+        self._max_latency = max(self._max_latency, request.latency)
+        self.recent.append(request)
+        return request, self._start(now) if self.queue else None
+
+    def stats(self, now: int) -> Dict[str, Any]:
+        """Desplazamiento, throughput, utilización y latencias del disco hasta el instante `now`."""
+        n = self.completed
+        busy = self.busy + (now - self.current.started if self.current is not None else 0)
+        return {
+            'policy': self.policy.name,
+            'completed': n,
+            'pending': len(self.queue) + (self.current is not None),
+            'head': self.head,
+            'total_seek': self.total_seek,
+            'avg_seek': self.total_seek / n if n else 0.0,
+            'throughput': n / now if now else 0.0,
+            'utilization': busy / now if now else 0.0,
+            'avg_wait': self._wait / n if n else 0.0,
+            'avg_latency': self._latency / n if n else 0.0,
+            'max_latency': self._max_latency,
+        }
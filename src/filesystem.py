@@ -3,16 +3,62 @@ Sistema de Archivos Simulado en Memoria.
 
 Este módulo implementa un sistema de archivos jerárquico simple que reside en memoria.
 Utiliza una estructura de "inodos" para representar archivos y directorios.
-Proporciona persistencia básica al guardar y cargar su estado en un archivo JSON.
+
+Persistencia: el estado se guarda como una instantánea más un diario (journal) de solo
+anexado. Cada operación que modifica el árbol (`mkdir`, `touch`, `write`) se anexa al diario en
+el momento, como una línea JSON, de modo que guardar cuesta lo que ocupa el cambio y no lo que
+ocupa el árbol, y una caída solo pierde, como mucho, la última línea a medio escribir. Al
+arrancar se carga la instantánea y se reaplica el diario; cuando el diario acumula
+`compact_every` registros se compacta en la instantánea y el diario se vacía.
+
+La instantánea está fragmentada (ver fsstore.py): un registro por directorio y por archivo más
+un índice con el inodo raíz. Al arrancar solo se lee la raíz; los hijos de un directorio y el
+contenido de un archivo se cargan en su primer acceso, y con `memory_budget` los subárboles sin
+uso se descargan. Compactar solo reescribe los registros de los nodos modificados. Una
+instantánea en el formato antiguo (un único JSON con todo el árbol) se migra al arrancar.
+
+El contenido de los archivos se guarda deduplicado (ver chunkstore.py): cada archivo es una
+lista de fragmentos definidos por su contenido y cada fragmento distinto se almacena una sola
+vez, con un contador de referencias. Los bloques de datos se leen y escriben a través de una
+caché de buffers (ver bufcache.py) con escritura diferida, que se sincroniza al compactar.
+
+Para buscar sin recorrer el árbol, el FS mantiene de forma incremental un índice de nombres
+(ver fsindex.py), que sirve a `find`, y el tamaño total de cada directorio, que sirve a `du`:
+crear un nodo lo añade al índice y cambiar el tamaño de un archivo suma la diferencia a sus
+directorios antecesores.
+
+La resolución de rutas usa una caché LRU acotada (al estilo de la dentry cache de Linux) que
+asocia cada ruta absoluta normalizada a su inodo, o a None si no existe (entrada negativa).
+En lugar de buscar y borrar entradas al cambiar el árbol, la caché usa dos contadores de
+generación: crear un nodo solo puede invalidar entradas negativas y eliminarlo solo entradas
+positivas, así que cada operación incrementa el contador que le corresponde y las entradas
+con una generación antigua se tratan como fallos.
 """
 
+import base64
+import codecs
+import itertools
 import json
-from typing import Dict, Any, Optional
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from blockdev import BlockDevice, BLOCK_SIZE
+from bufcache import BufferCache
+from chunkstore import Chunk, ChunkStore
+from fsindex import NameIndex, is_glob
+from fsstore import ShardedStore, atomic_write_bytes, atomic_write_json, write_shard
 
 # Constantes para los tipos de nodos en el sistema de archivos.
 FS_FILE = 'file'
 FS_DIR = 'dir'
 
+def _decode(views: Iterable[memoryview]) -> str:
+    """Decodifica en UTF-8 una secuencia de fragmentos sin unirlos antes (un carácter puede quedar partido entre dos)."""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    return ''.join(decoder.decode(view) for view in views) + decoder.decode(b'', final=True)
+
 class Inode:
     """
     Representa un "inodo" en el sistema de archivos, que puede ser un archivo o un directorio.
@@ -22,79 +68,461 @@ class Inode:
         type (str): Tipo de nodo ('file' o 'dir').
         parent (Optional[Inode]): Referencia al inodo padre (directorio contenedor).
         children (Dict[str, Inode]): Si es un directorio, un diccionario de sus hijos.
-        content (str): Si es un archivo, su contenido.
+        content (str): Si es un archivo, su contenido como texto.
+        size (int): Si es un archivo, su tamaño en bytes; si es un directorio, el total de los
+            archivos de su subárbol (se mantiene al escribir, para `du`).
+        chunks (Optional[List[Chunk]]): Si es un archivo, sus fragmentos en el almacén de fragmentos.
+        ino (Optional[int]): Número de inodo en el almacén en disco.
+        store (Optional[ShardedStore]): Almacén del que se cargan bajo demanda hijos y contenido.
     """
-    def __init__(self, name: str, node_type: str, parent: Optional['Inode'] = None):
-        """Inicializa un nuevo inodo."""
+    # Sin __dict__ por inodo; un archivo no reserva diccionario de hijos ni un directorio fragmentos.
+    __slots__ = ('name', 'type', 'parent', 'ino', 'store', '_children', 'size', 'chunks', '_content')
+
+    def __init__(self, name: str, node_type: str, parent: Optional['Inode'] = None, ino: Optional[int] = None,
+                 store: Optional[ShardedStore] = None, loaded: bool = True):
+        """Inicializa un nuevo inodo; con `loaded=False` sus hijos o su contenido se leen del almacén al usarlos."""
         self.name = name
         self.type = node_type
         self.parent = parent
-        # Un directorio tiene hijos, un archivo no.
-        self.children: Dict[str, 'Inode'] = {} if node_type == FS_DIR else None
-        # Un archivo tiene contenido, un directorio no.
-        self.content: str = "" if node_type == FS_FILE else None
+        self.ino = ino
+        self.store = store
+        # Un directorio tiene hijos, un archivo no (None mientras no se hayan cargado).
+        self._children: Optional[Dict[str, 'Inode']] = {} if node_type == FS_DIR and loaded else None
+        # Un archivo tiene contenido, un directorio no: en fragmentos del almacén (None mientras
+        # no se hayan cargado) o, si el inodo aún no pertenece a un almacén, como texto.
+        self.size = 0
+        self.chunks: Optional[List[Chunk]] = [] if node_type == FS_FILE and loaded and store is not None else None
+        self._content: Optional[str] = "" if node_type == FS_FILE and loaded and store is None else None
+
+    @property
+    def children(self) -> Optional[Dict[str, 'Inode']]:
+        """Hijos del directorio, cargados desde el almacén en el primer acceso."""
+        if self.store is not None:
+            if self._children is None and self.type == FS_DIR:
+                self.store.load_children(self)
+            else:
+                self.store.touch(self)
+        return self._children
+
+    @children.setter
+    def children(self, value: Optional[Dict[str, 'Inode']]):
+        self._children = value
+
+    def file_chunks(self) -> List[Chunk]:
+        """Fragmentos del archivo, cargados desde el almacén en el primer acceso."""
+        if self.chunks is None:
+            self.store.load_file(self)
+        return self.chunks
+
+    @property
+    def content(self) -> Optional[str]:
+        """Contenido completo del archivo como texto."""
+        if self.type != FS_FILE or self.store is None:
+            return self._content
+        return _decode(self.store.chunk_store.views(self.file_chunks(), self.size))
+
+    @content.setter
+    def content(self, value: Optional[str]):
+        """Sustituye el contenido del archivo (en fragmentos si pertenece a un almacén)."""
+        if self.store is None:
+            self._content = value
+            return
+        self.chunks, self.size = self.store.chunk_store.replace(self.file_chunks(), value.encode('utf-8'))
 
     def to_dict(self) -> Dict[str, Any]:
-        """Serializa el inodo y toda su descendencia a un diccionario para la persistencia en JSON."""
-        data = {
-            'name': self.name,
-            'type': self.type,
-            'content': self.content,
-            # Serializa recursivamente a los hijos.
-            'children': {name: child.to_dict() for name, child in self.children.items()} if self.children is not None else None
-        }
+        """
+        Serializa el inodo y toda su descendencia a un diccionario anidado para la persistencia en JSON.
+
+        El recorrido es iterativo (con una pila explícita), así que la profundidad del árbol no
+        está limitada por el límite de recursión de Python.
+        """
+        def entry(node: 'Inode') -> Dict[str, Any]:
+            return {'name': node.name, 'type': node.type, 'content': node.content,
+                    'children': {} if node.type == FS_DIR else None}
+
+        data = entry(self)
+        stack = [(self, data)]
+        while stack:
+            node, node_data = stack.pop()
+            if node.type != FS_DIR:
+                continue
+            for name, child in node.children.items():
+                child_data = entry(child)
+                node_data['children'][name] = child_data
+                stack.append((child, child_data))
         return data
 
     @staticmethod
     def from_dict(data: Dict[str, Any], parent: Optional['Inode'] = None) -> 'Inode':
-        """Deserializa un diccionario (de JSON) a una estructura de inodos."""
-        node = Inode(data['name'], data['type'], parent)
-        if data['type'] == FS_FILE:
-            node.content = data.get('content', '')
-        else:
-            # Deserializa recursivamente a los hijos.
-            node.children = {name: Inode.from_dict(child_data, node) for name, child_data in data.get('children', {}).items()}
-        return node
+        """Deserializa un diccionario (de JSON) a una estructura de inodos, de forma iterativa."""
+        root = Inode(data['name'], data['type'], parent)
+        stack = [(root, data)]
+        while stack:
+            node, node_data = stack.pop()
+            if node.type == FS_FILE:
+                node._content = node_data.get('content') or ''
+                continue
+            for name, child_data in (node_data.get('children') or {}).items():
+                child = Inode(child_data['name'], child_data['type'], node)
+                node._children[name] = child
+                stack.append((child, child_data))
+        return root
 
 class FileSystem:
     """
     Gestiona la estructura del sistema de archivos, el estado y las operaciones.
+    
+    Atributos:
+        root (Inode): Directorio raíz.
+        cwd (Inode): Directorio de trabajo actual.
+        cache_size (int): Capacidad de la caché de rutas.
+        cache_hits, cache_misses, cache_evictions (int): Contadores de la caché de rutas.
+        journal_path (str): Diario de operaciones (`<persistence_path>.journal`).
+        compact_every (int): Registros del diario que provocan una compactación.
+        journal_records (int): Registros en el diario desde la última instantánea.
+        fsync (bool): Si cada registro del diario se fuerza a disco con `os.fsync`.
+        store (ShardedStore): Registros de la instantánea (`<persistence_path>.d`).
+        device (BlockDevice): Bloques de datos de los archivos, proyectados desde `<persistence_path>.img`.
+        cache (BufferCache): Caché de buffers entre los fragmentos y el dispositivo.
+        chunks_path (str): Directorio del índice de fragmentos (`<persistence_path>.chunks`).
+        chunk_store (ChunkStore): Fragmentos deduplicados del contenido de los archivos.
+        index (NameIndex): Índice de nombres para `find` (`<persistence_path>.names`).
+        pending_path (str): Lote de la compactación en curso (`<persistence_path>.pending`).
     """
-    def __init__(self, persistence_path: str = 'fs_state.json'):
-        """Inicializa el FS, cargando el estado desde un archivo si existe."""
+    def __init__(self, persistence_path: str = 'fs_state.json', cache_size: int = 1024,
+                 compact_every: int = 1000, fsync: bool = False, memory_budget: Optional[int] = None,
+                 block_size: int = BLOCK_SIZE, cache_blocks: int = 256, cache_policy: str = 'lru',
+                 read_ahead: int = 8):
+        """Inicializa el FS, cargando el índice de la instantánea y reaplicando el diario si existen."""
         self.persistence_path = persistence_path
+        self.image_path = persistence_path + '.img'
+        self.bitmap_path = persistence_path + '.bitmap'
+        self.chunks_path = persistence_path + '.chunks'
+        self.names_path = persistence_path + '.names'
+        self.index = NameIndex(self.names_path)
+        self.pending_path = persistence_path + '.pending'
+        self.store = ShardedStore(persistence_path + '.d', budget=memory_budget)
+        self.store.pinned = lambda: (self._cwd,)
+        self.store.on_evict = self._node_removed
+        self.journal_path = persistence_path + '.journal'
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.journal_records = 0
+        self._journal = None
+        self.cache_size = cache_size
+        # Ruta absoluta -> (inodo o None, generación con la que se guardó).
+        self._path_cache: 'OrderedDict[str, Tuple[Optional[Inode], int]]' = OrderedDict()
+        self._create_gen = 0
+        self._remove_gen = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        self.device: Optional[BlockDevice] = None
+        chunk_totals = None
+        adopt = upgrade = reindex = False
+        self._recover_batch()
         try:
             # Intenta cargar un estado previo del sistema de archivos.
-            with open(self.persistence_path, 'r') as f:
+            with open(self.persistence_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
+            if data.get('format') == 'sharded':
+                # Solo el índice: la raíz se cargará del almacén al acceder a sus hijos.
+                self.store.next_ino = data['next_ino']
+                self.root = Inode('/', FS_DIR, ino=data['root'], store=self.store, loaded=False)
+                # Sin 'root_size' la instantánea no tiene índice de nombres ni tamaños de directorio.
+                self.root.size = data.get('root_size', 0)
+                reindex = 'root_size' not in data
+                if 'block_size' in data:
+                    self.device = BlockDevice(self.image_path, data['block_size'], bitmap=self._read_bitmap())
+                # Sin 'block_size' los registros de archivo guardan el texto, y sin 'chunks' sus propios
+                # bloques: se pasan a fragmentos al cargarlos.
+                chunk_totals = data.get('chunks')
+                upgrade = chunk_totals is None or reindex
+            else:
+                # Formato antiguo: el árbol completo, que se migra al almacén fragmentado.
                 self.root = Inode.from_dict(data)
+                adopt = upgrade = reindex = True
         except (FileNotFoundError, json.JSONDecodeError):
             # Si no hay estado previo o está corrupto, crea un FS nuevo con un directorio raíz.
             self.root = Inode('/', FS_DIR)
+            adopt = True
+        if self.device is None:
+            self.device = BlockDevice(self.image_path, block_size)
+        self.cache = BufferCache(self.device, cache_blocks, cache_policy, read_ahead)
+        self.chunk_store = ChunkStore(self.chunks_path, self.cache, totals=chunk_totals)
+        self.store.chunk_store = self.chunk_store
+        if adopt:
+            self._adopt(self.root)
         self.cwd = self.root  # El directorio de trabajo actual comienza en la raíz.
+        if reindex:
+            self._reindex()
+        self._replay()
+        if upgrade or self.journal_records >= self.compact_every:
+            # Estado en un formato anterior: se reescribe ya en el actual.
+            self.checkpoint()
+
+    def _read_bitmap(self) -> bytes:
+        """Mapa de bits de bloques libres guardado en la última compactación."""
+        try:
+            with open(self.bitmap_path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return b''
+
+    @property
+    def cwd(self) -> Inode:
+        """Directorio de trabajo actual."""
+        return self._cwd
+
+    @cwd.setter
+    def cwd(self, node: Inode):
+        """Cambia el directorio de trabajo y recalcula su ruta absoluta (clave de la caché)."""
+        self._cwd = node
+        self._cwd_path = self._path_of(node)
+
+    @staticmethod
+    def _path_of(node: Inode) -> str:
+        """Ruta absoluta de un inodo, subiendo por sus padres."""
+        names = []
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return '/' + '/'.join(reversed(names))
+
+    def _adopt(self, top: Inode):
+        """Asigna número de inodo y almacén a un árbol construido en memoria y lo marca como modificado."""
+        stack = [top]
+        while stack:
+            node = stack.pop()
+            node.ino = self.store.allocate()
+            node.store = self.store
+            if node._content is not None:
+                node.chunks, node.size = self.chunk_store.replace([], node._content.encode('utf-8'))
+                node._content = None
+            self.store.added(node)
+            self.store.dirty.add(node)
+            if node._children is not None:
+                stack.extend(node._children.values())
+
+    def _reindex(self):
+        """
+        Reconstruye el índice de nombres y los tamaños de directorio recorriendo todo el árbol
+        (al migrar una instantánea que no los tenía). Los directorios quedan modificados para
+        que la compactación guarde los tamaños, así que el árbol entero queda en memoria hasta
+        entonces.
+        """
+        # (directorio, ruta, ya visitados sus hijos): cada directorio se apila dos veces y su
+        # tamaño se suma en la segunda, cuando ya se conocen los de sus subdirectorios.
+        stack: List[Tuple[Inode, str, bool]] = [(self.root, '', False)]
+        while stack:
+            node, path, done = stack.pop()
+            if done:
+                node.size = sum(child.size for child in node.children.values())
+                continue
+            self.store.dirty.add(node)
+            stack.append((node, path, True))
+            for name, child in node.children.items():
+                child_path = f"{path}/{name}"
+                self.index.add(name, child_path, child.type)
+                if child.type == FS_DIR:
+                    stack.append((child, child_path, False))
+                else:
+                    child.file_chunks()  # El tamaño se carga junto con los fragmentos.
+
+    def _node_created(self):
+        """Invalida las entradas negativas de la caché (un nodo nuevo puede hacerlas falsas)."""
+        self._create_gen += 1
+
+    def _node_removed(self):
+        """Invalida las entradas positivas de la caché (pueden apuntar al nodo eliminado o a sus hijos)."""
+        self._remove_gen += 1
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Contadores de la caché de rutas, para dimensionarla."""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'size': len(self._path_cache),
+            'capacity': self.cache_size,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'evictions': self.cache_evictions,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0,
+        }
+
+    def _replay(self):
+        """
+        Reaplica sobre el árbol cargado las operaciones del diario.
+
+        Las operaciones son idempotentes respecto a la instantánea (crear algo que ya existe no
+        hace nada, `write` sobrescribe y los anexos se registran como escrituras en su
+        desplazamiento), así que un diario que no llegó a vaciarse tras una
+        compactación se puede reaplicar sin riesgo. Una última línea incompleta (caída a mitad
+        de escritura) se descarta y se recorta del archivo para que los registros siguientes
+        no queden detrás de ella.
+        """
+        try:
+            f = open(self.journal_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            good_end = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                self._apply(record)
+                self.journal_records += 1
+                good_end += len(line)
+            torn = f.seek(0, os.SEEK_END) != good_end
+        if torn:
+            os.truncate(self.journal_path, good_end)
+
+    def _apply(self, record: Dict[str, Any]):
+        """Aplica un registro del diario (rutas absolutas) sin volver a registrarlo."""
+        parent_path, _, name = record['path'].rpartition('/')
+        parent = self._get_path(parent_path or '/')
+        if parent is None or parent.type != FS_DIR:
+            return
+        op = record['op']
+        if op in ('mkdir', 'touch'):
+            if name not in parent.children:
+                self._create(parent, name, FS_DIR if op == 'mkdir' else FS_FILE)
+        elif op in ('write', 'pwrite'):
+            node = parent.children.get(name)
+            if node is not None and node.type == FS_FILE:
+                if op == 'write':
+                    self._replace(node, record['content'])
+                else:
+                    self._pwrite(node, record['offset'], record['content'].encode('utf-8'))
+                self.store.dirty.add(node)
+
+    def _log(self, op: str, node: Inode, content: Optional[str] = None, offset: Optional[int] = None):
+        """Anexa una operación al diario y compacta si el diario alcanza `compact_every` registros."""
+        record = {'op': op, 'path': self._path_of(node)}
+        if content is not None:
+            record['content'] = content
+        if offset is not None:
+            record['offset'] = offset
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+        self.journal_records += 1
+        if self.journal_records >= self.compact_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """
+        Compacta el diario en la instantánea.
+
+        Solo se escriben los registros de los nodos modificados y las partes modificadas de los
+        índices de fragmentos y de nombres. Los contadores de referencias de los fragmentos deben coincidir
+        con los registros de archivo que los usan, así que todo lo que cambia se reúne primero
+        en un lote (`pending_path`) que se escribe de forma atómica, y solo después se aplica
+        a los registros, al índice de fragmentos, al mapa de bits y al índice del FS. Si hay una
+        caída a mitad, el arranque vuelve a aplicar el lote completo (ver `_recover_batch`) y
+        luego reaplica el diario, que solo se vacía al final. Los fragmentos sin referencias
+        se liberan aquí, de modo que sus bloques no se reutilizan mientras la instantánea
+        anterior aún los use. Antes de escribir el lote, los buffers sucios de la caché se
+        escriben en la imagen y la imagen se fuerza a disco.
+        """
+        self.chunk_store.collect()
+        batch = {
+            'manifest': {'format': 'sharded', 'root': self.root.ino, 'next_ino': self.store.next_ino,
+                         'root_size': self.root.size, 'block_size': self.device.block_size,
+                         'chunks': self.chunk_store.totals()},
+            'records': self.store.take_dirty(),
+            'chunks': self.chunk_store.take_dirty(),
+            'names': self.index.take_dirty(),
+            'bitmap': base64.b64encode(self.device.bitmap).decode('ascii'),
+        }
+        self.cache.sync()
+        self.device.flush()
+        atomic_write_json(self.pending_path, batch)
+        self._apply_batch(batch)
+        os.remove(self.pending_path)
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, 'w', encoding='utf-8')
+        self.journal_records = 0
+        self.store.maybe_evict()
+
+    def _apply_batch(self, batch: Dict[str, Any]):
+        """Escribe en la instantánea el contenido de un lote de compactación (el índice del FS al final)."""
+        for ino, record in batch['records'].items():
+            self.store.write(int(ino), record)
+        for prefix, shard in batch['chunks'].items():
+            write_shard(self.chunks_path, prefix, shard)
+        for prefix, shard in batch.get('names', {}).items():
+            write_shard(self.names_path, prefix, shard)
+        atomic_write_bytes(self.bitmap_path, base64.b64decode(batch['bitmap']))
+        atomic_write_json(self.persistence_path, batch['manifest'])
+
+    def _recover_batch(self):
+        """Termina de aplicar el lote de una compactación interrumpida, si lo hay."""
+        try:
+            with open(self.pending_path, 'r', encoding='utf-8') as f:
+                batch = json.load(f)
+        except FileNotFoundError:
+            return
+        self._apply_batch(batch)
+        os.remove(self.pending_path)
 
     def save_state(self):
-        """Guarda el estado actual del FS en un archivo JSON para persistencia."""
-        with open(self.persistence_path, 'w') as f:
-            json.dump(self.root.to_dict(), f, indent=4)
+        """
+        Asegura en disco el diario y lo cierra (al salir del shell).
+
+        La instantánea no se reescribe: cada cambio ya está en el diario, y los registros solo
+        se actualizan al compactar.
+        """
+        if self._journal is not None:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._journal.close()
+            self._journal = None
 
     def _get_path(self, path: str) -> Optional[Inode]:
-        """Resuelve una ruta (absoluta o relativa) a un inodo."""
-        if path.startswith('/'):
-            # Ruta absoluta: empezar desde la raíz.
-            current_node = self.root
-            parts = path.strip('/').split('/')
-        else:
-            # Ruta relativa: empezar desde el directorio de trabajo actual.
-            current_node = self.cwd
-            parts = path.split('/')
+        """
+        Resuelve una ruta (absoluta o relativa) a un inodo.
         
-        if parts == ['']:
-            return current_node
+        Las rutas se normalizan (se ignoran los segmentos vacíos y '.') y se buscan en la caché
+        por su forma absoluta. Las rutas con '..' se resuelven recorriendo el árbol sin pasar por
+        la caché, ya que su resultado depende de que existan los directorios intermedios.
+        """
+        absolute = path.startswith('/')
+        parts = [part for part in path.split('/') if part and part != '.']
+        start = self.root if absolute else self.cwd
+        if '..' in parts:
+            return self._walk(start, parts)
+
+        prefix = '' if absolute or self._cwd_path == '/' else self._cwd_path
+        key = prefix + '/' + '/'.join(parts)
+        entry = self._path_cache.get(key)
+        if entry is not None:
+            node, gen = entry
+            if gen == (self._remove_gen if node is not None else self._create_gen):
+                self._path_cache.move_to_end(key)
+                self.cache_hits += 1
+                return node
+
+        self.cache_misses += 1
+        node = self._walk(start, parts)
+        self._path_cache[key] = (node, self._remove_gen if node is not None else self._create_gen)
+        self._path_cache.move_to_end(key)
+        if len(self._path_cache) > self.cache_size:
+            self._path_cache.popitem(last=False)
+            self.cache_evictions += 1
+        return node
 
+    @staticmethod
+    def _walk(current_node: Inode, parts: List[str]) -> Optional[Inode]:
+        """Recorre el árbol desde `current_node` siguiendo los segmentos de una ruta."""
         for part in parts:
-            if part == '.':
-                continue
             if part == '..':
                 if current_node.parent:
                     current_node = current_node.parent
@@ -107,6 +535,27 @@ class FileSystem:
                 return None
         return current_node
 
+    def _create(self, parent: Inode, name: str, node_type: str) -> Inode:
+        """Crea un nodo hijo de `parent` y actualiza la caché de rutas."""
+        node = Inode(name, node_type, parent, ino=self.store.allocate(), store=self.store)
+        parent.children[name] = node
+        self.store.added(node)
+        self.store.dirty.update((parent, node))
+        self.index.add(name, self._path_of(node), node_type)
+        self._node_created()
+        return node
+
+    def _resized(self, node: Inode, old_size: int):
+        """Suma a los directorios antecesores la diferencia de tamaño de un archivo."""
+        delta = node.size - old_size
+        if not delta:
+            return
+        parent = node.parent
+        while parent is not None:
+            parent.size += delta
+            self.store.dirty.add(parent)
+            parent = parent.parent
+
     def mkdir(self, dirname: str) -> str:
         """Crea un nuevo directorio en el directorio de trabajo actual."""
         if '/' in dirname:
@@ -114,8 +563,7 @@ class FileSystem:
         if dirname in self.cwd.children:
             return f"Error: '{dirname}' ya existe."
         
-        new_dir = Inode(dirname, FS_DIR, self.cwd)
-        self.cwd.children[dirname] = new_dir
+        self._log('mkdir', self._create(self.cwd, dirname, FS_DIR))
         return f"Directorio '{dirname}' creado."
 
     def touch(self, filename: str) -> str:
@@ -125,38 +573,232 @@ class FileSystem:
         if filename in self.cwd.children:
             return f"Error: '{filename}' ya existe."
 
-        new_file = Inode(filename, FS_FILE, self.cwd)
-        self.cwd.children[filename] = new_file
+        self._log('touch', self._create(self.cwd, filename, FS_FILE))
         return f"Archivo '{filename}' creado."
 
-    def ls(self) -> str:
-        """Lista el contenido del directorio de trabajo actual."""
+    def ls(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Lista el contenido del directorio de trabajo actual.
+
+        Retorna:
+            `(listado, None)` o `(None, mensaje de error)`; el listado contiene nombres elegidos
+            por el usuario, así que el error va aparte.
+        """
         if self.cwd.type != FS_DIR:
-            return "Error: No es un directorio."
+            return None, "Error: No es un directorio."
         
         content = []
         for name, node in self.cwd.children.items():
             suffix = '/' if node.type == FS_DIR else ''
             content.append(f"{name}{suffix}")
-        return "\n".join(content) if content else "(vacío)"
+        return ("\n".join(content) if content else "(vacío)"), None
 
-    def write(self, filename: str, content: str) -> str:
-        """Escribe (o sobrescribe) contenido en un archivo."""
+    def _lookup_file(self, filename: str) -> Tuple[Optional[Inode], Optional[str]]:
+        """Resuelve un archivo; retorna `(inodo, None)` o `(None, mensaje de error)`."""
         node = self._get_path(filename)
         if not node:
-            return f"Error: Archivo '{filename}' no encontrado."
+            return None, f"Error: Archivo '{filename}' no encontrado."
         if node.type != FS_FILE:
-            return f"Error: '{filename}' no es un archivo."
-        
+            return None, f"Error: '{filename}' no es un archivo."
+        return node, None
+
+    def _pwrite(self, node: Inode, offset: int, data: bytes):
+        """Escribe bytes en un desplazamiento del archivo; solo refragmenta los fragmentos del rango."""
+        old_size = node.size
+        node.chunks, node.size = self.chunk_store.write(node.file_chunks(), node.size, offset, data)
+        self._resized(node, old_size)
+
+    def _replace(self, node: Inode, content: str):
+        """Sustituye todo el contenido de un archivo."""
+        old_size = node.size
         node.content = content
+        self._resized(node, old_size)
+
+    def write(self, filename: str, content: str) -> str:
+        """Escribe (o sobrescribe) contenido en un archivo."""
+        node, error = self._lookup_file(filename)
+        if error:
+            return error
+        
+        self._replace(node, content)
+        self.store.dirty.add(node)
+        self._log('write', node, content)
         return f"Contenido escrito en '{filename}'."
 
-    def cat(self, filename: str) -> str:
-        """Muestra el contenido de un archivo."""
-        node = self._get_path(filename)
-        if not node:
-            return f"Error: Archivo '{filename}' no encontrado."
-        if node.type != FS_FILE:
-            return f"Error: '{filename}' no es un archivo."
+    def pwrite(self, filename: str, offset: int, content: str) -> str:
+        """Escribe contenido a partir de un desplazamiento en bytes, sin tocar el resto del archivo."""
+        node, error = self._lookup_file(filename)
+        if error:
+            return error
+        if offset < 0:
+            return "Error: El desplazamiento no puede ser negativo."
+
+        self._pwrite(node, offset, content.encode('utf-8'))
+        self.store.dirty.add(node)
+        self._log('pwrite', node, content, offset)
+        return f"Contenido escrito en '{filename}' desde el byte {offset}."
+
+    def append(self, filename: str, content: str) -> str:
+        """Anexa contenido al final de un archivo; cuesta lo que ocupa lo anexado."""
+        node, error = self._lookup_file(filename)
+        if error:
+            return error
+
+        node.file_chunks()  # El tamaño se carga junto con los fragmentos.
+        offset = node.size
+        self._pwrite(node, offset, content.encode('utf-8'))
+        self.store.dirty.add(node)
+        self._log('pwrite', node, content, offset)
+        return f"Contenido anexado a '{filename}' ({node.size} bytes)."
+
+    def read_views(self, filename: str, offset: int = 0, length: Optional[int] = None) -> Optional[Iterator[memoryview]]:
+        """
+        Lee un rango del archivo sin copiarlo: `memoryview` sobre los buffers de la caché, una
+        por bloque de cada fragmento tocado. Retorna None si el archivo no existe.
+        """
+        node, error = self._lookup_file(filename)
+        if error:
+            return None
+        return self.chunk_store.views(node.file_chunks(), node.size, offset, length)
+
+    def read(self, filename: str, offset: int = 0,
+             length: Optional[int] = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Lee `length` bytes de un archivo (hasta el final si es None) desde un desplazamiento.
+
+        Retorna:
+            `(texto, None)` o `(None, mensaje de error)`.
+        """
+        node, error = self._lookup_file(filename)
+        if error:
+            return None, error
+        if offset < 0 or (length is not None and length < 0):
+            return None, "Error: El desplazamiento y la longitud no pueden ser negativos."
+
+        return _decode(self.chunk_store.views(node.file_chunks(), node.size, offset, length)), None
+
+    def cat(self, filename: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Lee el contenido completo de un archivo.
+
+        Retorna:
+            `(contenido, None)` o `(None, mensaje de error)`; el contenido puede empezar por
+            cualquier texto, así que el error va aparte.
+        """
+        node, error = self._lookup_file(filename)
+        if error:
+            return None, error
         
-        return node.content
\ No newline at end of file
+        return node.content, None
+
+    def _resolve_dir(self, path: Optional[str]) -> Tuple[Optional[Inode], Optional[str]]:
+        """Resuelve un directorio (el de trabajo si `path` es None); retorna `(inodo, None)` o `(None, mensaje de error)`."""
+        node = self.cwd if path is None else self._get_path(path)
+        if not node:
+            return None, f"Error: Ruta '{path}' no encontrada."
+        if node.type != FS_DIR:
+            return None, f"Error: '{path}' no es un directorio."
+        return node, None
+
+    def find(self, path: Optional[str] = None, pattern: Optional[str] = None,
+             node_type: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """
+        Rutas absolutas, ordenadas, de los nodos bajo `path` (el directorio de trabajo si es
+        None) cuyo nombre cumple `pattern` (nombre exacto o patrón con `*`, `?` y `[...]`) y,
+        opcionalmente, de tipo `node_type`. Se sirve del índice de nombres sin recorrer el
+        árbol; sin patrón se recorren todas las partes del índice.
+
+        Retorna:
+            `(rutas, None)` o `([], mensaje de error)`.
+        """
+        base, error = self._resolve_dir(path)
+        if error:
+            return [], error
+        if pattern is None or is_glob(pattern):
+            entries = self.index.match(pattern or '*')
+        else:
+            entries = self.index.lookup(pattern).items()
+        prefix = self._path_of(base).rstrip('/') + '/'
+        return sorted(found for found, found_type in entries
+                      if found.startswith(prefix) and (node_type is None or found_type == node_type)), None
+
+    def du(self, path: Optional[str] = None) -> Tuple[Optional[Dict[str, int]], Optional[str]]:
+        """
+        Bytes que ocupan los archivos de un directorio o un archivo (el directorio de trabajo si
+        `path` es None), leídos de los tamaños en caché: un directorio solo carga sus hijos.
+
+        Retorna:
+            `({'.': total, hijo: tamaño, ...}, None)` o `(None, mensaje de error)`.
+        """
+        node = self.cwd if path is None else self._get_path(path)
+        if not node:
+            return None, f"Error: Ruta '{path}' no encontrada."
+        if node.type == FS_FILE:
+            return {node.name: node.size}, None
+        usage = {'.': node.size}
+        for name, child in sorted(node.children.items()):
+            usage[name + ('/' if child.type == FS_DIR else '')] = child.size
+        return usage, None
+
+    def grep(self, pattern: str, path: Optional[str] = None) -> Tuple[Optional[Iterator[Tuple[str, int, str]]], Optional[str]]:
+        """
+        Busca una expresión regular en las líneas de un archivo o de todos los archivos bajo un
+        directorio (el de trabajo si `path` es None).
+
+        Los resultados se generan a medida que se encuentran: los archivos se recorren uno a uno
+        y cada archivo se decodifica por bloques, guardando solo la línea en curso.
+
+        Retorna:
+            `(iterador de (ruta, número de línea, línea), None)` o `(None, mensaje de error)`.
+        """
+        try:
+            regex = re.compile(pattern)
+        except re.error as e:
+            return None, f"Error: Patrón no válido ({e})."
+        node = self.cwd if path is None else self._get_path(path)
+        if not node:
+            return None, f"Error: Ruta '{path}' no encontrada."
+        return self._grep_tree(regex, node), None
+
+    def _grep_tree(self, regex: re.Pattern, top: Inode) -> Iterator[Tuple[str, int, str]]:
+        """Recorre en preorden (por nombre) los archivos bajo `top` generando sus líneas coincidentes."""
+        stack = [(top, self._path_of(top))]
+        while stack:
+            node, path = stack.pop()
+            if node.type == FS_FILE:
+                yield from self._grep_file(regex, node, path)
+                continue
+            prefix = path.rstrip('/') + '/'
+            for name, child in sorted(node.children.items(), reverse=True):
+                stack.append((child, prefix + name))
+
+    def _grep_file(self, regex: re.Pattern, node: Inode, path: str) -> Iterator[Tuple[str, int, str]]:
+        """Genera las líneas coincidentes de un archivo sin decodificarlo entero."""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        views = self.chunk_store.views(node.file_chunks(), node.size)
+        # Trozos de la línea aún sin terminar: se unen solo al llegar su '\n', así que una línea
+        # larga repartida en muchos bloques no se vuelve a copiar en cada bloque.
+        pending: List[str] = []
+        number = 0
+        for text in itertools.chain((decoder.decode(view) for view in views), (decoder.decode(b'', final=True),)):
+            if '\n' not in text:
+                if text:
+                    pending.append(text)
+                continue
+            lines = text.split('\n')
+            pending.append(lines[0])
+            lines[0] = ''.join(pending)
+            pending = [lines.pop()]
+            for line in lines:
+                number += 1
+                if regex.search(line):
+                    yield path, number, line
+        last = ''.join(pending)
+        if last:
+            number += 1
+            if regex.search(last):
+                yield path, number, last
+
+    def df(self) -> Dict[str, Any]:
+        """Uso del dispositivo de bloques y deduplicación: bloques ocupados y libres, fragmentos y bytes únicos."""
+        return {**self.device.stats(), **self.chunk_store.stats()}
@@ -0,0 +1,235 @@
+"""
+Índice de bloques libres para el Gestor de Memoria del sistema operativo simulado.
+
+Sustituye a la lista de huecos que se recorría de forma lineal. Cada hueco `(inicio, tamaño)`
+se indexa a la vez:
+
+- por dirección, en un treap (árbol binario de búsqueda aleatorizado) aumentado con el tamaño
+  máximo de cada subárbol, lo que permite encontrar el primer hueco suficiente (First-Fit y
+  Next-Fit) en O(log n) esperado;
+- por tamaño, en un segundo treap ordenado por `(tamaño, inicio)` para Best-Fit y Worst-Fit;
+- por extremos, en dos diccionarios (`inicio -> tamaño` y `fin -> inicio`), de modo que al
+  liberar un bloque sus vecinos libres se localizan en O(1) y la fusión solo los toca a ellos.
+"""
+
+import random
+from typing import Dict, Iterator, Optional, Tuple
+
+# Estrategias de asignación soportadas.
+FIRST_FIT = 'first'
+BEST_FIT = 'best'
+WORST_FIT = 'worst'
+NEXT_FIT = 'next'
+STRATEGIES = (FIRST_FIT, BEST_FIT, WORST_FIT, NEXT_FIT)
+
+class _Node:
+    """Nodo de un treap: clave de orden, tamaño del hueco y máximo tamaño del subárbol."""
+    __slots__ = ('key', 'size', 'prio', 'left', 'right', 'max')
+
+    def __init__(self, key, size: int, prio: float):
+        self.key = key
+        self.size = size
+        self.prio = prio
+        self.left: Optional['_Node'] = None
+        self.right: Optional['_Node'] = None
+        self.max = size
+
+def _update(node: _Node):
+    """Recalcula el tamaño máximo del subárbol de `node`."""
+    m = node.size
+    if node.left is not None and node.left.max > m:
+        m = node.left.max
+    if node.right is not None and node.right.max > m:
+        m = node.right.max
+    node.max = m
+
+def _split(node: Optional[_Node], key) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Divide el treap en (claves < key, claves >= key)."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        _update(node)
+        return node, right
+    left, node.left = _split(node.left, key)
+    _update(node)
+    return left, node
+
+def _merge(a: Optional[_Node], b: Optional[_Node]) -> Optional[_Node]:
+    """Une dos treaps donde todas las claves de `a` son menores que las de `b`."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.prio > b.prio:
+        a.right = _merge(a.right, b)
+        _update(a)
+        return a
+    b.left = _merge(a, b.left)
+    _update(b)
+    return b
+
+def _insert(node: Optional[_Node], new: _Node) -> _Node:
+    """Inserta `new` respetando el orden por clave y el montículo por prioridad."""
+    if node is None:
+        return new
+    if new.prio > node.prio:
+        new.left, new.right = _split(node, new.key)
+        _update(new)
+        return new
+    if new.key < node.key:
+        node.left = _insert(node.left, new)
+    else:
+        node.right = _insert(node.right, new)
+    _update(node)
+    return node
+
+def _delete(node: Optional[_Node], key) -> Optional[_Node]:
+    """Elimina el nodo con la clave dada (debe existir)."""
+    if node is None:
+        return None
+    if node.key == key:
+        return _merge(node.left, node.right)
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    else:
+        node.right = _delete(node.right, key)
+    _update(node)
+    return node
+
+def _first_fit(node: Optional[_Node], size: int, lo: int) -> Optional[_Node]:
+    """Nodo de menor clave >= `lo` cuyo tamaño es >= `size` (poda con el máximo del subárbol)."""
+    while node is not None and node.max >= size:
+        if node.key >= lo:
+            found = _first_fit(node.left, size, lo)
+            if found is not None:
+                return found
+            if node.size >= size:
+                return node
+        node = node.right
+    return None
+
+class FreeBlockIndex:
+    """
+    Conjunto de huecos libres indexado por dirección, por tamaño y por extremos.
+
+    Los huecos adyacentes se fusionan al insertarse, por lo que nunca hay dos huecos contiguos.
+
+    Atributos:
+        _size (Dict[int, int]): Inicio -> tamaño de cada hueco.
+        _by_end (Dict[int, int]): Fin (exclusivo) -> inicio de cada hueco.
+        _addr_root (Optional[_Node]): Treap por dirección, aumentado con el tamaño máximo.
+        _size_root (Optional[_Node]): Treap por `(tamaño, inicio)`.
+        total (int): Espacio libre total.
+    """
+    def __init__(self, seed: int = 0):
+        """Inicializa un índice vacío. La semilla fija hace reproducible la forma de los árboles."""
+        self._size: Dict[int, int] = {}
+        self._by_end: Dict[int, int] = {}
+        self._addr_root: Optional[_Node] = None
+        self._size_root: Optional[_Node] = None
+        self._rng = random.Random(seed)
+        self.total = 0
+
+    def _insert_block(self, start: int, size: int):
+        """Inserta un hueco sin fusionar (los vecinos ya fueron retirados)."""
+        self._size[start] = size
+        self._by_end[start + size] = start
+        self._addr_root = _insert(self._addr_root, _Node(start, size, self._rng.random()))
+        self._size_root = _insert(self._size_root, _Node((size, start), size, self._rng.random()))
+        self.total += size
+
+    def _remove_block(self, start: int) -> int:
+        """Retira un hueco existente y retorna su tamaño."""
+        size = self._size.pop(start)
+        del self._by_end[start + size]
+        self._addr_root = _delete(self._addr_root, start)
+        self._size_root = _delete(self._size_root, (size, start))
+        self.total -= size
+        return size
+
+    def add(self, start: int, size: int):
+        """Añade un hueco libre, fusionándolo con sus vecinos inmediatos si son libres."""
+        if size <= 0:
+            return
+        left = self._by_end.get(start)
+        if left is not None:
+            size += self._remove_block(left)
+            start = left
+        if start + size in self._size:
+            size += self._remove_block(start + size)
+        self._insert_block(start, size)
+
+    def take(self, start: int, size: int):
+        """Ocupa los primeros `size` unidades del hueco que empieza en `start`."""
+        block = self._remove_block(start)
+        if block > size:
+            self._insert_block(start + size, block - size)
+
+    def find(self, size: int, strategy: str = FIRST_FIT, rover: int = 0) -> Optional[int]:
+        """
+        Busca un hueco de al menos `size` unidades según la estrategia indicada.
+
+        - first: el de menor dirección.
+        - best: el más pequeño que sirva (a igual tamaño, el de menor dirección).
+        - worst: el más grande.
+        - next: el primero a partir de `rover` (la posición de la última asignación), dando la vuelta.
+
+        Retorna:
+            La dirección de inicio del hueco, o None si ninguno es suficiente.
+        """
+        if self._addr_root is None or self._addr_root.max < size:
+            return None
+        if strategy == BEST_FIT:
+            node, best = self._size_root, None
+            while node is not None:
+                if node.key >= (size, -1):
+                    best = node
+                    node = node.left
+                else:
+                    node = node.right
+            return best.key[1]
+        if strategy == WORST_FIT:
+            node = self._size_root
+            while node.right is not None:
+                node = node.right
+            return node.key[1]
+        if strategy == NEXT_FIT and rover:
+            node = _first_fit(self._addr_root, size, rover)
+            if node is not None:
+                return node.key
+        return _first_fit(self._addr_root, size, 0).key
+
+    def largest(self) -> int:
+        """Tamaño del mayor hueco libre (0 si no hay ninguno)."""
+        return self._addr_root.max if self._addr_root is not None else 0
+
+    def size_at(self, start: int) -> Optional[int]:
+        """Tamaño del hueco que empieza en `start`, o None si no hay ninguno."""
+        return self._size.get(start)
+
+    def start_ending_at(self, end: int) -> Optional[int]:
+        """Inicio del hueco que termina justo en `end`, o None si no hay ninguno."""
+        return self._by_end.get(end)
+
+    def clear(self):
+        """Elimina todos los huecos."""
+        self._size.clear()
+        self._by_end.clear()
+        self._addr_root = None
+        self._size_root = None
+        self.total = 0
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Itera los huecos `(inicio, tamaño)` en orden de dirección (recorrido en orden, iterativo)."""
+        stack, node = [], self._addr_root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key, node.size
+            node = node.right
+
+    def __len__(self) -> int:
+        return len(self._size)
@@ -0,0 +1,100 @@
+"""
+Índice de nombres del Sistema de Archivos Simulado.
+
+Asocia cada nombre de archivo o directorio con las rutas absolutas de los nodos que lo llevan y
+su tipo, de modo que `find` no tiene que recorrer el árbol (ni cargar sus registros). Como el
+FS no tiene operaciones de borrado ni de renombrado, la ruta de un nodo no cambia nunca y el
+índice solo crece: `mkdir` y `touch` añaden una entrada.
+
+El índice se reparte en 256 archivos por el primer byte del hash BLAKE2b del nombre
+(`<directorio>/<xx>.json`, cada uno `{nombre: {ruta: tipo}}`) que se cargan al consultarlos, y
+al compactar solo se reescriben los modificados. Buscar un nombre exacto lee una sola parte;
+un patrón con comodines las recorre todas.
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterator, Set, Tuple
+
+# Número de partes entre las que se reparte el índice.
+SHARDS = 256
+
+# Caracteres con significado especial en un patrón de `fnmatch`.
+_GLOB_CHARS = re.compile(r'[*?\[]')
+
+def is_glob(pattern: str) -> bool:
+    """Indica si un patrón contiene comodines (`*`, `?` o `[...]`)."""
+    return _GLOB_CHARS.search(pattern) is not None
+
+def _prefix(name: str) -> str:
+    """Parte del índice a la que pertenece un nombre."""
+    return hashlib.blake2b(name.encode('utf-8'), digest_size=1).hexdigest()
+
+class NameIndex:
+    """
+    Índice nombre -> rutas, repartido en disco y cargado bajo demanda.
+
+    Atributos:
+        path (str): Directorio con las partes del índice.
+        lookups (int): Búsquedas por nombre exacto.
+        scans (int): Búsquedas por patrón (recorren todas las partes).
+    """
+    def __init__(self, path: str):
+        """Abre el índice guardado en el directorio `path` (se crea al compactar)."""
+        self.path = path
+        self.lookups = 0
+        self.scans = 0
+        # Prefijo -> nombre -> ruta -> tipo; cada parte se lee del disco en su primer acceso.
+        self._shards: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self._dirty_shards: Set[str] = set()
+
+    def _shard(self, prefix: str) -> Dict[str, Dict[str, str]]:
+        """Parte del índice de un prefijo, leída del disco en el primer acceso."""
+        shard = self._shards.get(prefix)
+        if shard is None:
+            try:
+                with open(os.path.join(self.path, f"{prefix}.json"), 'r', encoding='utf-8') as f:
+                    shard = json.load(f)
+            except FileNotFoundError:
+                shard = {}
+            self._shards[prefix] = shard
+        return shard
+
+    def add(self, name: str, path: str, node_type: str):
+        """Registra un nodo (añadir dos veces la misma ruta no tiene efecto)."""
+        prefix = _prefix(name)
+        paths = self._shard(prefix).setdefault(name, {})
+        if paths.get(path) != node_type:
+            paths[path] = node_type
+            self._dirty_shards.add(prefix)
+
+    def lookup(self, name: str) -> Dict[str, str]:
+        """Rutas (con su tipo) de los nodos con exactamente ese nombre."""
+        self.lookups += 1
+        return self._shard(_prefix(name)).get(name, {})
+
+    def match(self, pattern: str) -> Iterator[Tuple[str, str]]:
+        """Recorre las rutas y tipos de los nodos cuyo nombre cumple un patrón de `fnmatch`."""
+        self.scans += 1
+        regex = re.compile(fnmatch.translate(pattern))
+        for i in range(SHARDS):
+            for name, paths in self._shard(f"{i:02x}").items():
+                if regex.match(name):
+                    yield from paths.items()
+
+    def take_dirty(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """Contenido de las partes modificadas desde la última llamada."""
+        shards = {prefix: self._shards[prefix] for prefix in self._dirty_shards}
+        self._dirty_shards = set()
+        return shards
+
+    def stats(self) -> Dict[str, int]:
+        """Partes cargadas, búsquedas exactas y búsquedas por patrón."""
+        return {
+            'loaded_shards': len(self._shards),
+            'lookups': self.lookups,
+            'scans': self.scans,
+        }
@@ -0,0 +1,214 @@
+"""
+Almacenamiento fragmentado (sharded) en disco para el Sistema de Archivos Simulado.
+
+Cada directorio y cada archivo se guarda como un registro JSON independiente identificado por
+su número de inodo, en `<directorio>/<ino % 256 en hexadecimal>/<ino>.json`:
+
+- Un directorio guarda solo la lista de sus hijos con su tamaño (el del archivo, o el total del
+  subárbol si es un directorio): `{"children": {nombre: [tipo, ino, tamaño]}}`.
+- Un archivo guarda su tamaño y los hashes de sus fragmentos: `{"size": n, "chunks": [...]}`;
+  los datos están en el almacén de fragmentos (ver chunkstore.py). Los registros de versiones
+  anteriores, con el texto (`{"content": "..."}`) o con bloques propios (`{"blocks": [...]}`),
+  se pasan a fragmentos al cargarlos.
+
+El índice (el archivo de persistencia del FS) solo contiene el inodo raíz y el siguiente número
+de inodo libre, así que el arranque lee el índice y el registro de la raíz; el resto del árbol
+se carga cuando se accede a él. Al compactar solo se escriben los registros de los nodos
+modificados, cada uno de forma atómica (archivo temporal y `os.replace`).
+
+Con un presupuesto de memoria, los directorios cargados forman una lista LRU y, cuando el número
+de inodos en memoria lo supera, se descargan los hijos de los directorios menos usados que no
+tengan cambios pendientes ni contengan el directorio de trabajo.
+"""
+
+import json
+import os
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+# Número de subdirectorios entre los que se reparten los registros.
+SHARDS = 256
+
+def atomic_write_bytes(path: str, data: bytes):
+    """Escribe `data` en un archivo temporal, lo fuerza a disco y lo renombra sobre `path`."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def atomic_write_json(path: str, data: Any):
+    """Escribe de forma atómica un JSON compacto."""
+    atomic_write_bytes(path, json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+def write_shard(path: str, prefix: str, data: Dict[str, Any]):
+    """Escribe de forma atómica la parte `<path>/<prefix>.json` de un índice repartido por prefijo de hash."""
+    os.makedirs(path, exist_ok=True)
+    atomic_write_json(os.path.join(path, f"{prefix}.json"), data)
+
+class ShardedStore:
+    """
+    Registros de inodos en disco con carga bajo demanda y desalojo por presupuesto.
+
+    Atributos:
+        path (str): Directorio donde se guardan los registros.
+        budget (Optional[int]): Máximo de inodos en memoria (None = sin límite).
+        next_ino (int): Siguiente número de inodo libre.
+        loaded_nodes (int): Inodos actualmente en memoria.
+        dirty (Set[Inode]): Nodos modificados desde la última compactación.
+        chunk_store (Optional[ChunkStore]): Fragmentos con el contenido de los archivos.
+        loads, evictions (int): Registros de directorio leídos y directorios descargados.
+        pinned (Callable): Retorna los nodos que no deben descargarse (con sus ancestros).
+        on_evict (Optional[Callable]): Se llama tras descargar directorios.
+    """
+    def __init__(self, path: str, budget: Optional[int] = None):
+        """Inicializa el almacén sobre el directorio `path` (se crea al escribir el primer registro)."""
+        self.path = path
+        self.budget = budget
+        self.chunk_store = None
+        self.next_ino = 0
+        self.loaded_nodes = 0
+        self.dirty: Set[Any] = set()
+        self.loads = 0
+        self.evictions = 0
+        self.pinned: Callable[[], Iterable[Any]] = lambda: ()
+        self.on_evict: Optional[Callable[[], None]] = None
+        # Directorios con hijos cargados, del menos al más recientemente usado (ino -> inodo).
+        self._lru: 'OrderedDict[int, Any]' = OrderedDict()
+
+    def allocate(self) -> int:
+        """Reserva un número de inodo nuevo."""
+        ino = self.next_ino
+        self.next_ino += 1
+        return ino
+
+    def _record_path(self, ino: int) -> str:
+        """Ruta del registro de un inodo."""
+        return os.path.join(self.path, f"{ino % SHARDS:02x}", f"{ino}.json")
+
+    def read(self, ino: int) -> Optional[Dict[str, Any]]:
+        """Lee el registro de un inodo, o None si no existe."""
+        try:
+            with open(self._record_path(ino), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def write(self, ino: int, data: Dict[str, Any]):
+        """Escribe de forma atómica el registro de un inodo."""
+        path = self._record_path(ino)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write_json(path, data)
+
+    def load_children(self, node):
+        """Carga los hijos de un directorio desde su registro; los subdirectorios y contenidos quedan sin cargar."""
+        record = self.read(node.ino) or {'children': {}}
+        cls = type(node)
+        children = {}
+        for name, (node_type, ino, *size) in record['children'].items():
+            child = cls(name, node_type, node, ino=ino, store=self, loaded=False)
+            # Los registros anteriores no guardaban el tamaño; el FS lo recalcula al migrarlos.
+            child.size = size[0] if size else 0
+            children[name] = child
+        node._children = children
+        self.loads += 1
+        self.register(node)
+        self.loaded_nodes += len(children)
+        self.maybe_evict(keep=(node,))
+
+    def load_file(self, node):
+        """Carga el tamaño y los fragmentos de un archivo desde su registro."""
+        record = self.read(node.ino) or {}
+        chunk_store = self.chunk_store
+        if 'chunks' in record:
+            node.chunks = [chunk_store.get(digest) for digest in record['chunks']]
+            node.size = record['size']
+            return
+        # Registro de una versión anterior: se pasa a fragmentos y se reescribirá al compactar.
+        if 'content' in record:
+            data = record['content'].encode('utf-8')
+        elif 'blocks' in record:
+            data = chunk_store.device.read(array('I', record['blocks']), record['size'])
+            chunk_store.defer_free(record['blocks'])
+        else:
+            data = b''
+        node.chunks, node.size = chunk_store.replace([], data)
+        if record:
+            self.dirty.add(node)
+
+    def register(self, directory):
+        """Añade un directorio con hijos cargados a la lista LRU."""
+        if self.budget is not None:
+            self._lru[directory.ino] = directory
+
+    def touch(self, directory):
+        """Marca un directorio como recién usado."""
+        if self.budget is not None and directory.ino in self._lru:
+            self._lru.move_to_end(directory.ino)
+
+    def added(self, node):
+        """Contabiliza un nodo recién creado en memoria."""
+        self.loaded_nodes += 1
+        if node._children is not None:
+            self.register(node)
+
+    def take_dirty(self) -> Dict[str, Dict[str, Any]]:
+        """Registros de los nodos modificados (número de inodo -> registro); vacía el conjunto `dirty`."""
+        records = {}
+        for node in self.dirty:
+            if node._children is not None:
+                records[str(node.ino)] = {'children': {name: [child.type, child.ino, child.size]
+                                                       for name, child in node._children.items()}}
+            else:
+                records[str(node.ino)] = {'size': node.size, 'chunks': [chunk.digest for chunk in node.chunks]}
+        self.dirty.clear()
+        return records
+
+    def maybe_evict(self, keep: Iterable[Any] = ()):
+        """
+        Descarga directorios LRU hasta bajar a 3/4 del presupuesto si se ha superado.
+
+        Como la dentry cache de Linux, solo se descargan hojas de lo cargado: directorios sin
+        subdirectorios cargados, de modo que comprobar uno cuesta lo que sus hijos y un árbol
+        profundo se va podando de abajo arriba. No se descarga la raíz, ningún ancestro de
+        `keep` ni de los nodos de `pinned()`, ni un directorio con hijos modificados (sus
+        cambios solo están en el diario hasta compactar). Bajar por debajo del presupuesto
+        evita repetir el recorrido de la LRU en cada carga.
+        """
+        if self.budget is None or self.loaded_nodes <= self.budget:
+            return
+        protected = set()
+        for node in list(keep) + list(self.pinned()):
+            while node is not None and id(node) not in protected:
+                protected.add(id(node))
+                node = node.parent
+        target = self.budget - self.budget // 4
+        evicted = False
+        for ino, directory in list(self._lru.items()):
+            if self.loaded_nodes <= target:
+                break
+            if directory.parent is None or id(directory) in protected or directory in self.dirty:
+                continue
+            children = directory._children
+            if any(child._children is not None or child in self.dirty for child in children.values()):
+                continue
+            del self._lru[ino]
+            directory._children = None
+            self.loaded_nodes -= len(children)
+            self.evictions += 1
+            evicted = True
+        if evicted and self.on_evict is not None:
+            self.on_evict()
+
+    def stats(self) -> Dict[str, Any]:
+        """Inodos en memoria, presupuesto, lecturas, desalojos y nodos pendientes de escribir."""
+        return {
+            'loaded_nodes': self.loaded_nodes,
+            'budget': self.budget if self.budget is not None else '-',
+            'loaded_dirs': len(self._lru) if self.budget is not None else '-',
+            'loads': self.loads,
+            'evictions': self.evictions,
+            'dirty': len(self.dirty),
+        }
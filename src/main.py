@@ -2,33 +2,118 @@
 Entrada principal para el Simulador de Sistema Operativo.
 
 Este script inicializa todos los componentes clave del sistema operativo simulado:
-- Gestor de Memoria (MemoryManager)
-- Planificador de Procesos (Scheduler)
+- Gestor de Memoria (MemoryManager contiguo, o los asignadores buddy/slab de allocators.py)
+- Planificador de Procesos (Scheduler), con un disco simulado para la E/S de los procesos
 - Sistema de Archivos (FileSystem)
 
-Y luego lanza el shell interactivo para que el usuario pueda interactuar con el sistema.
+Y luego lanza el shell interactivo para que el usuario pueda interactuar con el sistema, o
+ejecuta un script de comandos sin interacción (`--script`).
 """
 
+import argparse
+import sys
+
 # Importación de los componentes principales del sistema operativo simulado.
-from memory import MemoryManager
+from allocators import create_memory_manager, MEMORY_MODES
 from scheduler import Scheduler
-from shell import run_shell
+from multicore import MultiCoreScheduler
+from shell import run_shell, run_script, OUTPUT_MODES
 from filesystem import FileSystem
+from policies import POLICIES
+from freelist import STRATEGIES
+from paging import PAGE_POLICIES
+from bufcache import CACHE_POLICIES
+from synchronization import VICTIM_POLICIES
+from disk import Disk, DISK_POLICIES
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Lee las opciones de configuración del simulador desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Simulador de Sistema Operativo (Terminal-OPPS)")
+    parser.add_argument('--quantum', type=int, default=2, help="Quantum del planificador (por defecto 2)")
+    parser.add_argument('--cores', type=int, default=1,
+                        help="Núcleos simulados; con más de 1 se usa el planificador multinúcleo (por defecto 1)")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='rr', help="Política de planificación (por defecto rr)")
+    parser.add_argument('--mem-mode', choices=MEMORY_MODES, default='contiguous',
+                        help="Asignador de memoria: contiguo, buddy, slab o paginado (por defecto contiguous)")
+    parser.add_argument('--mem-strategy', choices=STRATEGIES, default='first',
+                        help="Estrategia de asignación de memoria contigua (por defecto first)")
+    parser.add_argument('--compact-units', type=int, default=0,
+                        help="Unidades de memoria compactadas entre quantums (por defecto 0, desactivado)")
+    parser.add_argument('--auto-compact', type=int, default=0,
+                        help="Unidades que alloc puede compactar si falla por fragmentación (por defecto 0)")
+    parser.add_argument('--page-size', type=int, default=4, help="Tamaño de página en modo paged (por defecto 4)")
+    parser.add_argument('--tlb-entries', type=int, default=8, help="Entradas de la TLB en modo paged (por defecto 8)")
+    parser.add_argument('--page-policy', choices=PAGE_POLICIES, default='lru',
+                        help="Reemplazo de páginas en modo paged (por defecto lru)")
+    parser.add_argument('--victim-policy', choices=VICTIM_POLICIES, default='requester',
+                        help="Víctima sugerida al detectar un deadlock (por defecto requester)")
+    parser.add_argument('--disk-policy', choices=DISK_POLICIES, default='fcfs',
+                        help="Planificación de las peticiones al disco (por defecto fcfs)")
+    parser.add_argument('--disk-cylinders', type=int, default=200,
+                        help="Cilindros del disco simulado (por defecto 200)")
+    parser.add_argument('--script', metavar='ARCHIVO',
+                        help="Ejecuta los comandos de un archivo ('-' para la entrada estándar) en lugar del shell interactivo")
+    parser.add_argument('--output', choices=OUTPUT_MODES, default='rich',
+                        help="Salida del modo --script: rich, texto plano o solo errores (por defecto rich)")
+    parser.add_argument('--stop-on-error', action='store_true',
+                        help="En modo --script, se detiene en el primer comando que falla")
+    parser.add_argument('--fs-budget', type=int, default=None,
+                        help="Máximo de inodos del sistema de archivos en memoria (por defecto, sin límite)")
+    parser.add_argument('--fs-cache-blocks', type=int, default=256,
+                        help="Bloques en la caché de buffers del sistema de archivos (por defecto 256)")
+    parser.add_argument('--fs-cache-policy', choices=CACHE_POLICIES, default='lru',
+                        help="Reemplazo de la caché de buffers (por defecto lru)")
+    parser.add_argument('--read-ahead', type=int, default=8,
+                        help="Bloques de lectura anticipada en accesos secuenciales (0 la desactiva; por defecto 8)")
+    args = parser.parse_args(argv)
+    if args.quantum < 1:
+        parser.error("--quantum debe ser al menos 1")
+    return args
+
+def main(argv=None):
+    """
+    Función principal que configura e inicia el simulador.
+
+    Retorna:
+        El código de salida: 2 si la configuración no es válida, 1 si un script se detuvo por un
+        error (`--stop-on-error`), 0 si no.
+    """
+    args = parse_args(argv)
 
-def main():
-    """Función principal que configura e inicia el simulador."""
     # Inicializa el gestor de memoria con un tamaño total de 100 unidades.
-    mm = MemoryManager(total_size=100)
+    try:
+        mm = create_memory_manager(args.mem_mode, total_size=100, strategy=args.mem_strategy,
+                                   page_size=args.page_size, tlb_entries=args.tlb_entries,
+                                   page_policy=args.page_policy, auto_compact=args.auto_compact)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
     
-    # Inicializa el planificador Round-Robin con un quantum de 2 unidades de tiempo.
-    sched = Scheduler(quantum=2)
+    # Inicializa el planificador (Round-Robin por defecto, uno o varios núcleos) con el quantum indicado (2 por defecto).
+    if args.cores > 1:
+        sched = MultiCoreScheduler(cores=args.cores, quantum=args.quantum, policy=args.policy)
+    else:
+        sched = Scheduler(quantum=args.quantum, policy=args.policy)
+    sched.attach_memory(mm, compact_units=args.compact_units)
+    sched.lock_manager.set_victim_policy(args.victim_policy)
+    sched.attach_disk(Disk(cylinders=args.disk_cylinders, policy=args.disk_policy))
     
     # Inicializa el sistema de archivos. Cargará el estado desde 'fs_state.json' si existe.
-    fs = FileSystem()
+    fs = FileSystem(memory_budget=args.fs_budget, cache_blocks=args.fs_cache_blocks,
+                    cache_policy=args.fs_cache_policy, read_ahead=args.read_ahead)
     
-    # Lanza el shell interactivo, pasando los componentes del SO para su manipulación.
+    # Ejecuta el script, si se indicó; si no, lanza el shell interactivo, pasando los componentes
+    # del SO para su manipulación.
+    if args.script is not None:
+        if args.script == '-':
+            summary = run_script(sched, mm, fs, sys.stdin, output=args.output, stop_on_error=args.stop_on_error)
+        else:
+            with open(args.script, 'r', encoding='utf-8') as f:
+                summary = run_script(sched, mm, fs, f, output=args.output, stop_on_error=args.stop_on_error)
+        return 1 if summary['stopped_at'] is not None else 0
     run_shell(sched, mm, fs)
+    return 0
 
 # Punto de entrada estándar de Python: asegura que main() se ejecute solo cuando el script es ejecutado directamente.
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -1,11 +1,15 @@
 """
 Gestor de Memoria (MemoryManager) para el sistema operativo simulado.
 
-Implementa una estrategia de asignación de memoria contigua simple utilizando el algoritmo First-Fit.
-También proporciona funcionalidades para liberar memoria, mostrar el mapa de memoria y defragmentar.
+Implementa una estrategia de asignación de memoria contigua utilizando el algoritmo First-Fit
+(o, de forma configurable, Best-Fit, Worst-Fit o Next-Fit).
+También proporciona funcionalidades para liberar memoria, mostrar el mapa de memoria y defragmentar,
+ya sea de una vez (`defrag`) o de forma incremental con un coste acotado por paso (`compact_step`).
 """
 
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Iterable
+from freelist import FreeBlockIndex, FIRST_FIT, NEXT_FIT, STRATEGIES
+from telemetry import AllocatorStats, now_ns
 
 # Se utiliza una referencia hacia adelante (forward reference) para el type hint de 'SimProcess'.
 # Esto evita un problema de dependencia circular, ya que scheduler.py importa tanto memory.py como process.py.
@@ -19,54 +23,108 @@ class MemoryManager:
     
     Atributos:
         total (int): El tamaño total de la memoria simulada.
-        free (List[Tuple[int, int]]): Una lista de tuplas que representan los bloques de memoria libre.
-                                     Cada tupla contiene (dirección_inicio, tamaño).
+        strategy (str): Estrategia de asignación: 'first', 'best', 'worst' o 'next'.
+        _free (FreeBlockIndex): Los bloques de memoria libre, indexados por dirección y por tamaño.
         allocations (dict): Un diccionario que mapea PIDs de procesos a sus bloques de memoria asignados.
                             El formato es {pid: (dirección_inicio, tamaño)}.
+        _owner (Dict[int, str]): Dirección de inicio -> PID de cada bloque asignado no vacío.
+        auto_compact (int): Si es > 0, unidades máximas que `alloc` puede mover compactando cuando
+                            una petición falla solo por fragmentación.
+        _processes: Tabla de procesos usada para actualizar `addr` en los PCBs al reubicar bloques.
+        stats (AllocatorStats): Contadores de telemetría, actualizados en cada operación.
     """
-    def __init__(self, total_size: int):
-        """Inicializa el MemoryManager con un tamaño de memoria total."""
+    def __init__(self, total_size: int, strategy: str = FIRST_FIT, auto_compact: int = 0):
+        """Inicializa el MemoryManager con un tamaño de memoria total y una estrategia de asignación."""
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estrategia desconocida '{strategy}'. Opciones: {', '.join(STRATEGIES)}")
         self.total = total_size
+        self.strategy = strategy
         # La memoria comienza como un único gran bloque libre.
-        self.free: List[Tuple[int, int]] = [(0, total_size)]
+        self._free = FreeBlockIndex()
+        self._free.add(0, total_size)
+        # Posición donde continúa la búsqueda Next-Fit.
+        self._rover = 0
         self.allocations = {}
+        self._owner: Dict[int, str] = {}
+        self.auto_compact = auto_compact
+        self._processes = None
+        self.stats = AllocatorStats(total_size, total_size)
+
+    def bind_processes(self, processes):
+        """Registra la tabla de procesos cuyos PCBs se actualizan al reubicar bloques."""
+        self._processes = processes
+
+    @property
+    def free(self) -> List[Tuple[int, int]]:
+        """Lista de bloques libres (dirección_inicio, tamaño), ordenada por dirección."""
+        return list(self._free)
 
     def alloc(self, pid: str, size: int) -> Optional[int]:
         """
-        Intenta asignar un bloque de memoria de un tamaño (`size`) dado a un proceso (`pid`) usando First-Fit.
+        Intenta asignar un bloque de memoria de un tamaño (`size`) dado a un proceso (`pid`) usando
+        la estrategia configurada (First-Fit por defecto).
         
-        First-Fit: Recorre la lista de bloques libres y elige el primero que sea lo suficientemente grande.
+        First-Fit: Elige el bloque libre de menor dirección que sea lo suficientemente grande. El
+        índice de bloques libres lo encuentra en O(log n) sin recorrer la lista.
+        
+        Si el proceso ya tenía un bloque, este se libera una vez ocupado el nuevo; si la
+        asignación falla, el proceso conserva el anterior.
         
         Retorna:
             La dirección de inicio del bloque asignado, o None si no se encontró espacio.
         """
+        start = now_ns()
+        addr = self._alloc(pid, size)
+        self.stats.record_alloc(size, addr is not None)
+        self.stats.set_free(self._free.total, self._free.largest())
+        self.stats.record('alloc', start)
+        return addr
+
+    def _alloc(self, pid: str, size: int) -> Optional[int]:
+        """Asignación propiamente dicha (sin telemetría)."""
         if size <= 0:
             # Un proceso que no requiere memoria se le asigna una dirección simbólica 0 y tamaño 0.
+            self._release_previous(pid)
             self.allocations[pid] = (0, 0)
             return 0
 
-        # Recorrer la lista de bloques libres para encontrar el primero que se ajuste.
-        for i, (start, sz) in enumerate(self.free):
-            if sz >= size:
-                addr = start
-                self.allocations[pid] = (addr, size)
-                
-                # Si el bloque se ajusta exactamente, se elimina de la lista de libres.
-                if sz == size:
-                    self.free.pop(i)
-                # Si el bloque es más grande, se reduce su tamaño.
-                else:
-                    self.free[i] = (start + size, sz - size)
-                return addr
+        # Buscar en el índice el bloque libre que corresponde a la estrategia.
+        addr = self._free.find(size, self.strategy, self._rover)
+        # Si falla solo por fragmentación (hay espacio libre total suficiente), compactar
+        # de forma incremental hasta que aparezca un hueco suficiente o se agote el presupuesto.
+        if addr is None and self.auto_compact > 0 and self._free.total >= size:
+            budget = self.auto_compact
+            while addr is None and budget > 0:
+                report = self.compact_step(max_units=budget, max_blocks=None, target=size)
+                if not report['moved_blocks']:
+                    break
+                budget -= report['moved_units']
+                addr = self._free.find(size, self.strategy, self._rover)
         # Si no se encuentra un bloque adecuado, se retorna None.
-        return None
+        if addr is None:
+            return None
+        # Se ocupa el comienzo del bloque; el resto (si sobra) sigue libre.
+        self._free.take(addr, size)
+        self._release_previous(pid)
+        self.allocations[pid] = (addr, size)
+        self._owner[addr] = pid
+        if self.strategy == NEXT_FIT:
+            self._rover = addr + size
+        return addr
+
+    def _release_previous(self, pid: str):
+        """Devuelve al índice de libres el bloque que tenía el proceso antes de reasignarlo."""
+        previous = self.allocations.get(pid)
+        if previous is not None and previous[1] > 0 and self._owner.get(previous[0]) == pid:
+            del self._owner[previous[0]]
+            self._free.add(*previous)
 
     def free_mem(self, pid: str) -> bool:
         """
         Libera la memoria asignada a un proceso (`pid`).
         
-        El bloque liberado se añade de nuevo a la lista de bloques libres y se intenta fusionar
-        con bloques libres adyacentes para reducir la fragmentación externa.
+        El bloque liberado se añade de nuevo al índice de bloques libres y se fusiona con los
+        bloques libres adyacentes (solo sus vecinos inmediatos) para reducir la fragmentación externa.
         
         Retorna:
             True si la memoria fue liberada exitosamente, False en caso contrario.
@@ -74,27 +132,21 @@ class MemoryManager:
         if pid not in self.allocations:
             return False
         
+        start = now_ns()
         addr, size = self.allocations.pop(pid)
-        
-        # Añadir el bloque liberado a la lista de libres y ordenarla por dirección.
-        self.free.append((addr, size))
-        self.free.sort(key=lambda x: x[0])
-        
-        # Fusionar bloques libres adyacentes.
-        merged = []
-        for s, sz in self.free:
-            if not merged:
-                merged.append([s, sz])
-            else:
-                last_s, last_sz = merged[-1]
-                # Si el bloque actual comienza donde terminó el anterior, se fusionan.
-                if last_s + last_sz == s:
-                    merged[-1][1] = last_sz + sz
-                else:
-                    merged.append([s, sz])
-        self.free = [(s, sz) for s, sz in merged]
+        if size > 0:
+            if self._owner.get(addr) == pid:
+                del self._owner[addr]
+            self._free.add(addr, size)
+        self.stats.frees += 1
+        self.stats.set_free(self._free.total, self._free.largest())
+        self.stats.record('free', start)
         return True
 
+    def telemetry(self) -> dict:
+        """Contadores de telemetría del asignador como diccionario (lectura O(1), ver AllocatorStats)."""
+        return self.stats.as_dict()
+
     def mem_map(self):
         """
         Retorna una representación del estado actual de la memoria.
@@ -105,38 +157,126 @@ class MemoryManager:
             occupied.append((pid, addr, size))
         return {
             'total': self.total,
-            'free': list(self.free),
+            'free': self.free,
             'allocations': occupied
         }
 
-    def defrag(self, processes: List['SimProcess']):
+    def fragmentation(self) -> dict:
+        """
+        Fragmentación de la memoria contigua.
+        
+        - internal: siempre 0, porque cada proceso recibe exactamente lo que pide.
+        - external: 1 - (mayor bloque libre / espacio libre total).
+        """
+        free, largest = self._free.total, self._free.largest()
+        return {
+            'internal': 0.0,
+            'external': 1 - largest / free if free else 0.0,
+            'free': free,
+            'largest_free': largest,
+        }
+
+    def defrag(self, processes: Iterable['SimProcess']):
         """
         Compacta la memoria moviendo todos los bloques asignados al principio.
         
         Esto elimina la fragmentación externa, consolidando todo el espacio libre en un
         único bloque contiguo al final de la memoria.
         Requiere actualizar las direcciones de memoria en los PCBs (SimProcess) correspondientes.
+        `processes` puede ser la tabla de procesos del planificador (búsqueda O(1) por PID)
+        o cualquier iterable de PCBs, en cuyo caso se indexa una sola vez.
         """
+        start = now_ns()
+        by_pid = processes if hasattr(processes, 'get') else {p.pid: p for p in processes}
+
         # Ordenar los bloques asignados por su dirección de memoria actual.
         sorted_allocations = sorted(self.allocations.items(), key=lambda item: item[1][0])
         
         new_allocations = {}
+        self._owner.clear()
         current_address = 0
         
         # Reubicar cada bloque uno después del otro.
         for pid, (old_addr, size) in sorted_allocations:
             # Actualizar la dirección en el PCB del proceso.
-            for p in processes:
-                if p.pid == pid:
-                    p.addr = current_address
-                    break
+            p = by_pid.get(pid)
+            if p is not None:
+                p.addr = current_address
             
             # Actualizar el mapa de asignaciones con la nueva dirección.
+            if old_addr != current_address:
+                self.stats.moved_units += size
             new_allocations[pid] = (current_address, size)
+            if size > 0:
+                self._owner[current_address] = pid
             
             current_address += size
             
         self.allocations = new_allocations
         
         # Crear un único bloque libre con todo el espacio restante.
-        self.free = [(current_address, self.total - current_address)]
+        self._free.clear()
+        self._free.add(current_address, self.total - current_address)
+        self._rover = 0
+        self.stats.set_free(self._free.total, self._free.largest())
+        self.stats.record('defrag', start)
+
+    def compact_step(self, processes: Optional[Iterable['SimProcess']] = None, max_units: Optional[int] = None,
+                     max_blocks: Optional[int] = 1, target: Optional[int] = None) -> dict:
+        """
+        Compacta la memoria de forma incremental, con un coste acotado.
+        
+        Cada movimiento desliza un bloque asignado hacia la izquierda, sobre el hueco que lo
+        precede, de modo que ese hueco se une al que le sigue. Entre los movimientos que caben en
+        el presupuesto se elige siempre el que produce el hueco contiguo más grande (a igualdad,
+        el que mueve menos datos). Se detiene al agotar `max_units` unidades movidas o
+        `max_blocks` bloques (None = sin límite en ese criterio), cuando no queda nada que mover
+        o, si se indica `target`, en cuanto existe un hueco de ese tamaño.
+        
+        Retorna:
+            Un diccionario con las unidades y bloques movidos y el mayor hueco resultante.
+        """
+        start = now_ns()
+        if processes is not None:
+            by_pid = processes if hasattr(processes, 'get') else {p.pid: p for p in processes}
+        else:
+            by_pid = self._processes
+        moved_units = moved_blocks = 0
+        while (max_blocks is None or moved_blocks < max_blocks) and \
+                (target is None or self._free.largest() < target):
+            budget = None if max_units is None else max_units - moved_units
+            best = None
+            # Candidatos: cada hueco seguido de un bloque asignado.
+            for hole, hole_size in self._free:
+                pid = self._owner.get(hole + hole_size)
+                if pid is None:
+                    continue
+                size = self.allocations[pid][1]
+                if budget is not None and size > budget:
+                    continue
+                gain = hole_size + (self._free.size_at(hole + hole_size + size) or 0)
+                if best is None or gain > best[0] or (gain == best[0] and size < best[1]):
+                    best = (gain, size, hole, hole_size, pid)
+            if best is None:
+                break
+            _, size, hole, hole_size, pid = best
+            old_addr = hole + hole_size
+            # Mover el bloque al inicio del hueco; el hueco queda detrás y se fusiona con el siguiente.
+            self._free.take(hole, hole_size)
+            del self._owner[old_addr]
+            self.allocations[pid] = (hole, size)
+            self._owner[hole] = pid
+            self._free.add(hole + size, hole_size)
+            p = by_pid.get(pid) if by_pid is not None else None
+            if p is not None:
+                p.addr = hole
+            moved_units += size
+            moved_blocks += 1
+        self.stats.moved_units += moved_units
+        self.stats.set_free(self._free.total, self._free.largest())
+        self.stats.record('compact', start)
+        return {
+            'moved_units': moved_units,
+            'moved_blocks': moved_blocks,
+            'largest_free': self._free.largest(),
+        }
@@ -0,0 +1,297 @@
+"""
+Planificador multinúcleo para el Sistema Operativo Simulado.
+
+`MultiCoreScheduler` extiende el `Scheduler` de una sola CPU a N núcleos simulados:
+
+- Cada núcleo tiene su propia cola de listos (una instancia de la política por núcleo).
+- Un proceso se encola en el núcleo de su afinidad, si la tiene; si no, en el último núcleo
+  donde ejecutó (caché caliente) o, la primera vez, en el núcleo menos cargado.
+- Un núcleo sin trabajo roba (work stealing) el siguiente proceso del núcleo con la cola más
+  larga, salvo que ese proceso esté fijado a su núcleo por afinidad.
+- Cada núcleo registra su propio `Timeline` y sus métricas: utilización, despachos,
+  migraciones recibidas, robos y procesos completados.
+
+La simulación avanza unidad a unidad con todos los núcleos en paso (lock-step), reutilizando
+del planificador base los eventos temporizados, los cerrojos y los programas de los procesos.
+Con un solo núcleo produce el mismo timeline que `Scheduler.run`.
+"""
+
+import copy
+import time
+from typing import Dict, List, Optional, Union
+from process import SimProcess
+from policies import SchedulingPolicy, make_policy
+from scheduler import Scheduler
+from timeline import Timeline
+
+class _Core:
+    """
+    Estado de un núcleo simulado.
+
+    Atributos:
+        index (int): Número del núcleo.
+        policy (SchedulingPolicy): Cola de listos propia del núcleo.
+        timeline (Timeline): Tramos ejecutados en este núcleo.
+        current (Optional[SimProcess]): Proceso en ejecución, o None si está ocioso.
+        used (int): Unidades consumidas por `current` en la porción actual.
+        limit (Optional[int]): Porción de tiempo concedida a `current` (None = sin límite).
+        busy, dispatches, migrations, steals, completed (int): Métricas acumuladas.
+    """
+    __slots__ = ('index', 'policy', 'timeline', 'current', 'used', 'limit',
+                 'busy', 'dispatches', 'migrations', 'steals', 'completed')
+
+    def __init__(self, index: int, policy: SchedulingPolicy):
+        """Inicializa un núcleo ocioso con su propia política."""
+        self.index = index
+        self.policy = policy
+        self.timeline = Timeline()
+        self.current: Optional[SimProcess] = None
+        self.used = 0
+        self.limit: Optional[int] = None
+        self.busy = 0
+        self.dispatches = 0
+        self.migrations = 0
+        self.steals = 0
+        self.completed = 0
+
+    def load(self) -> int:
+        """Carga del núcleo: entradas en su cola más el proceso en ejecución."""
+        return len(self.policy) + (self.current is not None)
+
+class MultiCoreScheduler(Scheduler):
+    """
+    Planificador de N núcleos con colas por núcleo, afinidad y robo de trabajo.
+
+    Atributos:
+        cores (List[_Core]): Los núcleos simulados.
+        steal (bool): Si los núcleos ociosos roban trabajo de otros núcleos.
+        timelines (List[Timeline]): Timeline de cada núcleo (`timeline` es el del núcleo 0).
+        _queue_core (Dict[str, int]): PID -> núcleo en cuya cola está encolado.
+    """
+    def __init__(self, cores: int = 2, quantum: int = 2, policy: Union[str, SchedulingPolicy] = 'rr',
+                 steal: bool = True, **policy_options):
+        """Inicializa `cores` núcleos, cada uno con su instancia de la política."""
+        if cores < 1:
+            raise ValueError("El número de núcleos debe ser al menos 1")
+        super().__init__(quantum, policy, **policy_options)
+        self.steal = steal
+        self._queue_core: Dict[str, int] = {}
+        self.cores: List[_Core] = []
+        self._build_cores(cores, policy, policy_options)
+
+    def _build_cores(self, count: int, policy: Union[str, SchedulingPolicy], policy_options: dict):
+        """Crea los núcleos; una política dada como instancia se copia para cada núcleo."""
+        self.cores = [_Core(i, make_policy(policy, self.quantum, **policy_options) if isinstance(policy, str)
+                            else copy.deepcopy(policy)) for i in range(count)]
+        self.policy = self.cores[0].policy
+        self.timelines = [core.timeline for core in self.cores]
+        self.timeline = self.timelines[0]
+
+    def set_policy(self, policy: Union[str, SchedulingPolicy], /, **policy_options):
+        """Cambia la política de todos los núcleos, reencolando los procesos READY."""
+        # Las métricas se conservan; solo se sustituyen las colas.
+        for core in self.cores:
+            core.policy = make_policy(policy, self.quantum, **policy_options) if isinstance(policy, str) \
+                else copy.deepcopy(policy)
+        self.policy = self.cores[0].policy
+        self._queued.clear()
+        self._queue_core.clear()
+        for p in self.processes.in_state('READY'):
+            self._enqueue(p)
+
+    def set_affinity(self, pid: str, core: Optional[int]) -> bool:
+        """Fija un proceso a un núcleo (o quita la afinidad con None). Se aplica en su próximo encolado."""
+        p = self.processes.get(pid)
+        if p is None or (core is not None and not 0 <= core < len(self.cores)):
+            return False
+        p.affinity = core
+        return True
+
+    def _route(self, process: SimProcess) -> int:
+        """Núcleo en cuya cola se encola un proceso: afinidad, último núcleo o el menos cargado."""
+        if process.affinity is not None:
+            return process.affinity
+        if process.core is not None:
+            return process.core
+        return min(self.cores, key=_Core.load).index
+
+    def _enqueue(self, process: SimProcess):
+        """Pone un proceso READY en la cola de su núcleo (una sola entrada por proceso)."""
+        if process.pid not in self._queued:
+            core = self._route(process)
+            self._queued.add(process.pid)
+            self._queue_core[process.pid] = core
+            self.cores[core].policy.add(process, self._time)
+
+    def _pop(self, core: _Core) -> Optional[SimProcess]:
+        """Extrae el siguiente proceso READY de la cola de un núcleo, descartando entradas obsoletas."""
+        while True:
+            process = core.policy.pop(self._time)
+            if process is None:
+                return None
+            self._queued.discard(process.pid)
+            self._queue_core.pop(process.pid, None)
+            if process.state == 'READY' and self.processes.get(process.pid) is process:
+                return process
+
+    def _steal(self, thief: _Core) -> Optional[SimProcess]:
+        """Roba el siguiente proceso del núcleo con la cola más larga, si no está fijado a él."""
+        victim = max((c for c in self.cores if c is not thief and len(c.policy)), key=lambda c: len(c.policy),
+                     default=None)
+        if victim is None:
+            return None
+        process = self._pop(victim)
+        if process is None:
+            return None
+        if process.affinity is not None and process.affinity != thief.index:
+            # Fijado a su núcleo: se devuelve a la cola de la que salió.
+            self._queued.add(process.pid)
+            self._queue_core[process.pid] = victim.index
+            victim.policy.add(process, self._time)
+            return None
+        thief.steals += 1
+        return process
+
+    def _dispatch(self, core: _Core, verbose: bool) -> bool:
+        """
+        Asigna al núcleo ocioso el siguiente proceso (propio o robado).
+
+        Un programa puede bloquearse o terminar antes de consumir CPU; en ese caso el despacho
+        cuenta igualmente, pero el núcleo queda libre para otro.
+
+        Retorna:
+            True si se despachó un proceso, False si no había ninguno disponible.
+        """
+        process = self._pop(core)
+        if process is None and self.steal and self._queued:
+            process = self._steal(core)
+        if process is None:
+            return False
+        if process.core is not None and process.core != core.index:
+            core.migrations += 1
+        process.core = core.index
+        process.state = 'RUNNING'
+        if process.start_time is None:
+            process.start_time = self._time
+        core.dispatches += 1
+        core.current, core.used, core.limit = process, 0, core.policy.time_slice(process)
+        if process.program is not None and not self._advance(process, verbose):
+            self._release_core(core, verbose)
+        return True
+
+    def _release_core(self, core: _Core, verbose: bool, preempted: bool = False):
+        """Saca de la CPU al proceso del núcleo según su estado (terminado, bloqueado o expulsado)."""
+        process = core.current
+        core.current = None
+        if process.state == 'BLOCKED':
+            if verbose:
+                print(f"[t={self._time}] CPU{core.index}: proceso {process.pid} se bloquea.")
+        elif process.state == 'FINISHED' and process.killed:
+            # Un proceso eliminado (p. ej. por falta de memoria) ya liberó sus recursos y no se
+            # cuenta como completado.
+            pass
+        elif process.state == 'FINISHED':
+            process.finish_time = self._time
+            core.completed += 1
+            if verbose:
+                print(f"[t={self._time}] CPU{core.index}: proceso {process.pid} ha terminado.")
+            self._release_locks(process.pid)
+        else:
+            exhausted = not preempted and core.limit is not None and core.used >= core.limit
+            core.policy.on_preempt(process, core.used, exhausted)
+            process.state = 'READY'
+            self._enqueue(process)
+        if self.compact_units and hasattr(self.memory, 'compact_step'):
+            self.compacted_units += self.memory.compact_step(max_units=self.compact_units,
+                                                             max_blocks=None)['moved_units']
+
+    def run(self, verbose: bool = True, sleep_per_unit: float = 0.0, until_done: bool = False, fast: bool = False):
+        """
+        Ejecuta un ciclo de planificación en todos los núcleos.
+
+        Un ciclo realiza, en total, tantos despachos como procesos READY había al empezar; los
+        núcleos terminan después sus porciones en curso. Con `until_done=True` se ejecuta hasta
+        que no quede ningún proceso listo, en ejecución ni por llegar. `fast` se acepta por
+        compatibilidad con `Scheduler.run`, pero la simulación multinúcleo es siempre unidad a
+        unidad.
+        """
+        self._process_events()
+        dispatches = None if until_done else self.processes.count('READY')
+
+        if not self.processes.count('READY') and not (until_done and self._events):
+            if verbose:
+                print("[scheduler] No hay procesos listos para ejecutar.")
+            return
+
+        while True:
+            # Despachar en los núcleos ociosos mientras queden despachos.
+            for core in self.cores:
+                while core.current is None and (dispatches is None or dispatches > 0) and self._dispatch(core, verbose):
+                    if dispatches is not None:
+                        dispatches -= 1
+            running = [core for core in self.cores if core.current is not None]
+            if not running:
+                # Todos los núcleos ociosos: saltar hasta el siguiente evento si se ejecuta hasta el final.
+                if until_done and self._events:
+                    self._time = max(self._time, self._events[0][0])
+                    self._process_events()
+                    continue
+                break
+
+            # Una unidad de tiempo en cada núcleo ocupado.
+            for core in running:
+                process = core.current
+                process.run_one_unit()
+                core.used += 1
+                core.busy += 1
+                core.timeline.add_slice(process.pid, self._time, 1)
+                if verbose:
+                    print(f"[t={self._time + 1}] CPU{core.index}: ejecutando {process.pid} (restan {process.cpu_units})")
+            self._time += 1
+            self._busy += len(running)
+            if self.disk.current is not None:
+                self._io_overlap += 1
+            if sleep_per_unit:
+                time.sleep(sleep_per_unit)
+            woken = self._process_events()
+
+            # Fin de porción: terminación, bloqueo, quantum agotado o expulsión por un proceso despertado.
+            for core in running:
+                process = core.current
+                if process.program is not None and process.state != 'FINISHED':
+                    self._advance(process, verbose)
+                arrived = [p for p in woken if self._queue_core.get(p.pid) == core.index]
+                if process.state != 'RUNNING':
+                    self._release_core(core, verbose)
+                elif arrived and core.policy.should_preempt(process, arrived):
+                    self._release_core(core, verbose, preempted=True)
+                elif core.limit is not None and core.used >= core.limit:
+                    self._release_core(core, verbose)
+
+        if verbose:
+            print("[scheduler] Ciclo de planificación completado.")
+
+    def core_stats(self) -> List[dict]:
+        """Métricas por núcleo: utilización, despachos, migraciones, robos, completados y throughput."""
+        t = self._time
+        return [
+            {
+                'core': core.index,
+                'busy': core.busy,
+                'utilization': core.busy / t if t else 0.0,
+                'dispatches': core.dispatches,
+                'migrations': core.migrations,
+                'steals': core.steals,
+                'completed': core.completed,
+                'throughput': core.completed / t if t else 0.0,
+            } for core in self.cores
+        ]
+
+    def stats(self) -> dict:
+        """Métricas globales del planificador base, con la utilización media por núcleo."""
+        result = super().stats()
+        result['cores'] = len(self.cores)
+        result['cpu_utilization'] = self._busy / (self._time * len(self.cores)) if self._time else 0.0
+        result['migrations'] = sum(core.migrations for core in self.cores)
+        result['steals'] = sum(core.steals for core in self.cores)
+        return result
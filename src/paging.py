@@ -0,0 +1,407 @@
+"""
+Memoria Virtual Paginada para el sistema operativo simulado.
+
+Modela la traducción de direcciones con paginación bajo demanda:
+
+- una tabla de páginas por proceso (página virtual -> marco físico);
+- un conjunto fijo de marcos físicos;
+- una TLB con un número configurable de entradas (reemplazo LRU);
+- reemplazo de páginas FIFO, LRU, Clock u Óptimo cuando no quedan marcos libres.
+
+`PagedMemoryManager` expone la misma interfaz que `MemoryManager` (alloc, free_mem, mem_map,
+defrag, fragmentation) para que el planificador y el shell puedan usarlo como modo de memoria.
+Además, ejecuta trazas de accesos a memoria y calcula la tasa de aciertos de la TLB, la tasa de
+fallos de página y el tiempo efectivo de acceso (EAT).
+"""
+
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from telemetry import AllocatorStats, now_ns
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from process import SimProcess
+
+# Una página se identifica por (pid, número de página virtual).
+Page = Tuple[str, int]
+
+class TLB:
+    """
+    Translation Lookaside Buffer: caché asociativa de traducciones (pid, vpn) -> marco.
+
+    Atributos:
+        capacity (int): Número de entradas.
+        _entries (OrderedDict): Entradas en orden de uso (la menos usada primero).
+    """
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._entries: 'OrderedDict[Page, int]' = OrderedDict()
+
+    def lookup(self, page: Page) -> Optional[int]:
+        """Retorna el marco de la página si está en la TLB (y la marca como usada)."""
+        frame = self._entries.get(page)
+        if frame is not None:
+            self._entries.move_to_end(page)
+        return frame
+
+    def insert(self, page: Page, frame: int):
+        """Añade una traducción, expulsando la entrada menos usada si la TLB está llena."""
+        if self.capacity <= 0:
+            return
+        self._entries[page] = frame
+        self._entries.move_to_end(page)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, page: Page):
+        """Elimina la traducción de una página (p. ej. al expulsarla de memoria)."""
+        self._entries.pop(page, None)
+
+class ReplacementPolicy:
+    """Interfaz de las políticas de reemplazo de páginas. Trabajan con números de marco."""
+    name = 'base'
+
+    def loaded(self, frame: int):
+        """Se cargó una página en `frame`."""
+
+    def accessed(self, frame: int):
+        """Se accedió a la página residente en `frame`."""
+
+    def released(self, frame: int):
+        """El marco quedó libre (el proceso liberó su memoria)."""
+
+    def victim(self, frames: List[Optional[Page]]) -> int:
+        """Elige el marco cuya página será expulsada."""
+        raise NotImplementedError
+
+class FIFOReplacement(ReplacementPolicy):
+    """Expulsa la página que lleva más tiempo cargada."""
+    name = 'fifo'
+
+    def __init__(self):
+        self._order: 'OrderedDict[int, None]' = OrderedDict()
+
+    def loaded(self, frame: int):
+        self._order[frame] = None
+
+    def released(self, frame: int):
+        self._order.pop(frame, None)
+
+    def victim(self, frames: List[Optional[Page]]) -> int:
+        frame, _ = self._order.popitem(last=False)
+        return frame
+
+class LRUReplacement(FIFOReplacement):
+    """Expulsa la página usada hace más tiempo (cada acceso la mueve al final)."""
+    name = 'lru'
+
+    def accessed(self, frame: int):
+        self._order.move_to_end(frame)
+
+class ClockReplacement(ReplacementPolicy):
+    """
+    Algoritmo del reloj (segunda oportunidad).
+
+    Cada marco tiene un bit de referencia; la manecilla avanza limpiando bits hasta encontrar
+    un marco con el bit a 0.
+    """
+    name = 'clock'
+
+    def __init__(self, num_frames: int):
+        self._ref = bytearray(num_frames)
+        self._hand = 0
+
+    def loaded(self, frame: int):
+        self._ref[frame] = 1
+
+    def accessed(self, frame: int):
+        self._ref[frame] = 1
+
+    def released(self, frame: int):
+        self._ref[frame] = 0
+
+    def victim(self, frames: List[Optional[Page]]) -> int:
+        n = len(self._ref)
+        while True:
+            frame = self._hand
+            self._hand = (self._hand + 1) % n
+            if frames[frame] is None:
+                continue
+            if self._ref[frame]:
+                self._ref[frame] = 0
+            else:
+                return frame
+
+class OptimalReplacement(ReplacementPolicy):
+    """
+    Algoritmo óptimo de Belady: expulsa la página cuyo próximo uso está más lejos.
+
+    Necesita conocer la secuencia de referencias futura, que se le entrega con `prepare` antes
+    de ejecutar las trazas. Las páginas sin usos futuros conocidos son las primeras candidatas.
+    """
+    name = 'optimal'
+
+    def __init__(self):
+        self._future: Dict[Page, Deque[int]] = {}
+
+    def prepare(self, refs: Sequence[Page]):
+        """Registra las posiciones futuras de cada página en la secuencia de referencias."""
+        self._future = {}
+        for i, page in enumerate(refs):
+            self._future.setdefault(page, deque()).append(i)
+
+    def consume(self, page: Page):
+        """Avanza la secuencia: la referencia actual a `page` ya ocurrió."""
+        positions = self._future.get(page)
+        if positions:
+            positions.popleft()
+
+    def victim(self, frames: List[Optional[Page]]) -> int:
+        best_frame, best_next = -1, -1
+        for frame, page in enumerate(frames):
+            if page is None:
+                continue
+            positions = self._future.get(page)
+            if not positions:
+                return frame
+            if positions[0] > best_next:
+                best_frame, best_next = frame, positions[0]
+        return best_frame
+
+# Políticas de reemplazo disponibles por nombre corto.
+PAGE_POLICIES = ('fifo', 'lru', 'clock', 'optimal')
+
+def make_replacement(name: str, num_frames: int) -> ReplacementPolicy:
+    """Construye una política de reemplazo por nombre. Lanza ValueError si no existe."""
+    if name == 'fifo':
+        return FIFOReplacement()
+    if name == 'lru':
+        return LRUReplacement()
+    if name == 'clock':
+        return ClockReplacement(num_frames)
+    if name == 'optimal':
+        return OptimalReplacement()
+    raise ValueError(f"Política de reemplazo desconocida '{name}'. Opciones: {', '.join(PAGE_POLICIES)}")
+
+class PagedMemoryManager:
+    """
+    Gestor de memoria virtual paginada con paginación bajo demanda.
+
+    `alloc` solo reserva el espacio virtual del proceso: los marcos se asignan en el primer
+    acceso a cada página (fallo de página), expulsando otra página si no quedan marcos libres.
+
+    Atributos:
+        page_size (int): Tamaño de página (y de marco) en unidades de memoria.
+        num_frames (int): Número de marcos físicos.
+        total (int): Memoria física total (num_frames * page_size).
+        page_tables (Dict[str, Dict[int, int]]): Por proceso, página virtual -> marco.
+        allocations (dict): {pid: (dirección_virtual_base, tamaño)}.
+        frames (List[Optional[Page]]): Página residente en cada marco, o None si está libre.
+        tlb (TLB): La TLB compartida (las entradas llevan el PID, no hace falta vaciarla al cambiar de proceso).
+        policy (ReplacementPolicy): Política de reemplazo de páginas.
+        tlb_time, mem_time, fault_time (int): Latencias para el cálculo del EAT.
+        alloc_stats (AllocatorStats): Telemetría de alloc y free (ver `telemetry`; `stats` da las métricas de paginación).
+    """
+    def __init__(self, num_frames: int, page_size: int = 4, tlb_entries: int = 8, policy: str = 'lru',
+                 tlb_time: int = 1, mem_time: int = 100, fault_time: int = 10000):
+        """
+        Inicializa los marcos, la TLB y la política de reemplazo. Lanza ValueError si no hay al
+        menos un marco o si el tamaño de página es menor que 1.
+        """
+        if page_size < 1:
+            raise ValueError("El tamaño de página debe ser al menos 1")
+        if num_frames < 1:
+            raise ValueError("La memoria paginada necesita al menos un marco (tamaño de página mayor que la memoria)")
+        self.page_size = page_size
+        self.num_frames = num_frames
+        self.total = num_frames * page_size
+        self.page_tables: Dict[str, Dict[int, int]] = {}
+        self.allocations: Dict[str, Tuple[int, int]] = {}
+        self._pages: Dict[str, int] = {}
+        self.frames: List[Optional[Page]] = [None] * num_frames
+        # Pila de marcos libres (el marco 0 sale primero).
+        self._free_frames: List[int] = list(range(num_frames - 1, -1, -1))
+        self.tlb = TLB(tlb_entries)
+        self.policy = make_replacement(policy, num_frames)
+        self.tlb_time, self.mem_time, self.fault_time = tlb_time, mem_time, fault_time
+        self.accesses = 0
+        self.tlb_hits = 0
+        self.page_faults = 0
+        self.evictions = 0
+        self.invalid_accesses = 0
+        self.alloc_stats = AllocatorStats(self.total, page_size if num_frames else 0)
+
+    def alloc(self, pid: str, size: int) -> Optional[int]:
+        """
+        Reserva `size` unidades de espacio virtual para `pid` (ceil(size / page_size) páginas).
+
+        Retorna:
+            La dirección virtual base (siempre 0: cada proceso tiene su propio espacio).
+        """
+        start = now_ns()
+        pages = -(-max(size, 0) // self.page_size)
+        self.free_mem(pid)
+        self.page_tables[pid] = {}
+        self._pages[pid] = pages
+        self.allocations[pid] = (0, max(size, 0))
+        self.alloc_stats.record_alloc(size, True)
+        self.alloc_stats.record('alloc', start)
+        return 0
+
+    def free_mem(self, pid: str) -> bool:
+        """Libera el espacio virtual de `pid` y todos sus marcos residentes."""
+        if pid not in self.allocations:
+            return False
+        start = now_ns()
+        for vpn, frame in self.page_tables.pop(pid).items():
+            self.frames[frame] = None
+            self.policy.released(frame)
+            self.tlb.invalidate((pid, vpn))
+            self._free_frames.append(frame)
+        del self._pages[pid]
+        del self.allocations[pid]
+        self._update_free()
+        self.alloc_stats.frees += 1
+        self.alloc_stats.record('free', start)
+        return True
+
+    def _update_free(self):
+        """Actualiza la telemetría de espacio libre (marcos libres; cualquiera sirve entero)."""
+        free = len(self._free_frames) * self.page_size
+        self.alloc_stats.set_free(free, self.page_size if free else 0)
+
+    def telemetry(self) -> dict:
+        """Contadores de telemetría del asignador como diccionario (lectura O(1))."""
+        return self.alloc_stats.as_dict()
+
+    def _load(self, page: Page) -> int:
+        """Atiende un fallo de página: obtiene un marco (libre o expulsando una víctima) y carga la página."""
+        self.page_faults += 1
+        if self._free_frames:
+            frame = self._free_frames.pop()
+        else:
+            frame = self.policy.victim(self.frames)
+            old_pid, old_vpn = self.frames[frame]
+            del self.page_tables[old_pid][old_vpn]
+            self.tlb.invalidate((old_pid, old_vpn))
+            self.evictions += 1
+        self.frames[frame] = page
+        self.page_tables[page[0]][page[1]] = frame
+        self.policy.loaded(frame)
+        self._update_free()
+        return frame
+
+    def access(self, pid: str, vaddr: int) -> Optional[int]:
+        """
+        Traduce un acceso de `pid` a la dirección virtual `vaddr`.
+
+        Consulta la TLB; si falla, la tabla de páginas; si la página no está residente, produce
+        un fallo de página.
+
+        Retorna:
+            La dirección física, o None si el acceso está fuera del espacio del proceso.
+        """
+        vpn, offset = divmod(vaddr, self.page_size)
+        if pid not in self._pages or not 0 <= vpn < self._pages[pid]:
+            self.invalid_accesses += 1
+            return None
+        self.accesses += 1
+        page = (pid, vpn)
+        if isinstance(self.policy, OptimalReplacement):
+            self.policy.consume(page)
+        frame = self.tlb.lookup(page)
+        if frame is not None:
+            self.tlb_hits += 1
+        else:
+            frame = self.page_tables[pid].get(vpn)
+            if frame is None:
+                frame = self._load(page)
+            self.tlb.insert(page, frame)
+        self.policy.accessed(frame)
+        return frame * self.page_size + offset
+
+    def run_traces(self, traces: Dict[str, Sequence[int]], burst: int = 1) -> int:
+        """
+        Ejecuta las trazas de varios procesos intercalándolas de `burst` en `burst` accesos.
+
+        La secuencia completa de referencias se construye antes de empezar para que la política
+        óptima conozca el futuro.
+
+        Retorna:
+            El número de accesos ejecutados.
+
+        Lanza ValueError si `burst` es menor que 1.
+        """
+        if burst < 1:
+            raise ValueError("La ráfaga debe ser al menos 1")
+        refs: List[Tuple[str, int]] = []
+        positions = {pid: 0 for pid in traces}
+        while positions:
+            for pid in list(positions):
+                trace, i = traces[pid], positions[pid]
+                refs.extend((pid, vaddr) for vaddr in trace[i:i + burst])
+                if i + burst >= len(trace):
+                    del positions[pid]
+                else:
+                    positions[pid] = i + burst
+        if isinstance(self.policy, OptimalReplacement):
+            self.policy.prepare([(pid, vaddr // self.page_size) for pid, vaddr in refs])
+        for pid, vaddr in refs:
+            self.access(pid, vaddr)
+        return len(refs)
+
+    def stats(self) -> dict:
+        """
+        Métricas de la paginación: tasa de aciertos de la TLB, tasa de fallos de página,
+        expulsiones y tiempo efectivo de acceso (EAT) con las latencias configuradas:
+
+        - acierto de TLB: tlb_time + mem_time
+        - fallo de TLB sin fallo de página: tlb_time + 2 * mem_time
+        - fallo de página: tlb_time + 2 * mem_time + fault_time
+        """
+        n = self.accesses
+        misses = n - self.tlb_hits
+        total_time = (n * self.tlb_time + self.tlb_hits * self.mem_time
+                      + misses * 2 * self.mem_time + self.page_faults * self.fault_time)
+        return {
+            'policy': self.policy.name,
+            'accesses': n,
+            'tlb_hits': self.tlb_hits,
+            'tlb_hit_rate': self.tlb_hits / n if n else 0.0,
+            'page_faults': self.page_faults,
+            'page_fault_rate': self.page_faults / n if n else 0.0,
+            'evictions': self.evictions,
+            'invalid_accesses': self.invalid_accesses,
+            'effective_access_time': total_time / n if n else 0.0,
+        }
+
+    def mem_map(self):
+        """Retorna el estado de la memoria física en el mismo formato que MemoryManager.mem_map()."""
+        free = sorted(frame * self.page_size for frame in self._free_frames)
+        return {
+            'total': self.total,
+            'free': [(addr, self.page_size) for addr in free],
+            # Una entrada por página residente: (pid, dirección física del marco, tamaño de página).
+            'allocations': [(pid, frame * self.page_size, self.page_size)
+                            for pid, table in self.page_tables.items() for frame in table.values()],
+        }
+
+    def fragmentation(self) -> dict:
+        """
+        Fragmentación con paginación.
+
+        - internal: fracción de las páginas reservadas que no se pidió (resto de la última página).
+        - external: siempre 0, porque cualquier marco libre sirve para cualquier página.
+        """
+        reserved = sum(self._pages.values()) * self.page_size
+        requested = sum(size for _, size in self.allocations.values())
+        return {
+            'internal': 1 - requested / reserved if reserved else 0.0,
+            'external': 0.0,
+            'free': len(self._free_frames) * self.page_size,
+            'largest_free': self.page_size if self._free_frames else 0,
+        }
+
+    def defrag(self, processes: Iterable['SimProcess']):
+        """No hace nada: con paginación no existe fragmentación externa que compactar."""
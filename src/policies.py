@@ -0,0 +1,230 @@
+"""
+Políticas de Planificación para el Scheduler del Sistema Operativo Simulado.
+
+Cada política encapsula la cola de listos y decide qué proceso se despacha a continuación
+y durante cuánto tiempo. El Scheduler solo conoce la interfaz común (`SchedulingPolicy`),
+por lo que las políticas son intercambiables:
+
+- Round-Robin (rr): cola FIFO circular con quantum fijo.
+- Shortest Job First (sjf): no apropiativa, menor ráfaga restante primero.
+- Shortest Remaining Time First (srtf): apropiativa ante llegadas de trabajos más cortos.
+- Prioridad con envejecimiento (priority): menor número = mayor prioridad.
+- Multi-Level Feedback Queue (mlfq): colas por nivel con quantum creciente y refresco periódico.
+
+Las políticas basadas en montículo (SJF, SRTF, Prioridad) mantienen su cola en `heapq`,
+de modo que cada inserción y cada despacho cuestan O(log n).
+"""
+
+import heapq
+import inspect
+from collections import deque
+from typing import Dict, List, Optional, Deque, Tuple
+from process import SimProcess
+
+class SchedulingPolicy:
+    """
+    Interfaz común de las políticas de planificación.
+
+    Atributos:
+        name (str): Nombre corto de la política (el usado en el shell).
+        quantum (int): Quantum base en unidades de tiempo.
+    """
+    name = 'base'
+
+    def __init__(self, quantum: int):
+        """Inicializa la política con el quantum base del planificador."""
+        self.quantum = quantum
+
+    def add(self, process: SimProcess, now: int):
+        """Encola un proceso que acaba de pasar a READY."""
+        raise NotImplementedError
+
+    def pop(self, now: int) -> Optional[SimProcess]:
+        """Extrae el siguiente proceso a despachar, o None si la cola está vacía."""
+        raise NotImplementedError
+
+    def time_slice(self, process: SimProcess) -> Optional[int]:
+        """Unidades máximas que el proceso puede ejecutar en este despacho (None = hasta terminar)."""
+        return self.quantum
+
+    def should_preempt(self, running: SimProcess, arrived: List[SimProcess]) -> bool:
+        """Indica si la llegada de `arrived` debe expulsar al proceso en ejecución."""
+        return False
+
+    def on_preempt(self, process: SimProcess, used: int, exhausted: bool):
+        """Notifica que el proceso vuelve a la cola tras ejecutar `used` unidades sin terminar."""
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+class RoundRobinPolicy(SchedulingPolicy):
+    """Round-Robin clásico: cola FIFO y quantum fijo."""
+    name = 'rr'
+
+    def __init__(self, quantum: int):
+        super().__init__(quantum)
+        self._queue: Deque[SimProcess] = deque()
+
+    def add(self, process: SimProcess, now: int):
+        self._queue.append(process)
+
+    def pop(self, now: int) -> Optional[SimProcess]:
+        return self._queue.popleft() if self._queue else None
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+class _HeapPolicy(SchedulingPolicy):
+    """
+    Base para las políticas cuya cola de listos es un montículo binario (`heapq`).
+
+    Cada entrada es `(clave, secuencia, proceso)`; la secuencia rompe empates en orden de
+    llegada a la cola y evita comparar objetos SimProcess.
+    """
+    def __init__(self, quantum: int):
+        super().__init__(quantum)
+        self._heap: List[Tuple[int, int, SimProcess]] = []
+        self._seq = 0
+
+    def key(self, process: SimProcess, now: int) -> int:
+        """Clave de orden del proceso (menor = se despacha antes)."""
+        raise NotImplementedError
+
+    def add(self, process: SimProcess, now: int):
+        heapq.heappush(self._heap, (self.key(process, now), self._seq, process))
+        self._seq += 1
+
+    def pop(self, now: int) -> Optional[SimProcess]:
+        return heapq.heappop(self._heap)[2] if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+class SJFPolicy(_HeapPolicy):
+    """Shortest Job First no apropiativo: el trabajo con menos unidades restantes se ejecuta hasta terminar."""
+    name = 'sjf'
+
+    def key(self, process: SimProcess, now: int) -> int:
+        return process.cpu_units
+
+    def time_slice(self, process: SimProcess) -> Optional[int]:
+        return None
+
+class SRTFPolicy(SJFPolicy):
+    """
+    Shortest Remaining Time First: versión apropiativa de SJF.
+
+    El proceso en ejecución es expulsado cuando llega otro con menos tiempo restante.
+    """
+    name = 'srtf'
+
+    def should_preempt(self, running: SimProcess, arrived: List[SimProcess]) -> bool:
+        return any(p.cpu_units < running.cpu_units for p in arrived)
+
+class PriorityPolicy(_HeapPolicy):
+    """
+    Planificación por prioridad (menor número = mayor prioridad) con envejecimiento.
+
+    El envejecimiento es lineal: cada `aging_interval` unidades de espera mejoran la prioridad
+    efectiva en 1. Como todos los procesos envejecen al mismo ritmo, el orden relativo en un
+    instante dado solo depende de `prioridad * aging_interval + instante_de_encolado`, una clave
+    fija que cabe en el montículo sin reordenarlo cuando avanza el reloj.
+    Con `aging_interval=0` no hay envejecimiento. Entre procesos se reparte la CPU por quantum.
+    """
+    name = 'priority'
+
+    def __init__(self, quantum: int, aging_interval: int = 10):
+        super().__init__(quantum)
+        self.aging_interval = aging_interval
+
+    def key(self, process: SimProcess, now: int) -> int:
+        if self.aging_interval <= 0:
+            return process.priority
+        return process.priority * self.aging_interval + now
+
+class MLFQPolicy(SchedulingPolicy):
+    """
+    Multi-Level Feedback Queue.
+
+    Hay `levels` colas FIFO; el nivel `i` usa un quantum de `quantum * 2**i`. Un proceso que agota
+    su quantum desciende un nivel; uno que cede la CPU antes conserva su nivel. Cada
+    `boost_interval` unidades de tiempo todos los procesos en espera vuelven al nivel 0 para
+    evitar la inanición.
+    """
+    name = 'mlfq'
+
+    def __init__(self, quantum: int, levels: int = 3, boost_interval: int = 50):
+        super().__init__(quantum)
+        self.levels = max(1, levels)
+        self.boost_interval = boost_interval
+        self._queues: List[Deque[SimProcess]] = [deque() for _ in range(self.levels)]
+        self._size = 0
+        self._next_boost = boost_interval
+
+    def add(self, process: SimProcess, now: int):
+        self._queues[min(process.level, self.levels - 1)].append(process)
+        self._size += 1
+
+    def pop(self, now: int) -> Optional[SimProcess]:
+        if self.boost_interval > 0 and now >= self._next_boost:
+            self._boost()
+            self._next_boost = now + self.boost_interval
+        for queue in self._queues:
+            if queue:
+                self._size -= 1
+                return queue.popleft()
+        return None
+
+    def _boost(self):
+        """Devuelve todos los procesos en espera al nivel de mayor prioridad."""
+        top = self._queues[0]
+        for queue in self._queues[1:]:
+            while queue:
+                process = queue.popleft()
+                process.level = 0
+                top.append(process)
+
+    def time_slice(self, process: SimProcess) -> Optional[int]:
+        return self.quantum * (2 ** min(process.level, self.levels - 1))
+
+    def on_preempt(self, process: SimProcess, used: int, exhausted: bool):
+        if exhausted and process.level < self.levels - 1:
+            process.level += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+# Registro de políticas disponibles por nombre corto.
+POLICIES: Dict[str, type] = {
+    RoundRobinPolicy.name: RoundRobinPolicy,
+    SJFPolicy.name: SJFPolicy,
+    SRTFPolicy.name: SRTFPolicy,
+    PriorityPolicy.name: PriorityPolicy,
+    MLFQPolicy.name: MLFQPolicy,
+}
+
+def make_policy(name: str, quantum: int, /, **options) -> SchedulingPolicy:
+    """
+    Construye una política a partir de su nombre corto ('rr', 'sjf', 'srtf', 'priority', 'mlfq').
+
+    Las opciones adicionales (p. ej. `aging_interval`, `levels`, `boost_interval`) se pasan al
+    constructor de la política. Lanza ValueError si el nombre no existe, si el quantum es menor
+    que 1 o si la política no admite alguna de las opciones.
+    """
+    try:
+        policy_cls = POLICIES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Política desconocida '{name}'. Opciones: {', '.join(POLICIES)}") from None
+    if quantum < 1:
+        raise ValueError("El quantum debe ser al menos 1")
+    accepted = policy_options(policy_cls)
+    for option in options:
+        if option not in accepted:
+            raise ValueError(f"La política '{policy_cls.name}' no admite la opción '{option}' "
+                             f"(opciones: {', '.join(accepted) or 'ninguna'})")
+    return policy_cls(quantum, **options)
+
+def policy_options(policy_cls: type) -> List[str]:
+    """Nombres de las opciones que admite el constructor de una política (además del quantum)."""
+    params = inspect.signature(policy_cls.__init__).parameters
+    return [name for name in params if name not in ('self', 'quantum')]
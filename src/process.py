@@ -5,8 +5,15 @@ Este archivo contiene la clase de datos `SimProcess`, que actúa como el Bloque
 en nuestra simulación. Almacena toda la información esencial sobre un proceso.
 """
 
-from typing import Optional
-from dataclasses import dataclass
+from array import array
+from typing import TYPE_CHECKING, Optional, Dict, Set, Iterator, List
+from dataclasses import dataclass, field
+
+if TYPE_CHECKING:
+    from program import Program
+
+# Estados válidos del ciclo de vida de un proceso.
+PROCESS_STATES = ('NEW', 'READY', 'RUNNING', 'BLOCKED', 'FINISHED')
 
 @dataclass
 class SimProcess:
@@ -25,6 +32,7 @@ class SimProcess:
     mem_req: int = 0
     
     # Estado actual del proceso en su ciclo de vida. Puede ser:
+    # - NEW: Creado, pero su instante de llegada aún no se ha alcanzado.
     # - READY: Listo para ser ejecutado por el planificador.
     # - RUNNING: Actualmente en ejecución.
     # - BLOCKED: Esperando por un recurso (ej. un mutex).
@@ -34,6 +42,66 @@ class SimProcess:
     # Dirección de inicio de la memoria asignada por el MemoryManager. None si no tiene memoria asignada.
     addr: Optional[int] = None
 
+    # Prioridad estática (menor número = mayor prioridad). Usada por la política de prioridad.
+    priority: int = 0
+
+    # Instante de tiempo simulado en que el proceso llega al sistema.
+    arrival_time: int = 0
+
+    # Ráfaga total de CPU solicitada (se fija al crear el proceso; cpu_units es lo que resta).
+    burst: int = 0
+
+    # Instantes de primer despacho y de finalización, para las métricas de respuesta y retorno.
+    start_time: Optional[int] = None
+    finish_time: Optional[int] = None
+
+    # Ficha de la espera en curso (llegada, desbloqueo temporizado o petición al disco). Cada
+    # evento lleva la ficha de la espera que lo programó y solo despierta al proceso si coincide,
+    # de modo que un evento antiguo no despierta una espera posterior ni a otro proceso con el mismo PID.
+    wait_token: int = 0
+
+    # True si el proceso terminó por `kill` (del usuario o por falta de memoria) y no por completar
+    # su trabajo. Los procesos eliminados no cuentan en las métricas de procesos completados.
+    killed: bool = False
+
+    # Nivel actual en la cola multinivel (MLFQ).
+    level: int = 0
+
+    # Núcleo al que está fijado el proceso (None = cualquiera) y último núcleo donde ejecutó.
+    # Solo los usa el planificador multinúcleo.
+    affinity: Optional[int] = None
+    core: Optional[int] = None
+
+    # Traza de accesos a memoria (direcciones virtuales) para el modo de memoria paginada.
+    # Se guarda como array compacto de enteros.
+    mem_trace: Optional[array] = None
+
+    # Programa de instrucciones (ver program.py), contador de programa y unidades que restan de
+    # la instrucción `compute` en curso. Sin programa, el proceso solo consume `cpu_units`.
+    program: Optional['Program'] = None
+    pc: int = 0
+    op_left: int = 0
+
+    # Tabla de procesos a la que pertenece el PCB. La tabla se entera de cada cambio de
+    # estado para mantener sus índices por estado sin recorrer la lista completa.
+    _table: Optional['ProcessTable'] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Completa la ráfaga total si no se indicó explícitamente."""
+        if not self.burst:
+            self.burst = self.cpu_units
+
+    def __setattr__(self, name, value):
+        """Intercepta los cambios de `state` para notificar a la tabla de procesos."""
+        if name == 'state':
+            old = self.__dict__.get('state')
+            object.__setattr__(self, name, value)
+            table = self.__dict__.get('_table')
+            if table is not None and old != value:
+                table._move(self.pid, old, value)
+            return
+        object.__setattr__(self, name, value)
+
     def run_one_unit(self):
         """
         Simula la ejecución de una unidad de trabajo de CPU.
@@ -53,6 +121,114 @@ class SimProcess:
         # Simula el "trabajo" consumiendo una unidad de CPU.
         self.cpu_units -= 1
         
+        # Con programa, el final lo marca el planificador al agotar las instrucciones.
+        if self.program is not None:
+            self.op_left -= 1
+            return
+
         # Si después de decrementar, las unidades de CPU llegan a cero, el proceso ha terminado.
         if self.cpu_units <= 0:
-            self.state = 'FINISHED'
\ No newline at end of file
+            self.state = 'FINISHED'
+
+    def run_units(self, units: int):
+        """
+        Simula la ejecución de `units` unidades de CPU de una sola vez.
+        
+        Equivale a llamar `units` veces a `run_one_unit`, sin pasar por el bucle de Python.
+        Lo usa el modo de avance rápido del Scheduler.
+        """
+        if self.state == 'FINISHED':
+            return
+        if self.program is not None:
+            self.cpu_units -= units
+            self.op_left -= units
+            return
+        if self.cpu_units <= 0:
+            self.state = 'FINISHED'
+            return
+        self.cpu_units -= min(units, self.cpu_units)
+        if self.cpu_units <= 0:
+            self.state = 'FINISHED'
+
+class ProcessTable:
+    """
+    Tabla de procesos (PCB table) indexada por PID y por estado.
+    
+    Sustituye a la lista plana de procesos: las búsquedas por PID y los cambios de estado
+    cuestan O(1) en lugar de recorrer todos los procesos. Los procesos FINISHED pueden
+    archivarse para que dejen de ocupar la tabla viva.
+    
+    Atributos:
+        _by_pid (Dict[str, SimProcess]): Índice PID -> PCB de los procesos vivos (en orden de creación).
+        _by_state (Dict[str, Set[str]]): Conjunto de PIDs por cada estado.
+        _order (Dict[str, int]): Secuencia de creación de cada PID vivo.
+        archived (Dict[str, SimProcess]): Procesos terminados que fueron archivados.
+    """
+    def __init__(self):
+        """Inicializa una tabla vacía."""
+        self._by_pid: Dict[str, SimProcess] = {}
+        self._by_state: Dict[str, Set[str]] = {state: set() for state in PROCESS_STATES}
+        self.archived: Dict[str, SimProcess] = {}
+        # Número de secuencia de creación, para listar en orden estable sin recorrer la tabla.
+        self._order: Dict[str, int] = {}
+        self._next_seq = 0
+
+    def add(self, process: SimProcess):
+        """Registra un proceso en la tabla. Un PID archivado se reemplaza por el nuevo proceso."""
+        if process.pid in self._by_pid:
+            raise ValueError(f"El PID '{process.pid}' ya existe.")
+        self.archived.pop(process.pid, None)
+        process._table = self
+        self._by_pid[process.pid] = process
+        self._order[process.pid] = self._next_seq
+        self._next_seq += 1
+        self._by_state.setdefault(process.state, set()).add(process.pid)
+
+    def get(self, pid: str) -> Optional[SimProcess]:
+        """Retorna el proceso vivo con el PID dado, o None si no existe."""
+        return self._by_pid.get(pid)
+
+    def pids_in(self, state: str) -> Set[str]:
+        """Retorna (sin copiar) el conjunto de PIDs que están en un estado dado."""
+        return self._by_state.get(state, set())
+
+    def count(self, state: str) -> int:
+        """Número de procesos vivos en un estado dado."""
+        return len(self._by_state.get(state, ()))
+
+    def in_state(self, state: str) -> List[SimProcess]:
+        """Retorna los procesos en un estado dado, en orden de creación (O(k log k) para k procesos)."""
+        pids = self._by_state.get(state, ())
+        return sorted((self._by_pid[pid] for pid in pids), key=lambda p: self._order[p.pid])
+
+    def archive_finished(self) -> int:
+        """
+        Mueve los procesos FINISHED de la tabla viva al archivo.
+        
+        Retorna:
+            El número de procesos archivados.
+        """
+        finished = self._by_state['FINISHED']
+        for pid in finished:
+            process = self._by_pid.pop(pid)
+            del self._order[pid]
+            process._table = None
+            self.archived[pid] = process
+        count = len(finished)
+        finished.clear()
+        return count
+
+    def _move(self, pid: str, old: Optional[str], new: str):
+        """Actualiza los índices por estado cuando un proceso cambia de estado."""
+        if old is not None:
+            self._by_state.get(old, set()).discard(pid)
+        self._by_state.setdefault(new, set()).add(pid)
+
+    def __contains__(self, pid: str) -> bool:
+        return pid in self._by_pid
+
+    def __iter__(self) -> Iterator[SimProcess]:
+        return iter(self._by_pid.values())
+
+    def __len__(self) -> int:
+        return len(self._by_pid)
@@ -0,0 +1,146 @@
+"""
+Programas de instrucciones para los procesos del Sistema Operativo Simulado.
+
+Un programa es la secuencia de operaciones que ejecuta un proceso: cálculo, cerrojos, memoria y
+E/S (una espera fija con `io n`, o una petición al cilindro `c` del disco con `disk c`). El
+planificador lo recorre durante `run`, de modo que la contención por cerrojos, los bloqueos por
+E/S y las asignaciones de memoria ocurren dentro de la simulación.
+
+Cada instrucción se empaqueta en un único entero de 64 bits dentro de un `array`: el código de
+operación ocupa los 3 bits bajos y el argumento el resto. Los nombres de recursos de `lock` y
+`unlock` se internan en una tabla por programa y la instrucción guarda solo su índice, así que
+una traza larga ocupa 8 bytes por instrucción en lugar de un objeto de Python por paso.
+
+Sintaxis textual: `compute 3 lock m compute 2 unlock m io 5 disk 98 alloc 10 free compute 1`
+(los separadores `;` y `,` también se aceptan).
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+# Códigos de operación.
+OP_COMPUTE = 0
+OP_LOCK = 1
+OP_UNLOCK = 2
+OP_ALLOC = 3
+OP_FREE = 4
+OP_IO = 5
+OP_DISK = 6
+
+OPCODES: Dict[str, int] = {
+    'compute': OP_COMPUTE,
+    'lock': OP_LOCK,
+    'unlock': OP_UNLOCK,
+    'alloc': OP_ALLOC,
+    'free': OP_FREE,
+    'io': OP_IO,
+    'disk': OP_DISK,
+}
+OP_NAMES = {code: name for name, code in OPCODES.items()}
+
+_OP_BITS = 3
+_OP_MASK = (1 << _OP_BITS) - 1
+
+# Límite (exclusivo) de los argumentos: lo que cabe en una palabra de 64 bits junto a la operación.
+MAX_ARG = 1 << (64 - _OP_BITS)
+
+class Program:
+    """
+    Programa compacto de un proceso.
+
+    Atributos:
+        code (array): Instrucciones empaquetadas (`argumento << 3 | operación`).
+        names (List[str]): Tabla de recursos internados que referencian `lock` y `unlock`.
+    """
+    __slots__ = ('code', 'names', '_ids')
+
+    def __init__(self):
+        """Inicializa un programa vacío."""
+        self.code = array('Q')
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def append(self, op: Union[int, str], arg: Union[int, str] = 0):
+        """
+        Añade una instrucción. `op` puede ser el código o su nombre; el argumento de `lock` y
+        `unlock` es el nombre del recurso y el de las demás un entero no negativo.
+
+        Lanza ValueError si la operación o el argumento no son válidos (incluido un argumento
+        que no quepa en la instrucción empaquetada, ver `MAX_ARG`).
+        """
+        if isinstance(op, str):
+            if op not in OPCODES:
+                raise ValueError(f"Operación desconocida: '{op}' (opciones: {', '.join(OPCODES)})")
+            op = OPCODES[op]
+        if op in (OP_LOCK, OP_UNLOCK):
+            name = str(arg)
+            if name not in self._ids:
+                self._ids[name] = len(self.names)
+                self.names.append(name)
+            arg = self._ids[name]
+        elif op == OP_FREE:
+            arg = 0
+        elif not isinstance(arg, int) or arg < 0:
+            raise ValueError(f"'{OP_NAMES[op]}' requiere un entero no negativo")
+        elif arg >= MAX_ARG:
+            raise ValueError(f"El argumento de '{OP_NAMES[op]}' debe ser menor que {MAX_ARG}")
+        self.code.append(arg << _OP_BITS | op)
+
+    @classmethod
+    def parse(cls, source: Union[str, Iterable[str]]) -> 'Program':
+        """
+        Construye un programa a partir de su forma textual (cadena o lista de palabras).
+
+        Lanza ValueError si hay operaciones desconocidas o argumentos que faltan o no son válidos.
+        """
+        if isinstance(source, str):
+            source = source.replace(';', ' ').replace(',', ' ').split()
+        tokens = list(source)
+        program = cls()
+        i = 0
+        while i < len(tokens):
+            name = tokens[i].lower()
+            if name == 'free':
+                program.append(OP_FREE)
+                i += 1
+                continue
+            if i + 1 >= len(tokens):
+                raise ValueError(f"Falta el argumento de '{name}'")
+            arg = tokens[i + 1]
+            if name not in ('lock', 'unlock'):
+                try:
+                    arg = int(arg)
+                except ValueError:
+                    raise ValueError(f"'{name}' requiere un entero, no '{arg}'") from None
+            program.append(name, arg)
+            i += 2
+        return program
+
+    def decode(self, pc: int) -> Tuple[int, Union[int, str]]:
+        """Retorna la instrucción `pc` como `(operación, argumento)`, con los recursos ya por nombre."""
+        word = self.code[pc]
+        op, arg = word & _OP_MASK, word >> _OP_BITS
+        if op in (OP_LOCK, OP_UNLOCK):
+            return op, self.names[arg]
+        return op, arg
+
+    def compute_units(self) -> int:
+        """Total de unidades de CPU que pide el programa."""
+        return sum(word >> _OP_BITS for word in self.code if word & _OP_MASK == OP_COMPUTE)
+
+    def max_arg(self, op: int) -> int:
+        """Mayor argumento de las instrucciones de una operación (-1 si no hay ninguna)."""
+        return max((word >> _OP_BITS for word in self.code if word & _OP_MASK == op), default=-1)
+
+    def __iter__(self) -> Iterator[Tuple[str, Union[int, str]]]:
+        """Itera las instrucciones como `(nombre, argumento)`."""
+        for pc in range(len(self.code)):
+            op, arg = self.decode(pc)
+            yield OP_NAMES[op], arg
+
+    def __len__(self) -> int:
+        """Número de instrucciones."""
+        return len(self.code)
+
+    def __str__(self) -> str:
+        return " ".join(name if name == 'free' else f"{name} {arg}" for name, arg in self)
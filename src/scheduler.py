@@ -1,37 +1,210 @@
 """
 Planificador de Procesos (Scheduler) para el Sistema Operativo Simulado.
 
-Implementa un planificador Round-Robin que gestiona el ciclo de vida de los procesos.
+Implementa un planificador con políticas intercambiables (Round-Robin por defecto; ver policies.py)
+que gestiona el ciclo de vida de los procesos.
 También se integra con el LockManager para manejar la sincronización y el bloqueo de procesos.
+Los procesos con programa (ver program.py) ejecutan sus cerrojos, E/S y operaciones de memoria
+dentro de `run`, por lo que la contención ocurre durante la simulación. Las peticiones al disco
+(ver disk.py) bloquean al proceso hasta que el disco las atiende.
 """
 
-from collections import deque
-from typing import List, Tuple, Optional
-from process import SimProcess
+import heapq
+from typing import List, Tuple, Optional, Union
+from process import SimProcess, ProcessTable
 from synchronization import LockManager
+from policies import SchedulingPolicy, make_policy
+from timeline import Timeline
+from program import Program, OP_COMPUTE, OP_LOCK, OP_UNLOCK, OP_ALLOC, OP_FREE, OP_IO, OP_DISK
+from disk import Disk
 import time
 
 class Scheduler:
     """
-    Implementa un planificador Round-Robin.
+    Implementa un planificador de procesos con política intercambiable.
+    
+    La cola de listos pertenece a la política y persiste entre llamadas a `run`: los procesos se
+    encolan al pasar a READY (creación, llegada, desbloqueo o expulsión), por lo que despachar
+    no requiere recorrer la tabla de procesos.
     
     Atributos:
         quantum (int): El número de unidades de tiempo que cada proceso puede ejecutar antes de ser interrumpido.
-        processes (List[SimProcess]): La lista de todos los procesos en el sistema (PCB table).
-        timeline (List[Tuple[int, str]]): Un registro histórico de qué proceso se ejecutó en cada unidad de tiempo.
+        policy (SchedulingPolicy): La política que gestiona la cola de listos.
+        processes (ProcessTable): La tabla de procesos del sistema (PCB table), indexada por PID y estado.
+        timeline (Timeline): Registro histórico de ejecución, con un tramo (pid, inicio, duración) por ráfaga.
         _time (int): El reloj interno del sistema (tiempo simulado).
+        _busy (int): Unidades de tiempo en que la CPU estuvo ocupada.
+        _io_overlap (int): Unidades de tiempo en que la CPU y el disco trabajaron a la vez.
+        _queued (set): PIDs que tienen una entrada en la cola de la política.
+        _events (list): Montículo de eventos temporizados `(instante, secuencia, tipo, pid, ficha)`:
+                        llegadas ('ARRIVAL'), desbloqueos ('WAKEUP') y fin de peticiones al disco ('DISK').
+                        La ficha identifica la espera del proceso (ver `SimProcess.wait_token`).
         lock_manager (LockManager): El gestor de cerrojos para la sincronización.
+        memory: El gestor de memoria asociado (ver `attach_memory`), o None.
+        compact_units (int): Unidades de memoria que se compactan entre quantums (0 = desactivado).
+        compacted_units (int): Total de unidades movidas por la compactación entre quantums.
+        disk (Disk): El disco al que los procesos envían peticiones de E/S.
     """
-    def __init__(self, quantum: int = 2):
-        """Inicializa el planificador con un quantum dado."""
+    def __init__(self, quantum: int = 2, policy: Union[str, SchedulingPolicy] = 'rr', **policy_options):
+        """
+        Inicializa el planificador con un quantum y una política dados (por nombre o instancia).
+        Lanza ValueError si el quantum es menor que 1 o la política no es válida.
+        """
+        if quantum < 1:
+            raise ValueError("El quantum debe ser al menos 1")
         self.quantum = quantum
-        self.processes = []
-        self.timeline = []
+        self.policy = make_policy(policy, quantum, **policy_options) if isinstance(policy, str) else policy
+        self.processes = ProcessTable()
+        self.timeline = Timeline()
         self._time = 0
-        self.lock_manager = LockManager()
+        self._busy = 0
+        self._io_overlap = 0
+        self._queued = set()
+        self._events: List[Tuple[int, int, str, str, int]] = []
+        self._event_seq = 0
+        self._wait_seq = 0
+        self.lock_manager = LockManager(clock=lambda: self._time)
+        self.memory = None
+        self.compact_units = 0
+        self.compacted_units = 0
+        self.disk = Disk()
+
+    def attach_memory(self, memory_manager, compact_units: int = 0):
+        """
+        Asocia un gestor de memoria al planificador.
+        
+        El gestor recibe la tabla de procesos para poder actualizar los PCBs cuando reubica
+        bloques. Si `compact_units` > 0 y el gestor soporta compactación incremental, entre
+        quantum y quantum se mueven como mucho esas unidades de memoria.
+        """
+        self.memory = memory_manager
+        self.compact_units = compact_units
+        if hasattr(memory_manager, 'bind_processes'):
+            memory_manager.bind_processes(self.processes)
+
+    def attach_disk(self, disk: Disk):
+        """Sustituye el disco del planificador (antes de emitir peticiones)."""
+        self.disk = disk
+
+    @property
+    def now(self) -> int:
+        """Instante actual del reloj simulado."""
+        return self._time
+
+    def advance_idle(self) -> bool:
+        """
+        Con la CPU ociosa (ningún proceso READY), avanza el reloj hasta el siguiente evento
+        temporizado y lo atiende.
+        
+        Retorna:
+            True si el reloj avanzó, False si hay procesos listos o no quedan eventos.
+        """
+        if self.processes.count('READY') or not self._events:
+            return False
+        self._time = max(self._time, self._events[0][0])
+        self._process_events()
+        return True
+
+    def set_policy(self, policy: Union[str, SchedulingPolicy], /, **policy_options):
+        """Cambia la política de planificación, reencolando los procesos READY en orden de creación."""
+        self.policy = make_policy(policy, self.quantum, **policy_options) if isinstance(policy, str) else policy
+        self._queued.clear()
+        for p in self.processes.in_state('READY'):
+            self._enqueue(p)
+
+    def _enqueue(self, process: SimProcess):
+        """Pone un proceso READY en la cola de la política (una sola entrada por proceso)."""
+        if process.pid not in self._queued:
+            self._queued.add(process.pid)
+            self.policy.add(process, self._time)
+
+    def _next_ready(self) -> Optional[SimProcess]:
+        """
+        Extrae el siguiente proceso READY de la política.
+        
+        Las entradas de procesos que dejaron de estar READY mientras esperaban en la cola
+        (terminados con `kill` o bloqueados) se descartan aquí, en lugar de buscarlas y
+        eliminarlas de la cola en el momento del cambio de estado.
+        """
+        while True:
+            process = self.policy.pop(self._time)
+            if process is None:
+                return None
+            self._queued.discard(process.pid)
+            if process.state == 'READY' and self.processes.get(process.pid) is process:
+                return process
+
+    def _schedule_event(self, at: int, kind: str, pid: str, token: int):
+        """Programa un evento temporizado ('ARRIVAL', 'WAKEUP' o 'DISK') para la espera `token` de un proceso."""
+        heapq.heappush(self._events, (at, self._event_seq, kind, pid, token))
+        self._event_seq += 1
+
+    def _new_wait(self, process: SimProcess) -> int:
+        """Da al proceso una ficha de espera nueva; los eventos de sus esperas anteriores dejan de valer."""
+        self._wait_seq += 1
+        process.wait_token = self._wait_seq
+        return self._wait_seq
+
+    def _process_events(self) -> List[SimProcess]:
+        """
+        Atiende los eventos cuyo instante ya se alcanzó.
+        
+        Una llegada pasa el proceso de NEW a READY; un desbloqueo temporizado o el fin de su
+        petición al disco lo pasa de BLOCKED a READY (y el disco empieza la siguiente petición).
+        Un evento cuya ficha no es la de la espera actual del proceso (un proceso terminado y
+        recreado con el mismo PID, por ejemplo) se descarta. Retorna los procesos que quedaron listos.
+        """
+        woken = []
+        while self._events and self._events[0][0] <= self._time:
+            at, _, kind, pid, token = heapq.heappop(self._events)
+            if kind == 'DISK':
+                _, next_done = self.disk.complete(at)
+                if next_done is not None:
+                    self._schedule_event(next_done, 'DISK', self.disk.current.pid, self.disk.current.token)
+            p = self.processes.get(pid)
+            expected = 'NEW' if kind == 'ARRIVAL' else 'BLOCKED'
+            if p is not None and p.state == expected and p.wait_token == token:
+                p.state = 'READY'
+                self._enqueue(p)
+                woken.append(p)
+        return woken
+
+    def sleep_process(self, pid: str, units: int) -> bool:
+        """Bloquea un proceso durante `units` unidades de tiempo simulado; al vencer vuelve a READY."""
+        p = self.processes.get(pid)
+        if p is None or p.state not in ('READY', 'RUNNING') or units <= 0:
+            return False
+        p.state = 'BLOCKED'
+        self._schedule_event(self._time + units, 'WAKEUP', pid, self._new_wait(p))
+        return True
+
+    def _submit_disk(self, process: SimProcess, cylinder: int):
+        """Envía al disco la petición de un proceso ya bloqueado; si el disco estaba ocioso, programa su fin."""
+        token = self._new_wait(process)
+        done = self.disk.submit(process.pid, cylinder, self._time, token)
+        if done is not None:
+            self._schedule_event(done, 'DISK', process.pid, token)
+
+    def disk_request(self, pid: str, cylinder: int) -> bool:
+        """Bloquea un proceso hasta que el disco atienda su petición al cilindro `cylinder`."""
+        p = self.processes.get(pid)
+        if p is None or p.state not in ('READY', 'RUNNING') or not 0 <= cylinder < self.disk.cylinders:
+            return False
+        p.state = 'BLOCKED'
+        self._submit_disk(p, cylinder)
+        return True
+
+    def create_process(self, pid: str, cpu_units: int, mem_req: int, memory_manager,
+                       priority: int = 0, arrival_time: Optional[int] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Crea un nuevo proceso, asignándole memoria si es necesario.
+        
+        `arrival_time` es el instante simulado de llegada (por defecto, el instante actual). Un proceso
+        con llegada futura queda en estado NEW hasta que el reloj la alcance.
+        """
+        if pid in self.processes:
+            return False, 'DUPLICATE_PID'
 
-    def create_process(self, pid: str, cpu_units: int, mem_req: int, memory_manager) -> Tuple[bool, Optional[str]]:
-        """Crea un nuevo proceso, asignándole memoria si es necesario."""
         # Intenta asignar memoria antes de crear el proceso.
         addr = None
         if mem_req > 0:
@@ -40,22 +213,66 @@ class Scheduler:
             if addr is None:
                 return False, 'NO_MEMORY'
         
-        p = SimProcess(pid=pid, cpu_units=cpu_units, mem_req=mem_req, state='READY', addr=addr)
-        self.processes.append(p)
+        if arrival_time is None or arrival_time < self._time:
+            arrival_time = self._time
+        state = 'READY' if arrival_time <= self._time else 'NEW'
+        p = SimProcess(pid=pid, cpu_units=cpu_units, mem_req=mem_req, state=state, addr=addr,
+                       priority=priority, arrival_time=arrival_time)
+        self.processes.add(p)
+        if state == 'READY':
+            self._enqueue(p)
+        else:
+            self._schedule_event(arrival_time, 'ARRIVAL', pid, self._new_wait(p))
         return True, None
 
+    def load_program(self, pid: str, program: Program) -> bool:
+        """
+        Asigna un programa a un proceso que aún no ha empezado a ejecutarse.
+
+        La ráfaga del proceso pasa a ser el total de unidades `compute` del programa. Se rechaza
+        un programa que pida cilindros fuera del disco.
+        """
+        p = self.processes.get(pid)
+        if p is None or p.start_time is not None or p.state not in ('NEW', 'READY'):
+            return False
+        if program.max_arg(OP_DISK) >= self.disk.cylinders:
+            return False
+        p.program = program
+        p.pc = 0
+        p.op_left = 0
+        p.cpu_units = p.burst = program.compute_units()
+        return True
+
     def kill_process(self, pid: str, memory_manager) -> bool:
-        """Marca un proceso como FINISHED y libera su memoria."""
-        for p in self.processes:
-            if p.pid == pid:
-                p.state = 'FINISHED'
-                # Es crucial liberar la memoria para que otros procesos puedan usarla.
-                memory_manager.free_mem(pid)
-                return True
-        return False
-
-    def list_processes(self) -> List[dict]:
-        """Retorna una lista con el estado de todos los procesos."""
+        """Marca un proceso como FINISHED y libera su memoria y sus cerrojos."""
+        p = self.processes.get(pid)
+        if p is None:
+            return False
+        p.state = 'FINISHED'
+        p.killed = True
+        # Es crucial liberar la memoria para que otros procesos puedan usarla.
+        memory_manager.free_mem(pid)
+        self._release_locks(pid)
+        return True
+
+    def _release_locks(self, pid: str) -> List[SimProcess]:
+        """Libera los cerrojos de un proceso que terminó y pasa a READY a quienes los reciben."""
+        return self._wake(self.lock_manager.release_all(pid))
+
+    def _wake(self, processes: List[SimProcess]) -> List[SimProcess]:
+        """Pasa a READY, en una sola pasada, a los procesos que obtuvieron un recurso."""
+        for p in processes:
+            p.state = 'READY'
+            self._enqueue(p)
+        return processes
+
+    def archive_finished(self) -> int:
+        """Archiva los procesos FINISHED para que dejen de aparecer en la tabla viva."""
+        return self.processes.archive_finished()
+
+    def list_processes(self, state: Optional[str] = None) -> List[dict]:
+        """Retorna una lista con el estado de todos los procesos vivos (opcionalmente filtrados por estado)."""
+        processes = self.processes if state is None else self.processes.in_state(state)
         return [
             {
                 'pid': p.pid,
@@ -63,22 +280,113 @@ class Scheduler:
                 'state': p.state,
                 'mem_req': p.mem_req,
                 'addr': p.addr
-            } for p in self.processes
+            } for p in processes
         ]
 
+    def _requester(self, pid: str) -> Tuple[Optional[SimProcess], Optional[str]]:
+        """
+        Proceso que hace una petición que puede bloquearlo; retorna `(proceso, None)` o
+        `(None, mensaje de error)`. Como en `sleep_process` y `disk_request`, solo puede pedirla
+        un proceso READY o RUNNING: uno bloqueado ya espera por otra cosa.
+        """
+        process = self.processes.get(pid)
+        if not process:
+            return None, f"Error: Proceso '{pid}' no encontrado."
+        if process.state not in ('READY', 'RUNNING'):
+            return None, f"Error: Proceso '{pid}' no puede esperar otro recurso en estado {process.state}."
+        return process, None
+
     def lock(self, pid: str, resource_id: str) -> str:
         """Maneja una solicitud de un proceso para adquirir un cerrojo."""
-        process = next((p for p in self.processes if p.pid == pid), None)
-        if not process:
-            return f"Error: Proceso '{pid}' no encontrado."
+        process, error = self._requester(pid)
+        if error:
+            return error
 
         # Intenta adquirir el cerrojo a través del LockManager.
+        detected = len(self.lock_manager.deadlocks)
         if self.lock_manager.lock(pid, resource_id, process):
             return f"Proceso '{pid}' adquirió el cerrojo para '{resource_id}'."
         # Si no se puede adquirir, el proceso pasa a estado BLOCKED.
         else:
             process.state = 'BLOCKED'
-            return f"Proceso '{pid}' bloqueado esperando por '{resource_id}'."
+            message = f"Proceso '{pid}' bloqueado esperando por '{resource_id}'."
+            for d in self.lock_manager.deadlocks[detected:]:
+                message += (f" ¡Deadlock detectado! Ciclo: {' -> '.join(d['cycle'] + d['cycle'][:1])}"
+                            f" (víctima sugerida: {d['victim']}).")
+            return message
+
+    def _blocking_request(self, pid: str, request, what: str) -> str:
+        """Ejecuta una petición de sincronización que puede bloquear al proceso y la describe."""
+        process, error = self._requester(pid)
+        if error:
+            return error
+        if request(process):
+            return f"Proceso '{pid}' obtuvo {what}."
+        process.state = 'BLOCKED'
+        return f"Proceso '{pid}' bloqueado esperando {what}."
+
+    def _describe_woken(self, message: str, woken: List[SimProcess]) -> str:
+        """Pasa a READY a los despertados y añade su lista al mensaje."""
+        self._wake(woken)
+        if woken:
+            message += f" Desbloqueado(s): {', '.join(p.pid for p in woken)}."
+        return message
+
+    def sem_wait(self, pid: str, resource_id: str) -> str:
+        """Operación P de un proceso sobre un semáforo."""
+        return self._blocking_request(pid, lambda p: self.lock_manager.sem_wait(pid, resource_id, p),
+                                      f"una unidad del semáforo '{resource_id}'")
+
+    def sem_post(self, pid: str, resource_id: str) -> str:
+        """Operación V de un proceso sobre un semáforo."""
+        woken = self.lock_manager.sem_post(pid, resource_id)
+        return self._describe_woken(f"Proceso '{pid}' liberó una unidad del semáforo '{resource_id}'.",
+                                    [woken] if woken else [])
+
+    def read_lock(self, pid: str, resource_id: str) -> str:
+        """Un proceso pide un cerrojo de lectores-escritores en modo lectura."""
+        return self._blocking_request(pid, lambda p: self.lock_manager.read_lock(pid, resource_id, p),
+                                      f"'{resource_id}' en lectura")
+
+    def write_lock(self, pid: str, resource_id: str) -> str:
+        """Un proceso pide un cerrojo de lectores-escritores en modo escritura."""
+        return self._blocking_request(pid, lambda p: self.lock_manager.write_lock(pid, resource_id, p),
+                                      f"'{resource_id}' en escritura")
+
+    def rw_unlock(self, pid: str, resource_id: str) -> str:
+        """Un proceso libera un cerrojo de lectores-escritores."""
+        woken = self.lock_manager.rw_unlock(pid, resource_id)
+        if woken is None:
+            return f"Error: El proceso '{pid}' no posee el cerrojo '{resource_id}'."
+        return self._describe_woken(f"Proceso '{pid}' liberó '{resource_id}'.", woken)
+
+    def cond_wait(self, pid: str, resource_id: str, mutex_id: str) -> str:
+        """Un proceso espera en una condición, liberando el mutex que posee."""
+        process, error = self._requester(pid)
+        if error:
+            return error
+        ok, handed = self.lock_manager.cond_wait(pid, resource_id, mutex_id, process)
+        if not ok:
+            return f"Error: El proceso '{pid}' no posee el mutex '{mutex_id}' o la condición usa otro mutex."
+        process.state = 'BLOCKED'
+        return self._describe_woken(f"Proceso '{pid}' espera en '{resource_id}' (liberó '{mutex_id}').",
+                                    [handed] if handed else [])
+
+    def cond_signal(self, resource_id: str, broadcast: bool = False) -> str:
+        """Despierta a uno (o, con `broadcast`, a todos) los procesos de una condición."""
+        waiting = len(self.lock_manager.conditions.get(resource_id) or ())
+        woken = self.lock_manager.cond_signal(resource_id, broadcast)
+        signalled = waiting if broadcast else min(waiting, 1)
+        return self._describe_woken(f"Condición '{resource_id}': {signalled} proceso(s) señalados.", woken)
+
+    def resolve_deadlocks(self, memory_manager) -> List[str]:
+        """Termina la víctima de cada interbloqueo que siga activo. Retorna los PIDs terminados."""
+        killed = []
+        for d in self.lock_manager.active_deadlocks():
+            # Terminar una víctima anterior puede haber roto ya este ciclo.
+            if self.lock_manager.is_deadlocked(d) and self.kill_process(d['victim'], memory_manager):
+                killed.append(d['victim'])
+        return killed
 
     def unlock(self, pid: str, resource_id: str) -> str:
         """Maneja una solicitud de un proceso para liberar un cerrojo."""
@@ -87,7 +395,7 @@ class Scheduler:
         
         # Si al liberar el cerrojo otro proceso estaba esperando, se desbloquea.
         if unblocked_process:
-            unblocked_process.state = 'READY'
+            self._wake([unblocked_process])
             return f"Proceso '{pid}' liberó el cerrojo para '{resource_id}'. Proceso '{unblocked_process.pid}' ha sido desbloqueado."
         else:
             # Verifica si el cerrojo fue liberado correctamente aunque nadie esperara.
@@ -98,46 +406,253 @@ class Scheduler:
             else:
                  return f"Error: El proceso '{pid}' no posee el cerrojo para '{resource_id}'."
 
-    def run(self, verbose: bool = True, sleep_per_unit: float = 0.0):
-        """Ejecuta un ciclo de planificación Round-Robin sobre los procesos en estado READY."""
-        # La cola de listos solo contiene procesos que pueden ejecutarse.
-        ready_queue = deque([p for p in self.processes if p.state == 'READY'])
+    def run(self, verbose: bool = True, sleep_per_unit: float = 0.0, until_done: bool = False, fast: bool = False):
+        """
+        Ejecuta un ciclo de planificación sobre los procesos en estado READY.
+        
+        Un ciclo realiza tantos despachos como procesos READY había al empezar (con Round-Robin,
+        un quantum para cada uno). Con `until_done=True` se sigue despachando, y avanzando el reloj
+        hasta los eventos pendientes, hasta que no quede ningún proceso listo ni por llegar.
+        
+        Con `fast=True` se usa el motor de eventos discretos: cada porción de CPU se simula en un
+        solo paso que salta directamente al siguiente evento (fin de quantum, finalización,
+        llegada o desbloqueo). El timeline y el estado final son los mismos que los del ciclo
+        unidad a unidad; `sleep_per_unit` se ignora y `verbose` informa una línea por porción.
+        """
+        self._process_events()
+        dispatches = None if until_done else self.processes.count('READY')
 
-        if not ready_queue:
+        if not self.processes.count('READY') and not (until_done and self._events):
             if verbose:
                 print("[scheduler] No hay procesos listos para ejecutar.")
             return
 
-        temp_timeline = []
-        # El ciclo se ejecuta mientras haya procesos en la cola de listos.
-        while ready_queue:
-            process = ready_queue.popleft()
-            
+        # El ciclo se ejecuta mientras queden despachos y procesos en la cola de listos.
+        while dispatches is None or dispatches > 0:
+            process = self._next_ready()
+            if process is None:
+                # CPU ociosa: saltar hasta el siguiente evento si se ejecuta hasta el final.
+                if until_done and self._events:
+                    self._time = max(self._time, self._events[0][0])
+                    self._process_events()
+                    continue
+                break
+            if dispatches is not None:
+                dispatches -= 1
+
             process.state = 'RUNNING'
-            
-            # Ejecutar el proceso por la duración del quantum o hasta que termine.
-            for _ in range(self.quantum):
-                if process.state == 'FINISHED':
-                    break
-                process.run_one_unit()
-                self._time += 1
-                temp_timeline.append((self._time, process.pid))
-                if verbose:
-                    print(f"[t={self._time}] Ejecutando {process.pid} (restan {process.cpu_units})")
-                if sleep_per_unit:
-                    time.sleep(sleep_per_unit)
+            if process.start_time is None:
+                process.start_time = self._time
+            limit = self.policy.time_slice(process)
 
-            # Si el proceso no ha terminado, vuelve al estado READY.
-            if process.state != 'FINISHED':
-                process.state = 'READY'
+            # Ejecutar el proceso durante su porción de tiempo, hasta que termine o sea expulsado.
+            if fast:
+                used, preempted = self._run_slice_fast(process, limit, verbose)
             else:
+                used, preempted = self._run_slice(process, limit, verbose, sleep_per_unit)
+
+            # Un proceso que se bloqueó (cerrojo o E/S de su programa) sale de la CPU sin reencolarse.
+            if process.state == 'BLOCKED':
+                if verbose:
+                    print(f"[t={self._time}] Proceso {process.pid} se bloquea.")
+            # Si el proceso no ha terminado, vuelve al estado READY y a la cola de la política.
+            elif process.state != 'FINISHED':
+                self.policy.on_preempt(process, used, not preempted and limit is not None and used >= limit)
+                process.state = 'READY'
+                self._enqueue(process)
+            # Un proceso eliminado (p. ej. por falta de memoria) ya liberó sus recursos y no se
+            # cuenta como completado.
+            elif not process.killed:
+                process.finish_time = self._time
                 if verbose:
                     print(f"[t={self._time}] Proceso {process.pid} ha terminado.")
+                for p in self._release_locks(process.pid):
+                    if verbose:
+                        print(f"[t={self._time}] Proceso {p.pid} recibe un cerrojo liberado y pasa a READY.")
+
+            # Compactación incremental de memoria entre quantums, con presupuesto acotado.
+            if self.compact_units and hasattr(self.memory, 'compact_step'):
+                report = self.memory.compact_step(max_units=self.compact_units, max_blocks=None)
+                self.compacted_units += report['moved_units']
+                if verbose and report['moved_blocks']:
+                    print(f"[t={self._time}] Compactación: {report['moved_blocks']} bloque(s), "
+                          f"{report['moved_units']} unidades movidas (mayor hueco {report['largest_free']}).")
         
-        self.timeline.extend(temp_timeline)
         if verbose:
             print("[scheduler] Ciclo de planificación completado.")
 
-    def get_timeline(self):
-        """Retorna el timeline histórico de la ejecución."""
-        return list(self.timeline)
+    def _run_slice(self, process: SimProcess, limit: Optional[int], verbose: bool,
+                   sleep_per_unit: float) -> Tuple[int, bool]:
+        """
+        Ejecuta una porción de CPU unidad a unidad.
+        
+        Retorna:
+            Una tupla (unidades usadas, expulsado por un evento).
+        """
+        used = 0
+        while (limit is None or used < limit) and process.state != 'FINISHED':
+            if process.program is not None and not self._advance(process, verbose):
+                break
+            process.run_one_unit()
+            self._time += 1
+            self._busy += 1
+            if self.disk.current is not None:
+                self._io_overlap += 1
+            used += 1
+            self.timeline.add_slice(process.pid, self._time - 1, 1)
+            if verbose:
+                print(f"[t={self._time}] Ejecutando {process.pid} (restan {process.cpu_units})")
+            if sleep_per_unit:
+                time.sleep(sleep_per_unit)
+            woken = self._process_events()
+            if process.program is not None and not self._advance(process, verbose):
+                break
+            if woken and process.state != 'FINISHED' and self.policy.should_preempt(process, woken):
+                return used, True
+        return used, False
+
+    def _run_slice_fast(self, process: SimProcess, limit: Optional[int], verbose: bool) -> Tuple[int, bool]:
+        """
+        Ejecuta una porción de CPU saltando de evento en evento.
+        
+        El tramo que se simula de una vez termina en lo que ocurra primero: el fin del quantum,
+        la finalización del proceso o el siguiente evento temporizado. Solo en este último caso
+        se consulta a la política si debe expulsar al proceso.
+        
+        Retorna:
+            Una tupla (unidades usadas, expulsado por un evento).
+        """
+        used = 0
+        while (limit is None or used < limit) and process.state != 'FINISHED':
+            if process.program is not None:
+                # Con programa, el tramo no cruza el final de la instrucción `compute` en curso.
+                if not self._advance(process, verbose):
+                    break
+                step = process.op_left
+            # Un proceso sin unidades restantes consume una unidad para terminar, como en run_one_unit.
+            else:
+                step = process.cpu_units if process.cpu_units > 0 else 1
+            if limit is not None:
+                step = min(step, limit - used)
+            if self._events:
+                step = min(step, max(1, self._events[0][0] - self._time))
+            start = self._time
+            process.run_units(step)
+            self._time += step
+            self._busy += step
+            # El estado del disco no cambia dentro del tramo: su próximo fin es un evento que lo acota.
+            if self.disk.current is not None:
+                self._io_overlap += step
+            used += step
+            self.timeline.add_slice(process.pid, start, step)
+            if verbose:
+                print(f"[t={start + 1}..{self._time}] Ejecutando {process.pid} (restan {process.cpu_units})")
+            woken = self._process_events()
+            if process.program is not None and not self._advance(process, verbose):
+                break
+            if woken and process.state != 'FINISHED' and self.policy.should_preempt(process, woken):
+                return used, True
+        return used, False
+
+    def _advance(self, process: SimProcess, verbose: bool) -> bool:
+        """
+        Ejecuta las instrucciones sin coste de CPU del programa hasta llegar a un `compute`.
+
+        `lock` adquiere el cerrojo o bloquea al proceso (el cerrojo le llega después, al
+        liberarse); `unlock` despierta a quien lo reciba; `io n` bloquea al proceso `n`
+        unidades y `disk c` hasta que el disco atienda su petición al cilindro `c`; `alloc n` (re)asigna su bloque de memoria a `n` unidades y `free` lo libera.
+        Si `alloc` no encuentra memoria, el proceso se termina (como un OOM-kill). Al agotar
+        las instrucciones el proceso pasa a FINISHED.
+
+        Retorna:
+            True si el proceso puede seguir calculando; False si se bloqueó o terminó.
+        """
+        program = process.program
+        pid = process.pid
+        while process.op_left <= 0:
+            if process.pc >= len(program):
+                process.state = 'FINISHED'
+                return False
+            op, arg = program.decode(process.pc)
+            process.pc += 1
+            if op == OP_COMPUTE:
+                process.op_left = arg
+            elif op == OP_LOCK:
+                if not self.lock_manager.lock(pid, arg, process):
+                    process.state = 'BLOCKED'
+                    if verbose:
+                        print(f"[t={self._time}] {pid} espera el cerrojo '{arg}'.")
+                    return False
+            elif op == OP_UNLOCK:
+                woken = self.lock_manager.unlock(pid, arg)
+                if woken is not None:
+                    self._wake([woken])
+            elif op == OP_IO:
+                process.state = 'BLOCKED'
+                self._schedule_event(self._time + max(arg, 1), 'WAKEUP', pid, self._new_wait(process))
+                if verbose:
+                    print(f"[t={self._time}] {pid} inicia E/S de {arg} unidades.")
+                return False
+            elif op == OP_DISK:
+                process.state = 'BLOCKED'
+                self._submit_disk(process, arg)
+                if verbose:
+                    print(f"[t={self._time}] {pid} pide el cilindro {arg} al disco.")
+                return False
+            elif op in (OP_ALLOC, OP_FREE) and self.memory is not None:
+                self.memory.free_mem(pid)
+                process.addr = None
+                process.mem_req = 0
+                if op == OP_ALLOC:
+                    addr = self.memory.alloc(pid, arg)
+                    if addr is None:
+                        if verbose:
+                            print(f"[t={self._time}] {pid} sin memoria para {arg} unidades: se termina.")
+                        self.kill_process(pid, self.memory)
+                        return False
+                    process.addr = addr
+                    process.mem_req = arg
+        return True
+
+    def stats(self) -> dict:
+        """
+        Calcula métricas de rendimiento sobre los procesos que terminaron normalmente.
+        
+        Retorna un diccionario con el número de procesos completados, los tiempos medios de
+        retorno (turnaround), espera y respuesta, el throughput (procesos por unidad de tiempo)
+        y la utilización de la CPU. Los procesos terminados con `kill` no cuentan. Del disco se
+        incluyen su utilización, la latencia media de sus peticiones y la fracción del tiempo en
+        que la CPU y el disco trabajaron a la vez (solapamiento de CPU y E/S).
+        """
+        done = [p for p in self.processes.in_state('FINISHED') if p.finish_time is not None]
+        done.extend(p for p in self.processes.archived.values() if p.finish_time is not None)
+        n = len(done)
+        turnaround = sum(p.finish_time - p.arrival_time for p in done)
+        waiting = sum(p.finish_time - p.arrival_time - p.burst for p in done)
+        response = sum(p.start_time - p.arrival_time for p in done)
+        disk = self.disk.stats(self._time)
+        return {
+            'policy': self.policy.name,
+            'completed': n,
+            'time': self._time,
+            'avg_turnaround': turnaround / n if n else 0.0,
+            'avg_waiting': waiting / n if n else 0.0,
+            'avg_response': response / n if n else 0.0,
+            'throughput': n / self._time if self._time else 0.0,
+            'cpu_utilization': self._busy / self._time if self._time else 0.0,
+            'disk_requests': disk['completed'],
+            'disk_utilization': disk['utilization'],
+            'avg_disk_latency': disk['avg_latency'],
+            'io_overlap': self._io_overlap / self._time if self._time else 0.0,
+        }
+
+    def get_timeline(self, start: Optional[int] = None, end: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """
+        Retorna los tramos `(pid, inicio, duración)` ejecutados en `[start, end)`.
+        
+        Sin argumentos retorna todo el historial. Para recorridos largos, conviene iterar
+        `self.timeline` directamente, ya que no copia nada.
+        """
+        if start is None and end is None:
+            return list(self.timeline.slices())
+        return list(self.timeline.between(start or 0, self._time if end is None else end))
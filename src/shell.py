@@ -1,7 +1,14 @@
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional
 from scheduler import Scheduler
 from memory import MemoryManager
 from filesystem import FileSystem
+from paging import PagedMemoryManager
+from program import Program, OP_DISK
+from array import array
 from rich.console import Console
+from rich.markup import render as render_markup
 from rich.text import Text
 from rich.table import Table
 from rich.panel import Panel
@@ -56,10 +63,21 @@ def help_text():
     table_proc = Table(title="Procesos y Planificador", show_header=True, header_style="bold cyan")
     table_proc.add_column("Comando", style="bold green")
     table_proc.add_column("Descripción", style="white")
-    table_proc.add_row("newproc <pid> <cpu> <mem>", "Crea un nuevo proceso")
-    table_proc.add_row("ps", "Lista los procesos y su estado")
+    table_proc.add_row("newproc <pid> <cpu> <mem> [prio] [llegada]", "Crea un nuevo proceso")
+    table_proc.add_row("ps [estado]", "Lista los procesos y su estado")
     table_proc.add_row("kill <pid>", "Termina un proceso")
-    table_proc.add_row("run", "Ejecuta el planificador Round-Robin")
+    table_proc.add_row("archive", "Archiva los procesos terminados")
+    table_proc.add_row("run [--all] [--fast]", "Ejecuta un ciclo del planificador (o hasta terminar todo); --fast salta de evento en evento")
+    table_proc.add_row("timeline [t] | [t1 t2]", "Muestra el timeline, quién ejecutaba en t o lo ejecutado en [t1, t2)")
+    table_proc.add_row("prog <pid> [op arg ...]", "Asigna (o muestra) el programa de un proceso: compute, lock, unlock, alloc, free, io, disk")
+    table_proc.add_row("sleep <pid> <unidades>", "Bloquea un proceso durante un tiempo simulado")
+    table_proc.add_row("disk <pid> <cilindro>", "Bloquea un proceso hasta que el disco atienda su petición")
+    table_proc.add_row("diskpolicy [nombre]", "Muestra o cambia la planificación del disco (fcfs, sstf, scan, clook)")
+    table_proc.add_row("diskstats", "Muestra desplazamiento, throughput y latencia de las peticiones al disco")
+    table_proc.add_row("policy [nombre] [opción=valor...]", "Muestra o cambia la política (rr, sjf, srtf, priority, mlfq)")
+    table_proc.add_row("affinity <pid> <núcleo|none>", "Fija un proceso a un núcleo (modo multinúcleo, --cores)")
+    table_proc.add_row("corestats", "Muestra utilización, migraciones, robos y throughput por núcleo")
+    table_proc.add_row("schedstats", "Muestra métricas de retorno, espera, respuesta y throughput")
     panels.append(Panel.fit(table_proc, border_style="cyan"))
 
     # --- Sincronización ---
@@ -68,6 +86,15 @@ def help_text():
     table_sync.add_column("Descripción", style="white")
     table_sync.add_row("lock <pid> <res>", "Un proceso adquiere un cerrojo (mutex)")
     table_sync.add_row("unlock <pid> <res>", "Un proceso libera un cerrojo")
+    table_sync.add_row("sem <id> <valor>", "Crea un semáforo contador (o cambia su valor)")
+    table_sync.add_row("semwait <pid> <sem> / sempost <pid> <sem>", "Operaciones P y V sobre un semáforo")
+    table_sync.add_row("rlock <pid> <res> / wlock <pid> <res>", "Adquiere un cerrojo de lectores-escritores en lectura o escritura")
+    table_sync.add_row("rwunlock <pid> <res>", "Libera un cerrojo de lectores-escritores")
+    table_sync.add_row("rwfair <res> <reader|writer|fifo>", "Cambia la política de equidad de un cerrojo de lectores-escritores")
+    table_sync.add_row("cwait <pid> <cond> <mutex>", "Espera en una condición liberando el mutex")
+    table_sync.add_row("csignal <cond> / cbroadcast <cond>", "Despierta a uno o a todos los procesos de una condición")
+    table_sync.add_row("syncstats", "Muestra adquisiciones, esperas y colas por recurso")
+    table_sync.add_row("deadlocks [resolve | victim <política>]", "Muestra los interbloqueos, los resuelve o cambia la política de víctima")
     panels.append(Panel.fit(table_sync, border_style="cyan"))
 
     # --- Memoria ---
@@ -78,6 +105,12 @@ def help_text():
     table_mem.add_row("free <pid>", "Libera la memoria de un proceso")
     table_mem.add_row("memmap", "Muestra el mapa de memoria actual")
     table_mem.add_row("defrag", "Compacta la memoria para unir bloques libres")
+    table_mem.add_row("compact [unidades] [bloques]", "Compacta de forma incremental con coste acotado")
+    table_mem.add_row("frag", "Muestra la fragmentación interna y externa")
+    table_mem.add_row("memstats", "Muestra la telemetría del asignador (contadores vivos)")
+    table_mem.add_row("trace <pid> <vaddr...>", "Añade accesos a la traza de memoria de un proceso")
+    table_mem.add_row("vmrun [ráfaga]", "Ejecuta las trazas en la memoria paginada (modo paged)")
+    table_mem.add_row("vmstats", "Muestra aciertos de TLB, fallos de página y EAT (modo paged)")
     panels.append(Panel.fit(table_mem, border_style="cyan"))
 
     # --- Sistema de Archivos ---
@@ -89,6 +122,16 @@ def help_text():
     table_fs.add_row("touch <filename>", "Crea un nuevo archivo vacío")
     table_fs.add_row("write <file> <content>", "Escribe contenido en un archivo")
     table_fs.add_row("cat <file>", "Muestra el contenido de un archivo")
+    table_fs.add_row("append <file> <content>", "Anexa contenido al final de un archivo")
+    table_fs.add_row("pwrite <file> <offset> <content>", "Escribe contenido desde un byte del archivo")
+    table_fs.add_row("read <file> <offset> [length]", "Muestra un rango de bytes de un archivo")
+    table_fs.add_row("find [ruta] [-name patrón] [-type f|d]", "Busca por nombre o patrón con el índice de nombres")
+    table_fs.add_row("du [ruta]", "Muestra los bytes de un directorio y de cada hijo")
+    table_fs.add_row("grep <patrón> [ruta]", "Busca una expresión regular en los archivos de una ruta")
+    table_fs.add_row("df", "Muestra los bloques del disco y la deduplicación de contenido")
+    table_fs.add_row("fscache", "Muestra la caché de rutas, el almacén y el índice de nombres")
+    table_fs.add_row("bcache", "Muestra la caché de buffers: aciertos, expulsiones y escrituras diferidas")
+    table_fs.add_row("fssync", "Compacta el diario del FS en una instantánea nueva")
     panels.append(Panel.fit(table_fs, border_style="cyan"))
 
     # --- Generales ---
@@ -103,185 +146,968 @@ def help_text():
     return panels
 
 # ===============================
-# SHELL PRINCIPAL (REPL)
+# SALIDA DE LOS COMANDOS
 # ===============================
-def run_shell(scheduler: Scheduler, memory: MemoryManager, fs: FileSystem):
-    """El bucle principal de lectura, evaluación e impresión (REPL) del shell."""
-    print_horizontal_gradient(ascii_art)
-    console.print("[bold cyan]>>> Escribe 'help' para conocer los comandos...[/bold cyan]\n")
+class RichOutput:
+    """Salida con rich: tablas, paneles y colores (modo interactivo)."""
+    def __init__(self, console: Console):
+        self.console = console
 
-    while True:
-        try:
-            line = input('> ').strip()
-        except (EOFError, KeyboardInterrupt):
-            console.print("\n[red]Saliendo...[/red]")
-            fs.save_state() # Guardar estado del FS antes de salir.
-            break
+    def say(self, message, markup: bool = True):
+        """Muestra un mensaje (texto con marcas de rich, o una tabla, panel o `Text`)."""
+        self.console.print(message, markup=markup)
 
-        if not line:
-            continue
+    def error(self, message, markup: bool = True):
+        """Muestra un error o un mensaje de uso."""
+        self.console.print(message, markup=markup)
+
+class PlainOutput:
+    """
+    Salida en texto plano, sin renderizar con rich: las marcas de color se eliminan y las tablas
+    se escriben como líneas separadas por tabuladores (título, cabecera y filas).
+    """
+    def __init__(self, stream=None, error_stream=None):
+        self.stream = stream or sys.stdout
+        self.error_stream = error_stream or self.stream
+
+    @staticmethod
+    def _plain(message, markup: bool) -> str:
+        """Texto plano de un mensaje."""
+        if isinstance(message, Panel):
+            message = message.renderable
+        if isinstance(message, Table):
+            lines = [str(message.title)] if message.title else []
+            lines.append("\t".join(str(column.header) for column in message.columns))
+            cells = [[str(getattr(cell, 'plain', cell)) for cell in column.cells] for column in message.columns]
+            lines.extend("\t".join(row) for row in zip(*cells))
+            return "\n".join(lines)
+        if isinstance(message, Text):
+            return message.plain
+        if isinstance(message, str) and markup and '[' in message:
+            return render_markup(message).plain
+        return str(message)
+
+    def say(self, message, markup: bool = True):
+        self.stream.write(self._plain(message, markup) + "\n")
+
+    def error(self, message, markup: bool = True):
+        self.error_stream.write(self._plain(message, markup) + "\n")
+
+class QuietOutput(PlainOutput):
+    """Salida silenciosa: solo se escriben los errores, en texto plano y por la salida de errores."""
+    def __init__(self, error_stream=None):
+        super().__init__(error_stream=error_stream or sys.stderr)
+
+    def say(self, message, markup: bool = True):
+        pass
+
+# Rango de las direcciones de una traza de memoria (se guardan en un array('q') de 64 bits con signo).
+_TRACE_MIN, _TRACE_MAX = -(1 << 63), (1 << 63) - 1
+
+# Modos de salida del shell por nombre.
+OUTPUT_MODES = ('rich', 'plain', 'quiet')
+
+def make_output(mode: str):
+    """Construye la salida del shell por nombre. Lanza ValueError si no existe."""
+    if mode == 'rich':
+        return RichOutput(console)
+    if mode == 'plain':
+        return PlainOutput()
+    if mode == 'quiet':
+        return QuietOutput()
+    raise ValueError(f"Modo de salida desconocido '{mode}'. Opciones: {', '.join(OUTPUT_MODES)}")
 
+# ===============================
+# INTÉRPRETE DE COMANDOS
+# ===============================
+# Tabla de despacho: nombre del comando -> método que lo atiende (ver `command`).
+COMMANDS: Dict[str, Callable[['Shell', str, List[str]], None]] = {}
+
+def command(*names: str):
+    """Registra un método de `Shell` en la tabla de despacho con uno o varios nombres."""
+    def register(handler):
+        for name in names:
+            COMMANDS[name] = handler
+        return handler
+    return register
+
+def _metrics_table(title: str, stats: dict) -> Table:
+    """Tabla Métrica/Valor de un diccionario de estadísticas (los reales con 3 decimales)."""
+    table = Table(title=title, header_style="bold cyan")
+    table.add_column("Métrica", style="bold green")
+    table.add_column("Valor", justify="right")
+    for key, value in stats.items():
+        table.add_row(key, f"{value:.3f}" if isinstance(value, float) else str(value))
+    return table
+
+class Shell:
+    """
+    Intérprete de comandos del simulador, compartido por el REPL y el modo por lotes.
+
+    Cada comando es un método registrado en `COMMANDS`, así que ejecutar una línea es partirla
+    y buscar su manejador en un diccionario. Los manejadores escriben a través de `out` y
+    marcan el comando como fallido con `fail` (uso incorrecto, argumentos no válidos o error
+    del sistema simulado).
+
+    Atributos:
+        scheduler (Scheduler): El planificador de procesos.
+        memory (MemoryManager): El gestor de memoria.
+        fs (FileSystem): El sistema de archivos.
+        out: Salida de los comandos (RichOutput, PlainOutput o QuietOutput).
+        verbose (bool): Si `run` y `demo` muestran cada paso de la planificación.
+        unit_delay (float): Pausa por unidad de tiempo en `run` sin `--fast` y en `demo`.
+        failed (bool): Si el último comando ejecutado falló.
+        running (bool): Pasa a False con `exit`.
+    """
+    def __init__(self, scheduler: Scheduler, memory: MemoryManager, fs: FileSystem, out=None,
+                 verbose: bool = True, unit_delay: float = 0.1):
+        """Inicializa el intérprete sobre los componentes del SO simulado."""
+        self.scheduler = scheduler
+        self.memory = memory
+        self.fs = fs
+        self.out = out or RichOutput(console)
+        self.verbose = verbose
+        self.unit_delay = unit_delay
+        self.failed = False
+        self.running = True
+
+    def say(self, message, markup: bool = True):
+        """Muestra la salida normal de un comando."""
+        self.out.say(message, markup)
+
+    def fail(self, message, markup: bool = True):
+        """Muestra un error o un mensaje de uso y marca el comando como fallido."""
+        self.failed = True
+        self.out.error(message, markup)
+
+    def report(self, message: str):
+        """
+        Muestra un mensaje de estado del sistema simulado (sin interpretar marcas: puede incluir
+        nombres); los que empiezan por 'Error' cuentan como fallo. Solo para mensajes que nunca
+        empiezan por datos del usuario: para contenidos y listados, ver `show`.
+        """
+        if message.startswith('Error'):
+            self.fail(message, markup=False)
+        else:
+            self.say(message, markup=False)
+
+    def show(self, text: Optional[str], error: Optional[str]):
+        """Muestra un resultado `(texto, error)` del sistema de archivos sin interpretar marcas."""
+        if error:
+            self.fail(error, markup=False)
+        else:
+            self.say(text, markup=False)
+
+    def execute(self, line: str) -> Optional[str]:
+        """
+        Ejecuta una línea de comando. Las líneas vacías y los comentarios (`#`) se ignoran.
+
+        Retorna:
+            El nombre del comando ejecutado (None si la línea no tenía ninguno); `failed` indica
+            si falló.
+        """
+        self.failed = False
         parts = line.split()
+        if not parts or parts[0].startswith('#'):
+            return None
         cmd = parts[0].lower()
-        args = parts[1:]
+        handler = COMMANDS.get(cmd)
+        if handler is None:
+            self.fail("[red]Comando no reconocido. Escribe 'help' para ver la lista.[/red]")
+        else:
+            handler(self, cmd, parts[1:])
+        return cmd
 
-        # --- Help ---
-        if cmd == 'help':
-            for panel in help_text():
-                console.print(panel)
+    # --- Help ---
+    @command('help')
+    def cmd_help(self, cmd: str, args: List[str]):
+        """Muestra los paneles de ayuda."""
+        for panel in help_text():
+            self.say(panel)
 
-        # --- Comandos de Proceso ---
-        elif cmd == 'newproc':
-            if len(args) < 3:
-                console.print("[yellow]Uso: newproc <pid> <cpu_units> <mem_req>[/yellow]")
-                continue
-            pid, cpu_s, mem_s = args[0], args[1], args[2]
+    # --- Comandos de Proceso ---
+    @command('newproc')
+    def cmd_newproc(self, cmd: str, args: List[str]):
+        """Crea un proceso."""
+        if len(args) < 3:
+            self.fail("[yellow]Uso: newproc <pid> <cpu_units> <mem_req> [prioridad] [llegada][/yellow]")
+            return
+        pid, cpu_s, mem_s = args[0], args[1], args[2]
+        try:
+            cpu = int(cpu_s); mem = int(mem_s)
+            prio = int(args[3]) if len(args) > 3 else 0
+            arrival = int(args[4]) if len(args) > 4 else None
+        except ValueError:
+            self.fail("[red]cpu_units, mem_req, prioridad y llegada deben ser enteros[/red]")
+            return
+        ok, err = self.scheduler.create_process(pid, cpu, mem, self.memory, priority=prio, arrival_time=arrival)
+        if not ok:
+            self.fail(f"[red]Error creando proceso: {err}[/red]")
+        else:
+            self.say(f"[green]Proceso {pid} creado (cpu={cpu}, mem={mem})[/green]")
+
+    @command('ps')
+    def cmd_ps(self, cmd: str, args: List[str]):
+        """Lista los procesos."""
+        rows = self.scheduler.list_processes(args[0].upper() if args else None)
+        if not rows:
+            self.say("[yellow]No hay procesos.[/yellow]")
+            return
+        table = Table(title="Procesos Activos", header_style="bold cyan")
+        table.add_column("PID", style="bold green")
+        table.add_column("CPU Units", justify="right")
+        table.add_column("State", style="bold yellow")
+        table.add_column("Mem Req", justify="right")
+        table.add_column("Addr", justify="right")
+        for r in rows:
+            table.add_row(str(r['pid']), str(r['cpu_units']), str(r['state']), str(r['mem_req']), str(r['addr']))
+        self.say(table)
+
+    @command('kill')
+    def cmd_kill(self, cmd: str, args: List[str]):
+        """Termina un proceso."""
+        if len(args) < 1:
+            self.fail("[yellow]Uso: kill <pid>[/yellow]")
+            return
+        if self.scheduler.kill_process(args[0], self.memory):
+            self.say("[green]Proceso terminado.[/green]")
+        else:
+            self.fail("[red]PID no encontrado.[/red]")
+
+    @command('archive')
+    def cmd_archive(self, cmd: str, args: List[str]):
+        """Archiva los procesos terminados."""
+        count = self.scheduler.archive_finished()
+        self.say(f"[green]{count} proceso(s) terminados archivados.[/green]")
+
+    # --- Comandos de Sincronización ---
+    @command('lock', 'unlock')
+    def cmd_lock(self, cmd: str, args: List[str]):
+        """Adquiere o libera un cerrojo."""
+        if len(args) < 2:
+            self.fail(f"[yellow]Uso: {cmd} <pid> <resource_id>[/yellow]")
+            return
+        action = self.scheduler.lock if cmd == 'lock' else self.scheduler.unlock
+        self.report(action(args[0], args[1]))
+
+    @command('sem')
+    def cmd_sem(self, cmd: str, args: List[str]):
+        """Crea un semáforo o cambia su valor."""
+        if len(args) < 2:
+            self.fail("[yellow]Uso: sem <id> <valor>[/yellow]")
+            return
+        try:
+            self.scheduler.lock_manager.create_semaphore(args[0], int(args[1]))
+        except ValueError as e:
+            self.fail(f"[red]Error: {e}[/red]")
+            return
+        self.say(f"[green]Semáforo '{args[0]}' con valor {args[1]}.[/green]")
+
+    @command('semwait', 'sempost', 'rlock', 'wlock', 'rwunlock')
+    def cmd_sync(self, cmd: str, args: List[str]):
+        """Operaciones sobre semáforos y cerrojos de lectores-escritores."""
+        if len(args) < 2:
+            self.fail(f"[yellow]Uso: {cmd} <pid> <resource_id>[/yellow]")
+            return
+        scheduler = self.scheduler
+        action = {'semwait': scheduler.sem_wait, 'sempost': scheduler.sem_post, 'rlock': scheduler.read_lock,
+                  'wlock': scheduler.write_lock, 'rwunlock': scheduler.rw_unlock}[cmd]
+        self.report(action(args[0], args[1]))
+
+    @command('rwfair')
+    def cmd_rwfair(self, cmd: str, args: List[str]):
+        """Cambia la equidad de un cerrojo de lectores-escritores."""
+        if len(args) < 2:
+            self.fail("[yellow]Uso: rwfair <resource_id> <reader|writer|fifo>[/yellow]")
+            return
+        try:
+            self.scheduler.lock_manager.get_rwlock(args[0], fairness=args[1])
+        except ValueError as e:
+            self.fail(f"[red]Error: {e}[/red]")
+            return
+        self.say(f"[green]Equidad de '{args[0]}' cambiada a {args[1]}.[/green]")
+
+    @command('cwait')
+    def cmd_cwait(self, cmd: str, args: List[str]):
+        """Espera en una variable de condición."""
+        if len(args) < 3:
+            self.fail("[yellow]Uso: cwait <pid> <cond> <mutex>[/yellow]")
+            return
+        self.report(self.scheduler.cond_wait(args[0], args[1], args[2]))
+
+    @command('csignal', 'cbroadcast')
+    def cmd_csignal(self, cmd: str, args: List[str]):
+        """Despierta a uno o a todos los procesos de una condición."""
+        if len(args) < 1:
+            self.fail(f"[yellow]Uso: {cmd} <cond>[/yellow]")
+            return
+        self.report(self.scheduler.cond_signal(args[0], broadcast=cmd == 'cbroadcast'))
+
+    @command('syncstats')
+    def cmd_syncstats(self, cmd: str, args: List[str]):
+        """Muestra la contención por recurso."""
+        rows = self.scheduler.lock_manager.resource_stats()
+        if not rows:
+            self.say("[yellow]No hay recursos de sincronización.[/yellow]")
+            return
+        table = Table(title="Contención por Recurso", header_style="bold cyan")
+        table.add_column("Recurso", style="bold green")
+        table.add_column("Tipo")
+        table.add_column("Adquisiciones", justify="right")
+        table.add_column("Esperas", justify="right")
+        table.add_column("Espera media", justify="right")
+        table.add_column("Espera máx.", justify="right")
+        table.add_column("Cola (máx.)", justify="right")
+        for r in rows:
+            table.add_row(r['resource'], r['kind'], str(r['acquisitions']), str(r['contentions']),
+                          f"{r['avg_wait']:.2f}", str(r['max_wait']), f"{r['queue']} ({r['max_queue']})")
+        self.say(table)
+
+    @command('deadlocks')
+    def cmd_deadlocks(self, cmd: str, args: List[str]):
+        """Muestra, resuelve o configura la detección de interbloqueos."""
+        locks = self.scheduler.lock_manager
+        if args and args[0] == 'victim':
+            try:
+                locks.set_victim_policy(args[1] if len(args) > 1 else '')
+            except ValueError as e:
+                self.fail(f"[red]Error: {e}[/red]")
+                return
+            self.say(f"[green]Política de víctima cambiada a {locks.victim_policy}.[/green]")
+            return
+        if args and args[0] == 'resolve':
+            killed = self.scheduler.resolve_deadlocks(self.memory)
+            self.say(f"[green]Víctimas terminadas: {', '.join(killed)}[/green]" if killed
+                     else "[yellow]No hay interbloqueos activos.[/yellow]")
+            return
+        active = locks.active_deadlocks()
+        if not active:
+            self.say(f"[green]No hay interbloqueos activos[/green] "
+                     f"({len(locks.deadlocks)} detectado(s) en total, víctima: {locks.victim_policy}).")
+            return
+        table = Table(title="Interbloqueos Activos", header_style="bold cyan")
+        table.add_column("Ciclo", style="bold yellow")
+        table.add_column("Recursos")
+        table.add_column("Víctima", style="bold red")
+        for d in active:
+            table.add_row(" -> ".join(d['cycle'] + d['cycle'][:1]), ", ".join(d['resources']), d['victim'])
+        self.say(table)
+
+    # --- Comandos de Memoria ---
+    @command('alloc')
+    def cmd_alloc(self, cmd: str, args: List[str]):
+        """Asigna memoria a un proceso."""
+        if len(args) < 2:
+            self.fail("[yellow]Uso: alloc <pid> <size>[/yellow]")
+            return
+        pid, sz_s = args[0], args[1]
+        try:
+            sz = int(sz_s)
+        except ValueError:
+            self.fail("[red]El tamaño debe ser un entero.[/red]")
+            return
+        addr = self.memory.alloc(pid, sz)
+        if addr is None:
+            self.fail("[red]Fallo en alloc: memoria insuficiente.[/red]")
+            return
+        p = self.scheduler.processes.get(pid)
+        if p is not None:
+            p.addr = addr
+            p.mem_req = sz
+        self.say(f"[green]Alloc OK: pid={pid} en addr={addr}[/green]")
+
+    @command('free')
+    def cmd_free(self, cmd: str, args: List[str]):
+        """Libera la memoria de un proceso."""
+        if len(args) < 1:
+            self.fail("[yellow]Uso: free <pid>[/yellow]")
+            return
+        pid = args[0]
+        if not self.memory.free_mem(pid):
+            self.fail("[red]Fallo en free: PID no encontrado o sin memoria asignada.[/red]")
+            return
+        p = self.scheduler.processes.get(pid)
+        if p is not None:
+            p.addr = None
+            p.mem_req = 0
+        self.say("[green]Free OK.[/green]")
+
+    @command('memmap')
+    def cmd_memmap(self, cmd: str, args: List[str]):
+        """Muestra el mapa de memoria."""
+        mm = self.memory.mem_map()
+        table = Table(title="Mapa de Memoria", header_style="bold cyan")
+        table.add_column("Total", justify="right")
+        table.add_column("Libre", justify="right")
+        table.add_column("Asignado", style="bold green")
+        table.add_row(str(mm['total']), str(mm['free']), str(mm['allocations']))
+        self.say(table)
+
+    @command('compact')
+    def cmd_compact(self, cmd: str, args: List[str]):
+        """Compacta la memoria de forma incremental."""
+        if not hasattr(self.memory, 'compact_step'):
+            self.fail("[red]El asignador activo no soporta compactación incremental.[/red]")
+            return
+        try:
+            units = int(args[0]) if args else None
+            blocks = int(args[1]) if len(args) > 1 else (None if units is not None else 1)
+        except ValueError:
+            self.fail("[red]Las unidades y los bloques deben ser enteros.[/red]")
+            return
+        report = self.memory.compact_step(self.scheduler.processes, max_units=units, max_blocks=blocks)
+        self.say(f"[green]Compactación: {report['moved_blocks']} bloque(s), {report['moved_units']} "
+                 f"unidades movidas. Mayor hueco: {report['largest_free']}.[/green]")
+
+    @command('memstats')
+    def cmd_memstats(self, cmd: str, args: List[str]):
+        """Muestra la telemetría del asignador."""
+        stats = self.memory.telemetry()
+        table = _metrics_table("Telemetría de Memoria", {key: stats[key] for key in (
+            'free_total', 'largest_free', 'external_fragmentation', 'allocs', 'failed_allocs', 'frees', 'moved_units')})
+        for label, count in stats['size_histogram'].items():
+            table.add_row(f"tamaño {label}", str(count))
+        for op, lat in stats['latency'].items():
+            table.add_row(f"latencia {op}", f"{lat['count']} ops, media {lat['avg_us']:.2f}µs, máx {lat['max_us']:.2f}µs")
+        self.say(table)
+
+    @command('frag')
+    def cmd_frag(self, cmd: str, args: List[str]):
+        """Muestra la fragmentación."""
+        self.say(_metrics_table("Fragmentación", self.memory.fragmentation()))
+
+    @command('trace')
+    def cmd_trace(self, cmd: str, args: List[str]):
+        """Añade accesos a la traza de memoria de un proceso."""
+        if len(args) < 2:
+            self.fail("[yellow]Uso: trace <pid> <vaddr> \\[vaddr...][/yellow]")
+            return
+        p = self.scheduler.processes.get(args[0])
+        if p is None:
+            self.fail("[red]PID no encontrado.[/red]")
+            return
+        try:
+            addrs = [int(a) for a in args[1:]]
+        except ValueError:
+            self.fail("[red]Las direcciones deben ser enteros.[/red]")
+            return
+        if not all(_TRACE_MIN <= a <= _TRACE_MAX for a in addrs):
+            self.fail(f"[red]Las direcciones deben estar entre {_TRACE_MIN} y {_TRACE_MAX}.[/red]")
+            return
+        if p.mem_trace is None:
+            p.mem_trace = array('q')
+        p.mem_trace.extend(addrs)
+        self.say(f"[green]Traza de {p.pid}: {len(p.mem_trace)} accesos.[/green]")
+
+    @command('vmrun', 'vmstats')
+    def cmd_vm(self, cmd: str, args: List[str]):
+        """Ejecuta las trazas de memoria o muestra las métricas de la memoria paginada."""
+        memory = self.memory
+        if not isinstance(memory, PagedMemoryManager):
+            self.fail("[red]Solo disponible con memoria paginada (--mem-mode paged).[/red]")
+            return
+        if cmd == 'vmrun':
             try:
-                cpu = int(cpu_s); mem = int(mem_s)
+                burst = int(args[0]) if args else 1
             except ValueError:
-                console.print("[red]cpu_units y mem_req deben ser enteros[/red]")
-                continue
-            ok, err = scheduler.create_process(pid, cpu, mem, memory)
-            if not ok:
-                console.print(f"[red]Error creando proceso: {err}[/red]")
-            else:
-                console.print(f"[green]Proceso {pid} creado (cpu={cpu}, mem={mem})[/green]")
+                burst = 0
+            if burst < 1:
+                self.fail("[yellow]Uso: vmrun \\[ráfaga] (entero mayor o igual que 1)[/yellow]")
+                return
+            traces = {p.pid: p.mem_trace for p in self.scheduler.processes if p.mem_trace}
+            count = memory.run_traces(traces, burst=burst)
+            self.say(f"[green]{count} accesos ejecutados.[/green]")
+        self.say(_metrics_table("Memoria Virtual", memory.stats()))
 
-        elif cmd == 'ps':
-            rows = scheduler.list_processes()
-            if not rows:
-                console.print("[yellow]No hay procesos.[/yellow]")
-            else:
-                table = Table(title="Procesos Activos", header_style="bold cyan")
-                table.add_column("PID", style="bold green")
-                table.add_column("CPU Units", justify="right")
-                table.add_column("State", style="bold yellow")
-                table.add_column("Mem Req", justify="right")
-                table.add_column("Addr", justify="right")
-                for r in rows:
-                    table.add_row(str(r['pid']), str(r['cpu_units']), str(r['state']), str(r['mem_req']), str(r['addr']))
-                console.print(table)
-
-        elif cmd == 'kill':
-            if len(args) < 1:
-                console.print("[yellow]Uso: kill <pid>[/yellow]")
-                continue
-            pid = args[0]
-            ok = scheduler.kill_process(pid, memory)
-            console.print("[green]Proceso terminado.[/green]" if ok else "[red]PID no encontrado.[/red]")
-
-        # --- Comandos de Sincronización ---
-        elif cmd == 'lock':
-            if len(args) < 2:
-                console.print("[yellow]Uso: lock <pid> <resource_id>[/yellow]")
-                continue
-            pid, resource_id = args[0], args[1]
-            console.print(scheduler.lock(pid, resource_id))
+    @command('defrag')
+    def cmd_defrag(self, cmd: str, args: List[str]):
+        """Compacta toda la memoria."""
+        self.memory.defrag(self.scheduler.processes)
+        self.say("[green]Memoria defragmentada.[/green]")
 
-        elif cmd == 'unlock':
-            if len(args) < 2:
-                console.print("[yellow]Uso: unlock <pid> <resource_id>[/yellow]")
-                continue
-            pid, resource_id = args[0], args[1]
-            console.print(scheduler.unlock(pid, resource_id))
+    # --- Comandos de Planificador y Demo ---
+    @command('run')
+    def cmd_run(self, cmd: str, args: List[str]):
+        """Ejecuta un ciclo del planificador (o hasta terminar todo)."""
+        scheduler = self.scheduler
+        fast = '--fast' in args
+        scheduler.run(verbose=self.verbose, sleep_per_unit=0.0 if fast else self.unit_delay,
+                      until_done='--all' in args, fast=fast)
+        timelines = getattr(scheduler, 'timelines', [scheduler.timeline])
+        if len(timelines) == 1:
+            self.say(f"[cyan]Timeline:[/cyan] {scheduler.timeline.format()}")
+        else:
+            for i, tl in enumerate(timelines):
+                self.say(f"[cyan]CPU{i}:[/cyan] {tl.format()}")
 
-        # --- Comandos de Memoria ---
-        elif cmd == 'alloc':
-            if len(args) < 2:
-                console.print("[yellow]Uso: alloc <pid> <size>[/yellow]")
-                continue
-            pid, sz_s = args[0], args[1]
+    @command('timeline')
+    def cmd_timeline(self, cmd: str, args: List[str]):
+        """Muestra el timeline, quién ejecutaba en un instante o lo ejecutado en un intervalo."""
+        scheduler = self.scheduler
+        if len(args) == 1:
             try:
-                sz = int(sz_s)
+                t = int(args[0])
             except ValueError:
-                console.print("[red]El tamaño debe ser un entero.[/red]")
-                continue
-            addr = memory.alloc(pid, sz)
-            if addr is None:
-                console.print("[red]Fallo en alloc: memoria insuficiente.[/red]")
+                self.fail("[red]El instante debe ser un entero.[/red]")
+                return
+            self.say(f"[cyan]t={t}:[/cyan] {scheduler.timeline.pid_at(t) or '(CPU ociosa)'}")
+        elif len(args) >= 2:
+            try:
+                t1, t2 = int(args[0]), int(args[1])
+            except ValueError:
+                self.fail("[red]Los instantes deben ser enteros.[/red]")
+                return
+            rows = scheduler.get_timeline(t1, t2)
+            self.say(" ".join(f"{pid}[{s}-{s + n})" for pid, s, n in rows) or "(sin ejecución)", markup=False)
+        else:
+            tl = scheduler.timeline
+            self.say(f"[cyan]{tl.num_slices()} tramos, {len(tl)} unidades:[/cyan] {tl.format()}")
+
+    @command('prog')
+    def cmd_prog(self, cmd: str, args: List[str]):
+        """Asigna o muestra el programa de un proceso."""
+        scheduler = self.scheduler
+        if len(args) < 1:
+            self.fail("[yellow]Uso: prog <pid> \\[compute n | lock r | unlock r | alloc n | free | io n | disk c ...][/yellow]")
+            return
+        p = scheduler.processes.get(args[0])
+        if p is None:
+            self.fail("[red]PID no encontrado.[/red]")
+            return
+        if len(args) == 1:
+            if p.program is None:
+                self.say(f"[yellow]{p.pid} no tiene programa.[/yellow]")
             else:
-                for p in scheduler.processes:
-                    if p.pid == pid:
-                        p.addr = addr
-                        p.mem_req = sz
-                console.print(f"[green]Alloc OK: pid={pid} en addr={addr}[/green]")
-
-        elif cmd == 'free':
-            if len(args) < 1:
-                console.print("[yellow]Uso: free <pid>[/yellow]")
-                continue
-            pid = args[0]
-            ok = memory.free_mem(pid)
-            if ok:
-                for p in scheduler.processes:
-                    if p.pid == pid:
-                        p.addr = None
-                        p.mem_req = 0
-                console.print("[green]Free OK.[/green]")
+                self.say(f"[cyan]{p.pid}[/cyan] (pc={p.pc}/{len(p.program)}): {p.program}")
+            return
+        try:
+            program = Program.parse(args[1:])
+        except ValueError as e:
+            self.fail(f"[red]Error: {e}[/red]")
+            return
+        if program.max_arg(OP_DISK) >= scheduler.disk.cylinders:
+            self.fail(f"[red]El disco solo tiene los cilindros 0-{scheduler.disk.cylinders - 1}.[/red]")
+            return
+        if scheduler.load_program(p.pid, program):
+            self.say(f"[green]Programa de {p.pid}: {len(program)} instrucciones, "
+                     f"{program.compute_units()} unidades de CPU.[/green]")
+        else:
+            self.fail("[red]Solo se puede asignar un programa a un proceso que aún no se ha ejecutado.[/red]")
+
+    @command('sleep')
+    def cmd_sleep(self, cmd: str, args: List[str]):
+        """Bloquea un proceso durante un tiempo simulado."""
+        if len(args) < 2:
+            self.fail("[yellow]Uso: sleep <pid> <unidades>[/yellow]")
+            return
+        try:
+            units = int(args[1])
+        except ValueError:
+            self.fail("[red]Las unidades deben ser un entero.[/red]")
+            return
+        if self.scheduler.sleep_process(args[0], units):
+            self.say(f"[green]Proceso {args[0]} bloqueado durante {units} unidades.[/green]")
+        else:
+            self.fail("[red]PID no encontrado, proceso no ejecutable o unidades no válidas.[/red]")
+
+    @command('disk')
+    def cmd_disk(self, cmd: str, args: List[str]):
+        """Envía una petición al disco en nombre de un proceso."""
+        if len(args) < 2:
+            self.fail("[yellow]Uso: disk <pid> <cilindro>[/yellow]")
+            return
+        try:
+            cylinder = int(args[1])
+        except ValueError:
+            self.fail("[red]El cilindro debe ser un entero.[/red]")
+            return
+        scheduler = self.scheduler
+        if scheduler.disk_request(args[0], cylinder):
+            self.say(f"[green]Proceso {args[0]} bloqueado en espera del cilindro {cylinder}.[/green]")
+        else:
+            self.fail(f"[red]PID no encontrado, proceso no ejecutable o cilindro fuera de 0-{scheduler.disk.cylinders - 1}.[/red]")
+
+    @command('diskpolicy')
+    def cmd_diskpolicy(self, cmd: str, args: List[str]):
+        """Muestra o cambia la planificación del disco."""
+        disk = self.scheduler.disk
+        if not args:
+            self.say(f"[cyan]Planificación del disco:[/cyan] {disk.policy.name}")
+            return
+        try:
+            disk.set_policy(args[0].lower())
+        except ValueError as e:
+            self.fail(f"[red]Error: {e}[/red]")
+            return
+        self.say(f"[green]Planificación del disco cambiada a {disk.policy.name}.[/green]")
+
+    @command('diskstats')
+    def cmd_diskstats(self, cmd: str, args: List[str]):
+        """Muestra las métricas del disco y sus últimas peticiones."""
+        disk = self.scheduler.disk
+        self.say(_metrics_table("Métricas del Disco", disk.stats(self.scheduler.now)))
+        if disk.recent:
+            table = Table(title="Últimas Peticiones", header_style="bold cyan")
+            for column in ("PID", "Cilindro", "Emitida", "Inicio", "Fin", "Desplazamiento", "Espera", "Latencia"):
+                table.add_column(column, justify="right")
+            for r in disk.recent:
+                table.add_row(r.pid, str(r.cylinder), str(r.issued), str(r.started), str(r.finished),
+                              str(r.seek), str(r.wait), str(r.latency))
+            self.say(table)
+
+    @command('policy')
+    def cmd_policy(self, cmd: str, args: List[str]):
+        """Muestra o cambia la política de planificación."""
+        scheduler = self.scheduler
+        if not args:
+            self.say(f"[cyan]Política actual:[/cyan] {scheduler.policy.name} (quantum={scheduler.quantum})")
+            return
+        options = {}
+        for arg in args[1:]:
+            key, _, value = arg.partition('=')
+            try:
+                options[key] = int(value)
+            except ValueError:
+                self.fail("[yellow]Uso: policy <nombre> \\[opción=entero ...][/yellow]")
+                return
+        try:
+            scheduler.set_policy(args[0], **options)
+        except ValueError as e:
+            self.fail(f"[red]Error: {e}[/red]")
+            return
+        self.say(f"[green]Política cambiada a {scheduler.policy.name}.[/green]")
+
+    @command('affinity')
+    def cmd_affinity(self, cmd: str, args: List[str]):
+        """Fija un proceso a un núcleo."""
+        scheduler = self.scheduler
+        if not hasattr(scheduler, 'set_affinity'):
+            self.fail("[yellow]La afinidad solo existe en modo multinúcleo (--cores N).[/yellow]")
+            return
+        if len(args) < 2:
+            self.fail("[yellow]Uso: affinity <pid> <núcleo|none>[/yellow]")
+            return
+        try:
+            core = None if args[1].lower() == 'none' else int(args[1])
+        except ValueError:
+            self.fail("[red]El núcleo debe ser un entero o 'none'.[/red]")
+            return
+        if scheduler.set_affinity(args[0], core):
+            self.say(f"[green]Afinidad de {args[0]}: {'ninguna' if core is None else f'CPU{core}'}.[/green]")
+        else:
+            self.fail("[red]PID no encontrado o núcleo fuera de rango.[/red]")
+
+    @command('corestats')
+    def cmd_corestats(self, cmd: str, args: List[str]):
+        """Muestra las métricas por núcleo."""
+        if not hasattr(self.scheduler, 'core_stats'):
+            self.fail("[yellow]Solo hay un núcleo; usa schedstats (o arranca con --cores N).[/yellow]")
+            return
+        table = Table(title="Métricas por Núcleo", header_style="bold cyan")
+        for column in ("CPU", "Ocupado", "Utilización", "Despachos", "Migraciones", "Robos", "Completados", "Throughput"):
+            table.add_column(column, justify="right")
+        for r in self.scheduler.core_stats():
+            table.add_row(f"CPU{r['core']}", str(r['busy']), f"{r['utilization']:.3f}", str(r['dispatches']),
+                          str(r['migrations']), str(r['steals']), str(r['completed']), f"{r['throughput']:.3f}")
+        self.say(table)
+
+    @command('schedstats')
+    def cmd_schedstats(self, cmd: str, args: List[str]):
+        """Muestra las métricas del planificador."""
+        self.say(_metrics_table("Métricas del Planificador", self.scheduler.stats()))
+
+    @command('demo')
+    def cmd_demo(self, cmd: str, args: List[str]):
+        """Ejecuta el escenario de demostración."""
+        scheduler, memory = self.scheduler, self.memory
+        self.say("[cyan]Creando escenario demo: P1(5U,30), P2(3U,50), P3(7U,20)[/cyan]")
+        scheduler.create_process('P1', 5, 30, memory)
+        scheduler.create_process('P2', 3, 50, memory)
+        scheduler.create_process('P3', 7, 20, memory)
+        self.say("[cyan]Mapa de memoria antes de ejecutar:[/cyan]")
+        self.say(memory.mem_map())
+        scheduler.run(verbose=self.verbose, sleep_per_unit=self.unit_delay)
+        self.say("[cyan]Mapa de memoria después de ejecutar:[/cyan]")
+        self.say(memory.mem_map())
+        self.say(f"[cyan]Timeline:[/cyan] {scheduler.timeline.format()}")
+
+    # --- Comandos de Sistema de Archivos ---
+    @command('mkdir')
+    def cmd_mkdir(self, cmd: str, args: List[str]):
+        """Crea un directorio."""
+        if len(args) < 1:
+            self.fail('[yellow]Uso: mkdir <dirname>[/yellow]')
+            return
+        self.report(self.fs.mkdir(args[0]))
+
+    @command('touch')
+    def cmd_touch(self, cmd: str, args: List[str]):
+        """Crea un archivo vacío."""
+        if len(args) < 1:
+            self.fail('[yellow]Uso: touch <filename>[/yellow]')
+            return
+        self.report(self.fs.touch(args[0]))
+
+    @command('ls')
+    def cmd_ls(self, cmd: str, args: List[str]):
+        """Lista el directorio actual."""
+        self.show(*self.fs.ls())
+
+    @command('write')
+    def cmd_write(self, cmd: str, args: List[str]):
+        """Escribe el contenido de un archivo."""
+        if len(args) < 2:
+            self.fail('[yellow]Uso: write <filename> <content>[/yellow]')
+            return
+        self.report(self.fs.write(args[0], " ".join(args[1:])))
+
+    @command('cat')
+    def cmd_cat(self, cmd: str, args: List[str]):
+        """Muestra el contenido de un archivo."""
+        if len(args) < 1:
+            self.fail('[yellow]Uso: cat <filename>[/yellow]')
+            return
+        self.show(*self.fs.cat(args[0]))
+
+    @command('append')
+    def cmd_append(self, cmd: str, args: List[str]):
+        """Anexa contenido a un archivo."""
+        if len(args) < 2:
+            self.fail('[yellow]Uso: append <filename> <content>[/yellow]')
+            return
+        self.report(self.fs.append(args[0], " ".join(args[1:])))
+
+    @command('pwrite')
+    def cmd_pwrite(self, cmd: str, args: List[str]):
+        """Escribe contenido desde un byte de un archivo."""
+        if len(args) < 3:
+            self.fail('[yellow]Uso: pwrite <filename> <offset> <content>[/yellow]')
+            return
+        try:
+            offset = int(args[1])
+        except ValueError:
+            self.fail("[red]El desplazamiento debe ser un entero[/red]")
+            return
+        self.report(self.fs.pwrite(args[0], offset, " ".join(args[2:])))
+
+    @command('read')
+    def cmd_read(self, cmd: str, args: List[str]):
+        """Muestra un rango de bytes de un archivo."""
+        if len(args) < 2:
+            self.fail('[yellow]Uso: read <filename> <offset> [length][/yellow]')
+            return
+        try:
+            offset = int(args[1])
+            length = int(args[2]) if len(args) > 2 else None
+        except ValueError:
+            self.fail("[red]El desplazamiento y la longitud deben ser enteros[/red]")
+            return
+        self.show(*self.fs.read(args[0], offset, length))
+
+    @command('find')
+    def cmd_find(self, cmd: str, args: List[str]):
+        """Busca nodos por nombre o patrón."""
+        path, pattern, node_type = None, None, None
+        i = 0
+        while i < len(args):
+            if args[i] == '-name' and i + 1 < len(args):
+                pattern = args[i + 1]
+                i += 2
+            elif args[i] == '-type' and i + 1 < len(args) and args[i + 1] in ('f', 'd'):
+                node_type = 'file' if args[i + 1] == 'f' else 'dir'
+                i += 2
+            elif path is None and not args[i].startswith('-'):
+                path = args[i]
+                i += 1
             else:
-                console.print("[red]Fallo en free: PID no encontrado o sin memoria asignada.[/red]")
-
-        elif cmd == 'memmap':
-            mm = memory.mem_map()
-            table = Table(title="Mapa de Memoria", header_style="bold cyan")
-            table.add_column("Total", justify="right")
-            table.add_column("Libre", justify="right")
-            table.add_column("Asignado", style="bold green")
-            table.add_row(str(mm['total']), str(mm['free']), str(mm['allocations']))
-            console.print(table)
-
-        elif cmd == 'defrag':
-            memory.defrag(scheduler.processes)
-            console.print("[green]Memoria defragmentada.[/green]")
-
-        # --- Comandos de Planificador y Demo ---
-        elif cmd == 'run':
-            scheduler.run(verbose=True, sleep_per_unit=0.1)
-            console.print(f"[cyan]Timeline:[/cyan] {scheduler.get_timeline()}")
-
-        elif cmd == 'demo':
-            console.print("[cyan]Creando escenario demo: P1(5U,30), P2(3U,50), P3(7U,20)[/cyan]")
-            scheduler.create_process('P1', 5, 30, memory)
-            scheduler.create_process('P2', 3, 50, memory)
-            scheduler.create_process('P3', 7, 20, memory)
-            console.print("[cyan]Mapa de memoria antes de ejecutar:[/cyan]")
-            console.print(memory.mem_map())
-            scheduler.run(verbose=True, sleep_per_unit=0.1)
-            console.print("[cyan]Mapa de memoria después de ejecutar:[/cyan]")
-            console.print(memory.mem_map())
-            console.print(f"[cyan]Timeline:[/cyan] {scheduler.get_timeline()}")
-
-        # --- Comandos de Sistema de Archivos ---
-        elif cmd == 'mkdir':
-            if len(args) < 1:
-                console.print('[yellow]Uso: mkdir <dirname>[/yellow]')
-                continue
-            console.print(fs.mkdir(args[0]))
-        elif cmd == 'touch':
-            if len(args) < 1:
-                console.print('[yellow]Uso: touch <filename>[/yellow]')
-                continue
-            console.print(fs.touch(args[0]))
-        elif cmd == 'ls':
-            console.print(fs.ls())
-        elif cmd == 'write':
-            if len(args) < 2:
-                console.print('[yellow]Uso: write <filename> <content>[/yellow]')
-                continue
-            filename = args[0]
-            content = " ".join(args[1:])
-            console.print(fs.write(filename, content))
-        elif cmd == 'cat':
-            if len(args) < 1:
-                console.print('[yellow]Uso: cat <filename>[/yellow]')
-                continue
-            console.print(fs.cat(args[0]))
+                break
+        if i < len(args):
+            self.fail('[yellow]Uso: find \\[ruta] [-name patrón] [-type f|d][/yellow]')
+            return
+        found, error = self.fs.find(path, pattern, node_type)
+        if error:
+            self.fail(error, markup=False)
+        elif not found:
+            self.say("[yellow]No se encontraron coincidencias.[/yellow]")
+        else:
+            for found_path in found:
+                self.say(Text(found_path))
+
+    @command('du')
+    def cmd_du(self, cmd: str, args: List[str]):
+        """Muestra los bytes de un directorio y de cada hijo."""
+        usage, error = self.fs.du(args[0] if args else None)
+        if error:
+            self.fail(error, markup=False)
+            return
+        table = Table(title="Uso de Disco", header_style="bold cyan")
+        table.add_column("Nombre", style="bold green")
+        table.add_column("Bytes", justify="right")
+        for name, size in usage.items():
+            table.add_row(Text(name), str(size))
+        self.say(table)
+
+    @command('grep')
+    def cmd_grep(self, cmd: str, args: List[str]):
+        """Busca una expresión regular en los archivos de una ruta."""
+        if len(args) < 1:
+            self.fail('[yellow]Uso: grep <patrón> \\[ruta][/yellow]')
+            return
+        matches, error = self.fs.grep(args[0], args[1] if len(args) > 1 else None)
+        if error:
+            self.fail(error, markup=False)
+            return
+        count = 0
+        for found_path, number, line in matches:
+            self.say(Text.assemble((found_path, "magenta"), f":{number}: ", line))
+            count += 1
+        if not count:
+            self.say("[yellow]No se encontraron coincidencias.[/yellow]")
+
+    @command('df')
+    def cmd_df(self, cmd: str, args: List[str]):
+        """Muestra los bloques del disco y la deduplicación."""
+        table = Table(title="Dispositivo de Bloques y Deduplicación", header_style="bold cyan")
+        table.add_column("Métrica", style="bold green")
+        table.add_column("Valor", justify="right")
+        for key, value in self.fs.df().items():
+            table.add_row(key, str(value))
+        self.say(table)
 
-        # --- Salida ---
-        elif cmd == 'exit':
-            console.print("[red]Saliendo...[/red]")
-            fs.save_state()
+    @command('fscache')
+    def cmd_fscache(self, cmd: str, args: List[str]):
+        """Muestra la caché de rutas, el almacén y el índice de nombres."""
+        fs = self.fs
+        self.say(_metrics_table("Caché de Rutas", fs.cache_stats()))
+        self.say(_metrics_table("Almacén del FS", fs.store.stats()))
+        self.say(_metrics_table("Índice de Nombres", fs.index.stats()))
+
+    @command('bcache')
+    def cmd_bcache(self, cmd: str, args: List[str]):
+        """Muestra la caché de buffers."""
+        self.say(_metrics_table("Caché de Buffers", self.fs.cache.stats()))
+
+    @command('fssync')
+    def cmd_fssync(self, cmd: str, args: List[str]):
+        """Compacta el diario del FS en una instantánea."""
+        fs = self.fs
+        records = fs.journal_records
+        fs.checkpoint()
+        self.say(f"[green]Instantánea guardada en '{fs.persistence_path}' ({records} registros del diario compactados).[/green]")
+
+    # --- Salida ---
+    @command('exit')
+    def cmd_exit(self, cmd: str, args: List[str]):
+        """Termina la sesión."""
+        self.running = False
+
+# ===============================
+# SHELL PRINCIPAL (REPL)
+# ===============================
+def run_shell(scheduler: Scheduler, memory: MemoryManager, fs: FileSystem):
+    """El bucle principal de lectura, evaluación e impresión (REPL) del shell."""
+    print_horizontal_gradient(ascii_art)
+    console.print("[bold cyan]>>> Escribe 'help' para conocer los comandos...[/bold cyan]\n")
+
+    shell = Shell(scheduler, memory, fs)
+    while shell.running:
+        try:
+            line = input('> ')
+        except (EOFError, KeyboardInterrupt):
+            console.print()
             break
+        shell.execute(line)
 
-        else:
-            console.print("[red]Comando no reconocido. Escribe 'help' para ver la lista.[/red]")
+    console.print("[red]Saliendo...[/red]")
+    fs.save_state() # Guardar estado del FS antes de salir.
+
+# ===============================
+# MODO POR LOTES (SCRIPTS)
+# ===============================
+class CommandTiming:
+    """
+    Tiempos de ejecución de un comando en un script.
+
+    Atributos:
+        calls (int): Veces que se ejecutó.
+        errors (int): Ejecuciones fallidas.
+        total_ns (int): Tiempo total, en nanosegundos.
+        max_ns (int): Ejecución más lenta, en nanosegundos.
+    """
+    __slots__ = ('calls', 'errors', 'total_ns', 'max_ns')
+
+    def __init__(self):
+        """Inicializa los contadores a cero."""
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+def run_script(scheduler: Scheduler, memory: MemoryManager, fs: FileSystem, lines: Iterable[str],
+               output: str = 'rich', stop_on_error: bool = False) -> dict:
+    """
+    Ejecuta una secuencia de comandos sin interacción (un archivo o la entrada estándar).
+
+    Cada línea pasa por la misma tabla de despacho que el REPL, pero sin pausas entre unidades
+    de tiempo y, en los modos `plain` y `quiet`, sin renderizar con rich (con `quiet` tampoco se
+    muestra cada paso de la planificación). Con `stop_on_error` la ejecución se detiene en el
+    primer comando que falla. Al terminar se guarda el estado del FS y se muestra un resumen de
+    tiempos por comando.
+
+    Retorna:
+        Un diccionario con los comandos ejecutados, los fallidos, la línea donde se detuvo
+        (None si llegó al final), el tiempo total en segundos y los tiempos por comando.
+    """
+    out = make_output(output)
+    shell = Shell(scheduler, memory, fs, out=out, verbose=output != 'quiet', unit_delay=0.0)
+    timings: Dict[str, CommandTiming] = {}
+    executed = failed = 0
+    stopped_at = None
+    clock = time.perf_counter_ns
+    start = clock()
+    for number, line in enumerate(lines, 1):
+        t0 = clock()
+        cmd = shell.execute(line)
+        elapsed = clock() - t0
+        if cmd is None:
+            continue
+        timing = timings.get(cmd)
+        if timing is None:
+            timing = timings[cmd] = CommandTiming()
+        timing.calls += 1
+        timing.total_ns += elapsed
+        if elapsed > timing.max_ns:
+            timing.max_ns = elapsed
+        executed += 1
+        if shell.failed:
+            timing.errors += 1
+            failed += 1
+            if stop_on_error:
+                stopped_at = number
+                out.error(f"[red]Ejecución detenida en la línea {number}: {line.strip()}[/red]")
+                break
+        if not shell.running:
+            break
+    fs.save_state()
+    elapsed = (clock() - start) / 1e9
+
+    table = Table(title="Resumen de Tiempos", header_style="bold cyan")
+    table.add_column("Comando", style="bold green")
+    for column in ("Llamadas", "Errores", "Total (ms)", "Media (µs)", "Máx. (µs)"):
+        table.add_column(column, justify="right")
+    for name, timing in sorted(timings.items(), key=lambda item: -item[1].total_ns):
+        table.add_row(name, str(timing.calls), str(timing.errors), f"{timing.total_ns / 1e6:.3f}",
+                      f"{timing.total_ns / timing.calls / 1e3:.1f}", f"{timing.max_ns / 1e3:.1f}")
+    # El resumen se muestra también en modo silencioso: es la salida que interesa al medir.
+    summary_out = RichOutput(console) if output == 'rich' else PlainOutput(error_stream=sys.stderr)
+    summary_out.say(table)
+    summary_out.say(f"{executed} comandos ({failed} fallidos) en {elapsed:.3f} s"
+                    f" ({executed / elapsed if elapsed else 0.0:.0f} comandos/s)", markup=False)
+    return {
+        'executed': executed,
+        'failed': failed,
+        'stopped_at': stopped_at,
+        'elapsed': elapsed,
+        'commands': {name: {'calls': t.calls, 'errors': t.errors, 'total_ns': t.total_ns, 'max_ns': t.max_ns}
+                     for name, t in timings.items()},
+    }
@@ -0,0 +1,210 @@
+"""
+Barrido de parámetros en paralelo para el Sistema Operativo Simulado.
+
+Ejecuta una misma carga de trabajo con cada combinación de una rejilla de configuraciones
+(quantum, tamaño de memoria, política, núcleos, asignador) y reúne los resultados en una tabla
+de retorno, espera, respuesta, utilización y fragmentación. Cada simulación es independiente y
+se reparte entre los núcleos reales con un `ProcessPoolExecutor`; no usa el shell, `rich` ni
+`sleep_per_unit`.
+
+El resultado es determinista: la carga aleatoria depende solo de la semilla, las simulaciones
+no usan el reloj real y las filas salen en el orden de la rejilla sea cual sea el número de
+trabajadores.
+
+Uso:
+    python sweep.py --quantum 1 2 4 8 --memory 64 128 256 --policy rr sjf --random 200 --seed 1
+    python sweep.py --workload carga.json --cores 1 2 4 --format csv
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+from allocators import create_memory_manager, MEMORY_MODES
+from multicore import MultiCoreScheduler
+from policies import POLICIES
+from program import Program
+from scheduler import Scheduler
+
+# Parámetros de la rejilla, en el orden en que varían (el último, el más rápido).
+GRID_KEYS = ('policy', 'cores', 'mem_mode', 'memory', 'quantum')
+
+# Columnas de resultados, en orden.
+RESULT_KEYS = GRID_KEYS + ('completed', 'rejected', 'time', 'avg_turnaround', 'avg_waiting', 'avg_response',
+                           'avg_admission_wait', 'throughput', 'cpu_utilization', 'avg_external_frag',
+                           'max_external_frag', 'failed_allocs')
+
+# Carga de trabajo compartida por las simulaciones de un mismo proceso trabajador.
+_workload: List[dict] = []
+
+def random_workload(count: int, seed: int = 0, max_cpu: int = 20, max_mem: int = 32, span: int = 100) -> List[dict]:
+    """
+    Genera una carga de trabajo reproducible de `count` procesos.
+
+    Cada proceso es un diccionario `{'pid', 'cpu', 'mem', 'priority', 'arrival'}` con ráfaga en
+    [1, max_cpu], memoria en [1, max_mem] y llegada en [0, span].
+    """
+    rnd = random.Random(seed)
+    return [{'pid': f'P{i}', 'cpu': rnd.randint(1, max_cpu), 'mem': rnd.randint(1, max_mem),
+             'priority': rnd.randint(0, 4), 'arrival': rnd.randint(0, span)} for i in range(count)]
+
+def load_workload(path: str) -> List[dict]:
+    """
+    Lee una carga de trabajo desde un archivo JSON: una lista de procesos con las claves `pid`,
+    `cpu` y `mem`, y opcionalmente `priority`, `arrival` y `program` (texto, ver program.py).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def build_grid(**values: Sequence) -> List[dict]:
+    """Producto cartesiano de los valores de cada parámetro, en el orden de GRID_KEYS."""
+    return [dict(zip(GRID_KEYS, combo)) for combo in itertools.product(*(values[k] for k in GRID_KEYS))]
+
+def _init_worker(workload: List[dict]):
+    """Inicializador de cada trabajador: recibe la carga una sola vez en lugar de con cada tarea."""
+    global _workload
+    _workload = workload
+
+def simulate(config: dict, workload: Optional[List[dict]] = None) -> dict:
+    """
+    Ejecuta una simulación completa con una configuración de la rejilla.
+
+    Las llegadas se admiten entre ciclos de planificación (un proceso que llega a mitad de un
+    ciclo entra al terminar este, y esa demora cuenta como espera de admisión). Si no hay
+    memoria para uno, espera en la cola de admisión y se reintenta tras cada ciclo, cuando los
+    procesos terminados ya liberaron la suya; cada reintento fallido cuenta en `failed_allocs`.
+    La fragmentación externa se muestrea al final de cada ciclo.
+
+    Retorna:
+        Un diccionario con las claves de RESULT_KEYS.
+    """
+    workload = _workload if workload is None else workload
+    if config['cores'] > 1:
+        sched = MultiCoreScheduler(cores=config['cores'], quantum=config['quantum'], policy=config['policy'])
+    else:
+        sched = Scheduler(quantum=config['quantum'], policy=config['policy'])
+    mm = create_memory_manager(config['mem_mode'], total_size=config['memory'])
+    sched.attach_memory(mm)
+
+    upcoming = deque(sorted(workload, key=lambda job: job.get('arrival', 0)))
+    backlog: deque = deque()
+    admission_wait = 0
+    frag_samples: List[float] = []
+
+    def admit(job: dict, arrival: int) -> bool:
+        """Crea el proceso de un trabajo; False si no hay memoria."""
+        nonlocal admission_wait
+        ok, err = sched.create_process(job['pid'], job['cpu'], job['mem'], mm,
+                                       priority=job.get('priority', 0), arrival_time=arrival)
+        if ok:
+            admission_wait += max(arrival - job.get('arrival', 0), 0)
+            if job.get('program'):
+                sched.load_program(job['pid'], Program.parse(job['program']))
+        return ok or err != 'NO_MEMORY'
+
+    while True:
+        now = sched.now
+        # Admisión: primero los que esperaban memoria, luego los que ya llegaron.
+        for _ in range(len(backlog)):
+            job = backlog.popleft()
+            if not admit(job, now):
+                backlog.append(job)
+        while upcoming and upcoming[0].get('arrival', 0) <= now:
+            job = upcoming.popleft()
+            if not admit(job, now):
+                backlog.append(job)
+
+        if sched.processes.count('READY'):
+            sched.run(verbose=False, fast=True)
+            # Los procesos terminados liberan su memoria y salen de la tabla viva.
+            for p in sched.processes.in_state('FINISHED'):
+                mm.free_mem(p.pid)
+            sched.archive_finished()
+            frag_samples.append(mm.fragmentation()['external'])
+        elif sched.advance_idle():
+            continue
+        elif upcoming:
+            # CPU ociosa sin eventos: el siguiente trabajo entra ya, con su llegada futura.
+            job = upcoming.popleft()
+            if not admit(job, job.get('arrival', 0)):
+                backlog.append(job)
+        else:
+            break
+
+    stats = sched.stats()
+    result = {key: config[key] for key in GRID_KEYS}
+    result.update({key: stats[key] for key in ('completed', 'time', 'avg_turnaround', 'avg_waiting',
+                                                'avg_response', 'throughput', 'cpu_utilization')})
+    result['rejected'] = len(backlog)
+    result['avg_admission_wait'] = admission_wait / stats['completed'] if stats['completed'] else 0.0
+    result['avg_external_frag'] = sum(frag_samples) / len(frag_samples) if frag_samples else 0.0
+    result['max_external_frag'] = max(frag_samples, default=0.0)
+    result['failed_allocs'] = mm.telemetry()['failed_allocs']
+    return {key: result[key] for key in RESULT_KEYS}
+
+def run_sweep(workload: List[dict], grid: List[dict], workers: Optional[int] = None) -> List[dict]:
+    """
+    Ejecuta todas las configuraciones de la rejilla y retorna sus resultados en el mismo orden.
+
+    Con `workers` None se usan todos los núcleos disponibles; con 1 se ejecuta en el proceso
+    actual, sin pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(grid) == 1:
+        return [simulate(config, workload) for config in grid]
+    with ProcessPoolExecutor(max_workers=min(workers, len(grid)), initializer=_init_worker,
+                             initargs=(workload,)) as pool:
+        return list(pool.map(simulate, grid, chunksize=max(1, len(grid) // (workers * 4))))
+
+def format_table(rows: List[dict]) -> str:
+    """Tabla de texto plano alineada con una fila por configuración."""
+    def cell(value) -> str:
+        return f"{value:.3f}" if isinstance(value, float) else str(value)
+    table = [list(RESULT_KEYS)] + [[cell(row[k]) for k in RESULT_KEYS] for row in rows]
+    widths = [max(len(r[i]) for r in table) for i in range(len(RESULT_KEYS))]
+    lines = ["  ".join(v.rjust(w) for v, w in zip(r, widths)) for r in table]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Lee la carga, la rejilla y el formato de salida desde la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Barrido de parámetros del Simulador de Sistema Operativo")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--workload', help="Archivo JSON con la carga de trabajo")
+    source.add_argument('--random', type=int, default=100, help="Procesos de una carga aleatoria (por defecto 100)")
+    parser.add_argument('--seed', type=int, default=0, help="Semilla de la carga aleatoria (por defecto 0)")
+    parser.add_argument('--quantum', type=int, nargs='+', default=[2], help="Valores de quantum")
+    parser.add_argument('--memory', type=int, nargs='+', default=[100], help="Tamaños de memoria")
+    parser.add_argument('--policy', nargs='+', choices=sorted(POLICIES), default=['rr'], help="Políticas")
+    parser.add_argument('--cores', type=int, nargs='+', default=[1], help="Números de núcleos")
+    parser.add_argument('--mem-mode', nargs='+', choices=MEMORY_MODES, default=['contiguous'], help="Asignadores")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos trabajadores (por defecto, todos los núcleos)")
+    parser.add_argument('--format', choices=('table', 'csv', 'json'), default='table', help="Formato de salida")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Ejecuta el barrido descrito en la línea de comandos e imprime los resultados."""
+    args = parse_args(argv)
+    workload = load_workload(args.workload) if args.workload else random_workload(args.random, args.seed)
+    grid = build_grid(policy=args.policy, cores=args.cores, mem_mode=args.mem_mode, memory=args.memory,
+                      quantum=args.quantum)
+    rows = run_sweep(workload, grid, args.workers)
+    if args.format == 'json':
+        json.dump(rows, sys.stdout, indent=2)
+        print()
+    elif args.format == 'csv':
+        writer = csv.DictWriter(sys.stdout, fieldnames=RESULT_KEYS, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        print(format_table(rows))
+
+if __name__ == '__main__':
+    main()
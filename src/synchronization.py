@@ -2,42 +2,315 @@
 Primitivas de Sincronización para el Sistema Operativo Simulado.
 
 Este archivo define las clases `Mutex` y `LockManager`, que proporcionan una funcionalidad
-de exclusión mutua básica para gestionar el acceso a recursos compartidos entre procesos.
+de exclusión mutua básica para gestionar el acceso a recursos compartidos entre procesos,
+junto con semáforos contadores (`Semaphore`), cerrojos de lectores-escritores (`RWLock`) y
+variables de condición (`Condition`). Todas comparten la cola de espera `WaitQueue` y llevan
+estadísticas de contención por recurso (`ResourceStats`).
+
+El `LockManager` detecta además los interbloqueos (deadlocks) sobre el grafo de espera
+(wait-for graph): un proceso que espera un recurso apunta al dueño de ese recurso. El grafo
+no se guarda aparte, sino que son los propios índices `waiting_on` y `locked_by`, que ya se
+actualizan en cada `lock`/`unlock`. Un ciclo nuevo solo puede pasar por la arista que se
+acaba de crear, así que basta con buscarlo desde ella. Solo los mutex (incluida la espera
+para recuperar el mutex tras una condición) forman parte del grafo: un semáforo o un cerrojo
+de lectura no tiene un único dueño al que apuntar.
 """
 
-from typing import Dict, Optional, Deque
+from itertools import count
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 from collections import deque
 from process import SimProcess
 
-class Mutex:
+# Políticas de selección de víctima para romper un interbloqueo.
+VICTIM_POLICIES = ('requester', 'youngest', 'fewest_locks', 'lowest_priority')
+
+# Políticas de equidad de los cerrojos de lectores-escritores.
+RW_FAIRNESS = ('reader', 'writer', 'fifo')
+
+# Turnos globales: permiten comparar la antigüedad de procesos en colas distintas.
+_tickets = count(1)
+
+class ResourceStats:
+    """
+    Estadísticas de contención de un recurso de sincronización.
+    
+    Atributos:
+        acquisitions (int): Veces que un proceso obtuvo el recurso (o fue despertado, en una condición).
+        contentions (int): Veces que un proceso tuvo que esperar.
+        total_wait (int): Tiempo simulado total pasado en la cola por los procesos atendidos.
+        max_wait (int): Mayor espera de un proceso atendido.
+        max_queue (int): Mayor longitud alcanzada por la cola de espera.
+    """
+    def __init__(self):
+        """Inicializa los contadores a cero."""
+        self.acquisitions = 0
+        self.contentions = 0
+        self.total_wait = 0
+        self.max_wait = 0
+        self.max_queue = 0
+
+    def waited(self, wait: int):
+        """Registra la espera de un proceso que sale de la cola."""
+        self.total_wait += wait
+        if wait > self.max_wait:
+            self.max_wait = wait
+
+    def as_dict(self) -> dict:
+        """Retorna los contadores como diccionario, con la espera media por contención."""
+        return {
+            'acquisitions': self.acquisitions,
+            'contentions': self.contentions,
+            'avg_wait': self.total_wait / self.contentions if self.contentions else 0.0,
+            'max_wait': self.max_wait,
+            'max_queue': self.max_queue,
+        }
+
+class WaitQueue:
+    """
+    Cola FIFO de procesos en espera, base de todas las primitivas de sincronización.
+    
+    La pertenencia a la cola se consulta en O(1) con el diccionario `waiting`. Sacar a un proceso
+    de la cola (porque terminó o fue eliminado) solo lo borra de `waiting`: su entrada en la
+    deque queda obsoleta y se descarta al llegar al frente.
+    
+    Atributos:
+        waiting_queue (Deque[Tuple[int, SimProcess]]): Cola FIFO de entradas `(turno, proceso)` en espera.
+        waiting (Dict[str, int]): PID -> turno de su entrada vigente en la cola.
+        stats (ResourceStats): Estadísticas de contención (pueden compartirse entre varias colas).
+    """
+    def __init__(self, stats: Optional[ResourceStats] = None):
+        """Inicializa una cola vacía."""
+        self.waiting_queue = deque()
+        self.waiting: Dict[str, int] = {}
+        self._since: Dict[str, int] = {}
+        self.stats = stats if stats is not None else ResourceStats()
+
+    def enqueue(self, process: SimProcess, now: int = 0) -> bool:
+        """Añade un proceso a la cola de espera. Retorna False si ya estaba esperando."""
+        if process.pid in self.waiting:
+            return False
+        ticket = next(_tickets)
+        self.waiting[process.pid] = ticket
+        self._since[process.pid] = now
+        self.waiting_queue.append((ticket, process))
+        self.stats.contentions += 1
+        if len(self.waiting) > self.stats.max_queue:
+            self.stats.max_queue = len(self.waiting)
+        # Si las entradas obsoletas superan a las vigentes, se reconstruye la cola.
+        if len(self.waiting_queue) > 2 * len(self.waiting) + 8:
+            self.waiting_queue = deque(e for e in self.waiting_queue if self.waiting.get(e[1].pid) == e[0])
+        return True
+
+    def peek_ticket(self) -> Optional[int]:
+        """Turno del primer proceso que sigue esperando (descarta entradas obsoletas), o None."""
+        while self.waiting_queue:
+            ticket, process = self.waiting_queue[0]
+            if self.waiting.get(process.pid) == ticket:
+                return ticket
+            self.waiting_queue.popleft()
+        return None
+
+    def dequeue(self, now: int = 0) -> Optional[SimProcess]:
+        """Extrae el primer proceso que sigue esperando, descartando las entradas obsoletas."""
+        if self.peek_ticket() is None:
+            return None
+        _, process = self.waiting_queue.popleft()
+        del self.waiting[process.pid]
+        self.stats.waited(now - self._since.pop(process.pid))
+        return process
+
+    def dequeue_all(self, now: int = 0) -> List[SimProcess]:
+        """Extrae de una vez a todos los procesos en espera, en orden de llegada."""
+        out = []
+        for ticket, process in self.waiting_queue:
+            if self.waiting.get(process.pid) == ticket:
+                out.append(process)
+                self.stats.waited(now - self._since.pop(process.pid))
+        self.waiting_queue.clear()
+        self.waiting.clear()
+        return out
+
+    def remove_waiter(self, pid: str) -> bool:
+        """Saca a un proceso de la cola de espera en O(1) (su entrada se descarta después)."""
+        self._since.pop(pid, None)
+        return self.waiting.pop(pid, None) is not None
+
+    def waiters(self) -> List[str]:
+        """PIDs en espera, en orden de llegada."""
+        return [p.pid for ticket, p in self.waiting_queue if self.waiting.get(p.pid) == ticket]
+
+    def __len__(self) -> int:
+        """Número de procesos en espera."""
+        return len(self.waiting)
+
+class Mutex(WaitQueue):
     """
     Representa un Mutex (Mutual Exclusion) o cerrojo simple.
     
     Un mutex puede ser adquirido por un solo proceso a la vez. Si otros procesos intentan
-    adquirirlo mientras está bloqueado, se encolan en una cola de espera.
+    adquirirlo mientras está bloqueado, se encolan en una cola de espera (ver WaitQueue).
     
     Atributos:
         resource_id (str): El identificador del recurso que este mutex protege.
         locked_by (Optional[str]): El PID del proceso que actualmente posee el cerrojo. None si está libre.
-        waiting_queue (Deque[SimProcess]): Una cola de procesos que están esperando para adquirir el cerrojo.
     """
+    kind = 'mutex'
+
     def __init__(self, resource_id: str):
         """Inicializa un Mutex para un recurso específico."""
+        super().__init__()
         self.resource_id = resource_id
         self.locked_by = None
-        self.waiting_queue = deque()
+
+class Semaphore(WaitQueue):
+    """
+    Semáforo contador.
+    
+    `wait` (P) decrementa el contador o bloquea si es cero; `post` (V) entrega una unidad al
+    primer proceso en espera o incrementa el contador. Se lleva la cuenta de las unidades que
+    tomó cada proceso para devolverlas si termina sin liberarlas.
+    
+    Atributos:
+        resource_id (str): El identificador del semáforo.
+        value (int): Unidades disponibles.
+        holders (Dict[str, int]): PID -> unidades que tiene tomadas.
+    """
+    kind = 'semaphore'
+
+    def __init__(self, resource_id: str, value: int = 1):
+        """Inicializa un semáforo con `value` unidades disponibles."""
+        super().__init__()
+        self.resource_id = resource_id
+        self.value = value
+        self.holders: Dict[str, int] = {}
+
+class RWLock:
+    """
+    Cerrojo de lectores-escritores.
+    
+    Varios lectores pueden tenerlo a la vez; un escritor lo tiene en exclusiva. La política de
+    equidad decide a quién se despierta al quedar libre:
+    
+    - reader: prioridad a los lectores (un lector entra si no hay escritor dentro, aunque haya
+      escritores esperando).
+    - writer: prioridad a los escritores (un lector espera si hay algún escritor en cola).
+    - fifo: orden de llegada; al liberarse se despierta al escritor más antiguo o, si llegó antes,
+      al grupo de lectores que le precede.
+    
+    Atributos:
+        resource_id (str): El identificador del recurso.
+        fairness (str): Política de equidad (ver RW_FAIRNESS).
+        readers (Set[str]): PIDs que lo tienen en lectura.
+        writer (Optional[str]): PID que lo tiene en escritura.
+        read_queue (WaitQueue): Lectores en espera.
+        write_queue (WaitQueue): Escritores en espera.
+        stats (ResourceStats): Estadísticas compartidas por ambas colas.
+    """
+    kind = 'rwlock'
+
+    def __init__(self, resource_id: str, fairness: str = 'fifo'):
+        """Inicializa un cerrojo de lectores-escritores libre."""
+        self.resource_id = resource_id
+        self.fairness = fairness
+        self.readers: Set[str] = set()
+        self.writer: Optional[str] = None
+        self.stats = ResourceStats()
+        self.read_queue = WaitQueue(self.stats)
+        self.write_queue = WaitQueue(self.stats)
+
+    def remove_waiter(self, pid: str) -> bool:
+        """Saca a un proceso de cualquiera de las dos colas."""
+        return self.read_queue.remove_waiter(pid) | self.write_queue.remove_waiter(pid)
+
+    def __len__(self) -> int:
+        """Número de procesos en espera (lectores y escritores)."""
+        return len(self.read_queue) + len(self.write_queue)
+
+class Condition(WaitQueue):
+    """
+    Variable de condición asociada a un mutex.
+    
+    `wait` libera el mutex y bloquea al proceso en la condición; `signal` y `broadcast` lo
+    devuelven a competir por el mutex, que debe volver a tener antes de continuar.
+    
+    Atributos:
+        resource_id (str): El identificador de la condición.
+        mutex_id (Optional[str]): El mutex con el que se usa la condición.
+    """
+    kind = 'condition'
+
+    def __init__(self, resource_id: str):
+        """Inicializa una condición sin procesos en espera."""
+        super().__init__()
+        self.resource_id = resource_id
+        self.mutex_id = None
 
 class LockManager:
     """
-    Gestiona todos los mutex del sistema.
+    Gestiona todos los mutex y demás primitivas de sincronización del sistema.
     
     Actúa como una factoría y un registro central para todos los cerrojos, 
     evitando la necesidad de instanciar mutex manualmente en otras partes del código.
+    
+    Atributos:
+        mutexes (Dict[str, Mutex]): Todos los mutex, por ID de recurso.
+        semaphores (Dict[str, Semaphore]): Semáforos, por ID.
+        rwlocks (Dict[str, RWLock]): Cerrojos de lectores-escritores, por ID.
+        conditions (Dict[str, Condition]): Variables de condición, por ID.
+        held (Dict[str, Set[str]]): PID -> recursos cuyo cerrojo posee.
+        waiting_on (Dict[str, Set[str]]): PID -> recursos por los que espera.
+        victim_policy (str): Criterio para elegir la víctima de un interbloqueo (ver VICTIM_POLICIES).
+        deadlocks (List[dict]): Interbloqueos detectados, en orden: `{'cycle', 'resources', 'victim'}`.
+        clock (Callable[[], int]): Reloj simulado con el que se miden los tiempos de espera.
     """
-    def __init__(self):
+    def __init__(self, victim_policy: str = 'requester', clock: Optional[Callable[[], int]] = None):
         """Inicializa el LockManager."""
         # Un diccionario para almacenar todos los mutex, usando el ID del recurso como clave.
         self.mutexes: Dict[str, Mutex] = {}
+        self.semaphores: Dict[str, Semaphore] = {}
+        self.rwlocks: Dict[str, RWLock] = {}
+        self.conditions: Dict[str, Condition] = {}
+        self.held: Dict[str, Set[str]] = {}
+        self.waiting_on: Dict[str, Set[str]] = {}
+        # Índices equivalentes para semáforos y cerrojos de lectores-escritores (por objeto).
+        self._held_other: Dict[str, Set[Union[Semaphore, RWLock]]] = {}
+        self._waiting_other: Dict[str, Set[Union[Semaphore, RWLock, Condition]]] = {}
+        self._procs: Dict[str, SimProcess] = {}
+        self.clock = clock or (lambda: 0)
+        self.victim_policy = 'requester'
+        self.set_victim_policy(victim_policy)
+        self.deadlocks: List[dict] = []
+
+    def set_victim_policy(self, name: str):
+        """Cambia el criterio de selección de víctima. Lanza ValueError si no existe."""
+        if name not in VICTIM_POLICIES:
+            raise ValueError(f"Política de víctima desconocida: '{name}' (opciones: {', '.join(VICTIM_POLICIES)})")
+        self.victim_policy = name
+
+    def _grant(self, mutex: Mutex, pid: str):
+        """Asigna el cerrojo a `pid` y lo anota en el índice de propietarios."""
+        mutex.locked_by = pid
+        mutex.stats.acquisitions += 1
+        self.held.setdefault(pid, set()).add(mutex.resource_id)
+
+    def _wait_mutex(self, mutex: Mutex, process: SimProcess):
+        """Encola a un proceso en un mutex y comprueba si la nueva espera cierra un ciclo."""
+        if mutex.enqueue(process, self.clock()):
+            self._procs[process.pid] = process
+            self.waiting_on.setdefault(process.pid, set()).add(mutex.resource_id)
+            self._check_deadlock(process.pid)
+
+    def _drop(self, index: Dict[str, Set[str]], pid: str, resource_id: str):
+        """Quita `resource_id` del conjunto de `pid` en un índice, borrando conjuntos vacíos."""
+        resources = index.get(pid)
+        if resources is not None:
+            resources.discard(resource_id)
+            if not resources:
+                del index[pid]
+
+    def locks_held(self, pid: str) -> Set[str]:
+        """Recursos cuyo cerrojo posee `pid`."""
+        return set(self.held.get(pid, ()))
 
     def get_mutex(self, resource_id: str) -> Mutex:
         """Obtiene (o crea si no existe) un mutex para un ID de recurso dado."""
@@ -59,12 +332,11 @@ class LockManager:
         
         # Si el cerrojo no está bloqueado, lo adquiere el proceso actual.
         if not mutex.locked_by:
-            mutex.locked_by = pid
+            self._grant(mutex, pid)
             return True
         # Si el cerrojo está bloqueado, se añade el proceso a la cola de espera (si no está ya).
         else:
-            if pid not in [p.pid for p in mutex.waiting_queue]:
-                mutex.waiting_queue.append(process)
+            self._wait_mutex(mutex, process)
             return False
 
     def unlock(self, pid: str, resource_id: str) -> Optional[SimProcess]:
@@ -81,12 +353,387 @@ class LockManager:
         
         # Solo el proceso que posee el cerrojo puede liberarlo.
         if mutex.locked_by == pid:
+            self._drop(self.held, pid, resource_id)
             # Si hay procesos esperando, el siguiente en la cola adquiere el cerrojo.
-            if mutex.waiting_queue:
-                next_process = mutex.waiting_queue.popleft()
-                mutex.locked_by = next_process.pid
+            next_process = mutex.dequeue(self.clock())
+            if next_process is not None:
+                self._drop(self.waiting_on, next_process.pid, resource_id)
+                self._grant(mutex, next_process.pid)
+                # Los que siguen esperando apuntan ahora al nuevo dueño: si este a su vez
+                # espera otro recurso, el ciclo nuevo tendría que pasar por él.
+                if next_process.pid in self.waiting_on:
+                    self._check_deadlock(next_process.pid)
                 return next_process
             # Si no hay nadie esperando, el cerrojo simplemente se marca como libre.
             else:
                 mutex.locked_by = None
-        return None
\ No newline at end of file
+        return None
+
+    def release_all(self, pid: str) -> List[SimProcess]:
+        """
+        Libera todo lo que tiene un proceso que termina o es eliminado.
+        
+        Lo saca de todas las colas de espera y entrega cada cerrojo, unidad de semáforo o
+        cerrojo de lectores-escritores que poseía a quien corresponda. El coste es proporcional
+        a lo que tenía y esperaba, no al número de recursos del sistema.
+        
+        Retorna:
+            Los procesos que recibieron un recurso y deben pasar a READY.
+        """
+        for resource_id in self.waiting_on.pop(pid, ()):
+            self.mutexes[resource_id].remove_waiter(pid)
+        for primitive in self._waiting_other.pop(pid, ()):
+            primitive.remove_waiter(pid)
+        self._procs.pop(pid, None)
+        woken = []
+        for resource_id in list(self.held.get(pid, ())):
+            next_process = self.unlock(pid, resource_id)
+            if next_process is not None:
+                woken.append(next_process)
+        for primitive in list(self._held_other.get(pid, ())):
+            if isinstance(primitive, Semaphore):
+                for _ in range(primitive.holders.get(pid, 0)):
+                    next_process = self.sem_post(pid, primitive.resource_id)
+                    if next_process is not None:
+                        woken.append(next_process)
+            else:
+                woken.extend(self.rw_unlock(pid, primitive.resource_id) or ())
+        return woken
+
+    # --- Índices de semáforos, cerrojos de lectores-escritores y condiciones ---
+
+    def _add(self, index: Dict[str, set], pid: str, item):
+        """Añade `item` al conjunto de `pid` en un índice."""
+        index.setdefault(pid, set()).add(item)
+
+    def _discard(self, index: Dict[str, set], pid: str, item):
+        """Quita `item` del conjunto de `pid` en un índice, borrando conjuntos vacíos."""
+        items = index.get(pid)
+        if items is not None:
+            items.discard(item)
+            if not items:
+                del index[pid]
+
+    def _woken_from(self, primitive, processes: List[SimProcess]) -> List[SimProcess]:
+        """Actualiza los índices de los procesos que acaban de salir de la cola de `primitive`."""
+        for p in processes:
+            self._discard(self._waiting_other, p.pid, primitive)
+        return processes
+
+    # --- Semáforos ---
+
+    def create_semaphore(self, resource_id: str, value: int) -> Semaphore:
+        """
+        Crea un semáforo con `value` unidades, o cambia su valor si existe y nadie lo usa.
+        
+        Lanza ValueError si el valor es negativo o si el semáforo tiene unidades tomadas o
+        procesos en espera.
+        """
+        if value < 0:
+            raise ValueError("El valor inicial de un semáforo no puede ser negativo")
+        sem = self.semaphores.get(resource_id)
+        if sem is not None and (sem.holders or len(sem)):
+            raise ValueError(f"El semáforo '{resource_id}' está en uso")
+        if sem is None:
+            sem = self.semaphores[resource_id] = Semaphore(resource_id, value)
+        sem.value = value
+        return sem
+
+    def get_semaphore(self, resource_id: str) -> Semaphore:
+        """Obtiene (o crea, binario, si no existe) un semáforo."""
+        if resource_id not in self.semaphores:
+            self.semaphores[resource_id] = Semaphore(resource_id)
+        return self.semaphores[resource_id]
+
+    def _sem_take(self, sem: Semaphore, pid: str):
+        """Anota que `pid` tomó una unidad de `sem`."""
+        sem.holders[pid] = sem.holders.get(pid, 0) + 1
+        sem.stats.acquisitions += 1
+        self._add(self._held_other, pid, sem)
+
+    def sem_wait(self, pid: str, resource_id: str, process: SimProcess) -> bool:
+        """
+        Operación P: toma una unidad del semáforo o encola al proceso.
+        
+        Retorna:
+            True si tomó la unidad, False si el proceso debe bloquearse.
+        """
+        sem = self.get_semaphore(resource_id)
+        if sem.value > 0 and not len(sem):
+            sem.value -= 1
+            self._sem_take(sem, pid)
+            return True
+        if sem.enqueue(process, self.clock()):
+            self._add(self._waiting_other, pid, sem)
+        return False
+
+    def sem_post(self, pid: str, resource_id: str) -> Optional[SimProcess]:
+        """
+        Operación V: devuelve una unidad al semáforo.
+        
+        Cualquier proceso puede hacer `post` (patrón productor-consumidor); si `pid` tenía
+        unidades tomadas, se descuenta una de las suyas.
+        
+        Retorna:
+            El proceso en espera que recibió la unidad, o None.
+        """
+        sem = self.get_semaphore(resource_id)
+        held = sem.holders.get(pid, 0)
+        if held:
+            if held == 1:
+                del sem.holders[pid]
+                self._discard(self._held_other, pid, sem)
+            else:
+                sem.holders[pid] = held - 1
+        next_process = sem.dequeue(self.clock())
+        if next_process is None:
+            sem.value += 1
+            return None
+        self._woken_from(sem, [next_process])
+        self._sem_take(sem, next_process.pid)
+        return next_process
+
+    # --- Cerrojos de lectores-escritores ---
+
+    def get_rwlock(self, resource_id: str, fairness: Optional[str] = None) -> RWLock:
+        """
+        Obtiene (o crea si no existe) un cerrojo de lectores-escritores.
+        
+        Si se indica `fairness`, se cambia su política de equidad (ValueError si no existe).
+        """
+        if fairness is not None and fairness not in RW_FAIRNESS:
+            raise ValueError(f"Política de equidad desconocida: '{fairness}' (opciones: {', '.join(RW_FAIRNESS)})")
+        if resource_id not in self.rwlocks:
+            self.rwlocks[resource_id] = RWLock(resource_id)
+        lock = self.rwlocks[resource_id]
+        if fairness is not None:
+            lock.fairness = fairness
+        return lock
+
+    def read_lock(self, pid: str, resource_id: str, process: SimProcess) -> bool:
+        """
+        Adquiere un cerrojo en modo lectura.
+        
+        Retorna:
+            True si lo obtuvo, False si el proceso debe bloquearse.
+        """
+        lock = self.get_rwlock(resource_id)
+        if pid in lock.readers:
+            return True
+        blocked = lock.writer is not None or (lock.fairness != 'reader' and len(lock.write_queue))
+        if not blocked:
+            lock.readers.add(pid)
+            lock.stats.acquisitions += 1
+            self._add(self._held_other, pid, lock)
+            return True
+        if lock.read_queue.enqueue(process, self.clock()):
+            self._add(self._waiting_other, pid, lock)
+        return False
+
+    def write_lock(self, pid: str, resource_id: str, process: SimProcess) -> bool:
+        """
+        Adquiere un cerrojo en modo escritura (exclusivo).
+        
+        Retorna:
+            True si lo obtuvo, False si el proceso debe bloquearse.
+        """
+        lock = self.get_rwlock(resource_id)
+        if lock.writer == pid:
+            return True
+        if lock.writer is None and not lock.readers and not len(lock.write_queue):
+            lock.writer = pid
+            lock.stats.acquisitions += 1
+            self._add(self._held_other, pid, lock)
+            return True
+        if lock.write_queue.enqueue(process, self.clock()):
+            self._add(self._waiting_other, pid, lock)
+        return False
+
+    def rw_unlock(self, pid: str, resource_id: str) -> Optional[List[SimProcess]]:
+        """
+        Libera un cerrojo de lectores-escritores (en el modo en que se tenga).
+        
+        Retorna:
+            Los procesos que obtuvieron el cerrojo al liberarse (todos a la vez si son lectores),
+            o None si `pid` no lo tenía.
+        """
+        lock = self.rwlocks.get(resource_id)
+        if lock is None:
+            return None
+        if lock.writer == pid:
+            lock.writer = None
+        elif pid in lock.readers:
+            lock.readers.discard(pid)
+        else:
+            return None
+        self._discard(self._held_other, pid, lock)
+        if lock.readers:
+            return []
+        return self._rw_dispatch(lock)
+
+    def _rw_dispatch(self, lock: RWLock) -> List[SimProcess]:
+        """Entrega un cerrojo de lectores-escritores libre según su política de equidad."""
+        now = self.clock()
+        writer_first = lock.write_queue.peek_ticket()
+        if writer_first is None and not len(lock.read_queue):
+            return []
+        if lock.fairness == 'reader':
+            take_writer = not len(lock.read_queue)
+        elif lock.fairness == 'writer':
+            take_writer = writer_first is not None
+        else:
+            reader_first = lock.read_queue.peek_ticket()
+            take_writer = reader_first is None or (writer_first is not None and writer_first < reader_first)
+        if take_writer:
+            woken = [lock.write_queue.dequeue(now)]
+            lock.writer = woken[0].pid
+        elif lock.fairness == 'fifo' and writer_first is not None:
+            # Solo los lectores que llegaron antes que el primer escritor en espera.
+            woken = []
+            ticket = lock.read_queue.peek_ticket()
+            while ticket is not None and ticket < writer_first:
+                woken.append(lock.read_queue.dequeue(now))
+                ticket = lock.read_queue.peek_ticket()
+        else:
+            woken = lock.read_queue.dequeue_all(now)
+        for p in woken:
+            if lock.writer != p.pid:
+                lock.readers.add(p.pid)
+            lock.stats.acquisitions += 1
+            self._add(self._held_other, p.pid, lock)
+        return self._woken_from(lock, woken)
+
+    # --- Variables de condición ---
+
+    def get_condition(self, resource_id: str) -> Condition:
+        """Obtiene (o crea si no existe) una variable de condición."""
+        if resource_id not in self.conditions:
+            self.conditions[resource_id] = Condition(resource_id)
+        return self.conditions[resource_id]
+
+    def cond_wait(self, pid: str, resource_id: str, mutex_id: str, process: SimProcess) -> Tuple[bool, Optional[SimProcess]]:
+        """
+        Espera en una condición: libera el mutex `mutex_id` y bloquea al proceso.
+        
+        Retorna:
+            Una tupla (éxito, proceso que recibió el mutex liberado). Falla si `pid` no posee el
+            mutex o si la condición ya se usa con otro mutex.
+        """
+        cond = self.get_condition(resource_id)
+        mutex = self.mutexes.get(mutex_id)
+        if mutex is None or mutex.locked_by != pid or cond.mutex_id not in (None, mutex_id):
+            return False, None
+        cond.mutex_id = mutex_id
+        handed = self.unlock(pid, mutex_id)
+        if cond.enqueue(process, self.clock()):
+            self._add(self._waiting_other, pid, cond)
+        return True, handed
+
+    def cond_signal(self, resource_id: str, broadcast: bool = False) -> List[SimProcess]:
+        """
+        Despierta al primer proceso de la condición (o a todos, con `broadcast`).
+        
+        Los despertados vuelven a competir por el mutex: el primero lo obtiene si está libre y el
+        resto pasa, en un solo lote, a su cola de espera sin volver a READY.
+        
+        Retorna:
+            Los procesos que obtuvieron el mutex y pueden pasar a READY.
+        """
+        cond = self.conditions.get(resource_id)
+        if cond is None or not len(cond):
+            return []
+        now = self.clock()
+        if broadcast:
+            signalled = cond.dequeue_all(now)
+        else:
+            signalled = [cond.dequeue(now)]
+        cond.stats.acquisitions += len(signalled)
+        self._woken_from(cond, signalled)
+        mutex = self.get_mutex(cond.mutex_id)
+        woken = []
+        for p in signalled:
+            if not mutex.locked_by:
+                self._grant(mutex, p.pid)
+                woken.append(p)
+            else:
+                self._wait_mutex(mutex, p)
+        return woken
+
+    def resource_stats(self) -> List[dict]:
+        """Estadísticas de contención de todos los recursos, con su tipo y cola actual."""
+        rows = []
+        for table in (self.mutexes, self.semaphores, self.rwlocks, self.conditions):
+            for resource_id, primitive in table.items():
+                row = {'resource': resource_id, 'kind': primitive.kind, 'queue': len(primitive)}
+                row.update(primitive.stats.as_dict())
+                rows.append(row)
+        return rows
+
+    def find_cycle(self, pid: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        Busca un ciclo del grafo de espera que pase por `pid`.
+        
+        Recorre en profundidad (de forma iterativa) las aristas proceso -> recurso -> dueño a
+        partir de `pid`; solo se visita lo alcanzable desde él, nunca el grafo completo.
+        
+        Retorna:
+            El ciclo como lista de pares `(proceso, recurso que espera)`, o None si no hay ciclo.
+        """
+        path: List[Tuple[str, str]] = []
+        visited = {pid}
+        stack = [iter(sorted(self.waiting_on.get(pid, ())))]
+        node = pid
+        while stack:
+            resource_id = next(stack[-1], None)
+            if resource_id is None:
+                stack.pop()
+                if path:
+                    node = path.pop()[0]
+                continue
+            owner = self.mutexes[resource_id].locked_by
+            if owner is None:
+                continue
+            if owner == pid:
+                return path + [(node, resource_id)]
+            if owner in visited:
+                continue
+            visited.add(owner)
+            path.append((node, resource_id))
+            node = owner
+            stack.append(iter(sorted(self.waiting_on.get(owner, ()))))
+        return None
+
+    def _check_deadlock(self, pid: str):
+        """Comprueba si la arista nueva de `pid` cerró un ciclo y, si es así, lo registra."""
+        cycle = self.find_cycle(pid)
+        if cycle is None:
+            return
+        pids = [p for p, _ in cycle]
+        self.deadlocks.append({
+            'cycle': pids,
+            'resources': [r for _, r in cycle],
+            'victim': self._choose_victim(pid, pids),
+        })
+
+    def _choose_victim(self, requester: str, pids: List[str]) -> str:
+        """Elige el proceso a sacrificar según `victim_policy` (a igualdad, el primero del ciclo)."""
+        if self.victim_policy == 'requester':
+            return requester
+        if self.victim_policy == 'fewest_locks':
+            return min(pids, key=lambda p: len(self.held.get(p, ())))
+        if self.victim_policy == 'youngest':
+            return max(pids, key=lambda p: self._procs[p].arrival_time)
+        return max(pids, key=lambda p: self._procs[p].priority)
+
+    def is_deadlocked(self, record: dict) -> bool:
+        """Indica si el ciclo de un interbloqueo registrado sigue existiendo."""
+        cycle = record['cycle']
+        for i, resource_id in enumerate(record['resources']):
+            pid, owner = cycle[i], cycle[(i + 1) % len(cycle)]
+            if resource_id not in self.waiting_on.get(pid, ()) or self.mutexes[resource_id].locked_by != owner:
+                return False
+        return True
+
+    def active_deadlocks(self) -> List[dict]:
+        """Interbloqueos registrados cuyo ciclo sigue existiendo."""
+        return [d for d in self.deadlocks if self.is_deadlocked(d)]
@@ -0,0 +1,95 @@
+"""
+Telemetría de los asignadores de memoria del sistema operativo simulado.
+
+`AllocatorStats` mantiene contadores vivos que cada gestor de memoria actualiza en cada
+`alloc`, `free_mem`, `defrag` y compactación: espacio libre total, mayor bloque libre,
+histograma de tamaños de asignación, asignaciones fallidas y latencia por operación.
+Leerlos cuesta O(1): nunca hace falta recorrer la lista de bloques libres.
+"""
+
+from time import perf_counter_ns
+from typing import Dict, List
+
+# Alias para que los gestores midan la latencia sin importar `time` por su cuenta.
+now_ns = perf_counter_ns
+
+class AllocatorStats:
+    """
+    Contadores de salud de un asignador.
+
+    Atributos:
+        free_total (int): Espacio libre total tras la última operación.
+        largest_free (int): Mayor bloque libre tras la última operación.
+        allocs (int): Asignaciones exitosas.
+        failed_allocs (int): Asignaciones que no encontraron espacio.
+        frees (int): Liberaciones exitosas.
+        moved_units (int): Unidades movidas por defragmentación o compactación.
+        size_histogram (Dict[int, int]): Asignaciones por cubeta de tamaño; la cubeta k agrupa
+                                         los tamaños en [2**(k-1), 2**k) (la 0, los tamaños 0).
+        _latency (Dict[str, List[int]]): Por operación: [llamadas, ns totales, ns máximos].
+    """
+    def __init__(self, free_total: int = 0, largest_free: int = 0):
+        """Inicializa los contadores con el estado libre inicial del asignador."""
+        self.free_total = free_total
+        self.largest_free = largest_free
+        self.allocs = 0
+        self.failed_allocs = 0
+        self.frees = 0
+        self.moved_units = 0
+        self.size_histogram: Dict[int, int] = {}
+        self._latency: Dict[str, List[int]] = {}
+
+    def set_free(self, free_total: int, largest_free: int):
+        """Actualiza el estado del espacio libre tras una operación."""
+        self.free_total = free_total
+        self.largest_free = largest_free
+
+    def record(self, op: str, start_ns: int):
+        """Registra la latencia de una operación que empezó en `start_ns` (ver `now_ns`)."""
+        elapsed = perf_counter_ns() - start_ns
+        entry = self._latency.get(op)
+        if entry is None:
+            self._latency[op] = [1, elapsed, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+
+    def record_alloc(self, size: int, ok: bool):
+        """Cuenta una petición de asignación y, si tuvo éxito, su tamaño en el histograma."""
+        if ok:
+            self.allocs += 1
+            bucket = max(size, 0).bit_length()
+            self.size_histogram[bucket] = self.size_histogram.get(bucket, 0) + 1
+        else:
+            self.failed_allocs += 1
+
+    def external_fragmentation(self) -> float:
+        """1 - (mayor bloque libre / espacio libre total)."""
+        return 1 - self.largest_free / self.free_total if self.free_total else 0.0
+
+    def as_dict(self) -> dict:
+        """
+        Retorna una copia de los contadores como diccionario.
+
+        El histograma se expresa con etiquetas de rango (`'4-7'`) y la latencia como
+        `{op: {'count', 'avg_us', 'max_us'}}`.
+        """
+        histogram = {}
+        for bucket in sorted(self.size_histogram):
+            label = '0' if bucket == 0 else f"{1 << (bucket - 1)}-{(1 << bucket) - 1}"
+            histogram[label] = self.size_histogram[bucket]
+        latency = {op: {'count': n, 'avg_us': total / n / 1000, 'max_us': peak / 1000}
+                   for op, (n, total, peak) in self._latency.items()}
+        return {
+            'free_total': self.free_total,
+            'largest_free': self.largest_free,
+            'external_fragmentation': self.external_fragmentation(),
+            'allocs': self.allocs,
+            'failed_allocs': self.failed_allocs,
+            'frees': self.frees,
+            'moved_units': self.moved_units,
+            'size_histogram': histogram,
+            'latency': latency,
+        }
@@ -0,0 +1,130 @@
+"""
+Timeline compacto (codificado por tramos) para el Sistema Operativo Simulado.
+
+En lugar de guardar una tupla `(tiempo, pid)` por cada unidad simulada, el timeline guarda un
+tramo `(pid, inicio, duración)` por cada ráfaga de CPU. Los tramos se almacenan en arreglos
+(`array`) paralelos, por lo que la memoria crece con el número de cambios de contexto y no con
+el tiempo simulado.
+
+Convención de tiempo: un tramo `(pid, inicio, duración)` cubre el intervalo de reloj
+`[inicio, inicio + duración)`. La unidad que ocupa `[t, t + 1)` corresponde a la entrada
+`(t + 1, pid)` del formato histórico, que registraba el reloj al terminar cada unidad.
+"""
+
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+class Timeline:
+    """
+    Registro de ejecución codificado por tramos, con consultas por instante y por rango.
+
+    Atributos:
+        _names (List[str]): Tabla de PIDs internados; los tramos guardan el índice, no la cadena.
+        _ids (Dict[str, int]): Índice inverso PID -> posición en `_names`.
+        _pid (array): Índice del PID de cada tramo.
+        _start (array): Instante de inicio de cada tramo (ordenados de forma creciente).
+        _length (array): Duración de cada tramo.
+        _units (int): Total de unidades registradas.
+    """
+    def __init__(self):
+        """Inicializa un timeline vacío."""
+        self._names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._pid = array('I')
+        self._start = array('q')
+        self._length = array('q')
+        self._units = 0
+
+    def add_slice(self, pid: str, start: int, length: int):
+        """
+        Registra que `pid` ocupó la CPU durante `[start, start + length)`.
+
+        Si el tramo continúa exactamente al último del mismo proceso, se fusiona con él.
+        Los tramos deben registrarse en orden cronológico.
+        """
+        if length <= 0:
+            return
+        pid_id = self._ids.get(pid)
+        if pid_id is None:
+            pid_id = self._ids[pid] = len(self._names)
+            self._names.append(pid)
+        if self._pid and self._pid[-1] == pid_id and self._start[-1] + self._length[-1] == start:
+            self._length[-1] += length
+        else:
+            self._pid.append(pid_id)
+            self._start.append(start)
+            self._length.append(length)
+        self._units += length
+
+    def append(self, entry: Tuple[int, str]):
+        """Registra una unidad en el formato histórico `(tiempo_al_terminar, pid)`."""
+        end, pid = entry
+        self.add_slice(pid, end - 1, 1)
+
+    def extend(self, entries):
+        """Registra varias unidades en el formato histórico `(tiempo_al_terminar, pid)`."""
+        for entry in entries:
+            self.append(entry)
+
+    def _slice(self, i: int) -> Tuple[str, int, int]:
+        """Retorna el tramo `i` como `(pid, inicio, duración)`."""
+        return self._names[self._pid[i]], self._start[i], self._length[i]
+
+    def slices(self) -> Iterator[Tuple[str, int, int]]:
+        """Itera perezosamente sobre los tramos `(pid, inicio, duración)`."""
+        for i in range(len(self._pid)):
+            yield self._slice(i)
+
+    def pid_at(self, t: int) -> Optional[str]:
+        """Retorna el PID que ocupaba la CPU durante `[t, t + 1)`, o None si estaba ociosa. O(log n)."""
+        i = bisect_right(self._start, t) - 1
+        if i >= 0 and t < self._start[i] + self._length[i]:
+            return self._names[self._pid[i]]
+        return None
+
+    def between(self, t1: int, t2: int) -> Iterator[Tuple[str, int, int]]:
+        """
+        Itera sobre lo ejecutado en `[t1, t2)`, con los tramos recortados a ese rango.
+
+        La búsqueda del primer tramo cuesta O(log n); el resto es proporcional al resultado.
+        """
+        i = max(bisect_right(self._start, t1) - 1, 0)
+        n = len(self._pid)
+        while i < n and self._start[i] < t2:
+            start, end = self._start[i], self._start[i] + self._length[i]
+            lo, hi = max(start, t1), min(end, t2)
+            if lo < hi:
+                yield self._names[self._pid[i]], lo, hi - lo
+            i += 1
+
+    def num_slices(self) -> int:
+        """Número de tramos (ráfagas) almacenados."""
+        return len(self._pid)
+
+    def end_time(self) -> int:
+        """Instante en que termina el último tramo (0 si está vacío)."""
+        return self._start[-1] + self._length[-1] if self._pid else 0
+
+    def format(self, limit: int = 20) -> str:
+        """Representación legible de los últimos `limit` tramos, p. ej. `P1[0-2) P2[2-4)`."""
+        n = len(self._pid)
+        if not n:
+            return "(vacío)"
+        first = max(n - limit, 0)
+        text = " ".join(f"{pid}[{start}-{start + length})" for pid, start, length in
+                        (self._slice(i) for i in range(first, n)))
+        return (f"... (+{first} tramos) " if first else "") + text
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        """Itera perezosamente en el formato histórico `(tiempo_al_terminar, pid)`, una entrada por unidad."""
+        for pid, start, length in self.slices():
+            for t in range(start + 1, start + length + 1):
+                yield t, pid
+
+    def __len__(self) -> int:
+        """Número total de unidades registradas."""
+        return self._units
+
+    def __repr__(self) -> str:
+        return f"Timeline({self.format()})"